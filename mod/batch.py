@@ -0,0 +1,236 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics headless batch runner.
+
+Runs GenCase, DualSPHysics and a list of post-processing tools for a saved case
+without the FreeCAD GUI, reporting the progress to the standard output or to a JSON lines file.
+It needs the FreeCAD python modules but not a display, for example:
+
+    PYTHONPATH=/usr/lib/freecad/lib python3 -m mod.batch /path/to/case --device gpu --post "partvtk:-savevtk {out}PartFluid -onlytype:-all,+fluid"
+
+Post-processing arguments can use the {out}, {case} and {name} placeholders.
+"""
+
+import re
+import sys
+import json
+import time
+import shlex
+import pickle
+import argparse
+import subprocess
+from os import path, environ, listdir, remove
+from sys import platform
+
+from mod.constants import APP_NAME
+from mod.gencase_tools import GenCaseOutputParser
+from mod.run_out_tools import RunOutFollower
+from mod.case_format import read_case_file
+
+
+class BatchReporter():
+    """ Reports the progress of a batch run as human readable lines on the standard output. """
+
+    def report(self, event: str, **fields) -> None:
+        """ Reports an event with its fields. """
+        details = " ".join("{}={}".format(key, value) for key, value in fields.items() if value is not None)
+        print("[{}] {} {}".format(APP_NAME, event, details).rstrip(), flush=True)
+
+    def close(self) -> None:
+        """ Releases the resources used by the reporter. """
+
+
+class JsonLinesReporter(BatchReporter):
+    """ Reports the progress of a batch run as one JSON object per line. """
+
+    def __init__(self, output_path: str):
+        self.output_file = sys.stdout if output_path == "-" else open(output_path, "a", encoding="utf-8")
+
+    def report(self, event: str, **fields) -> None:
+        """ Reports an event with its fields. """
+        record: dict = {"time": time.time(), "event": event}
+        record.update(fields)
+        self.output_file.write(json.dumps(record) + "\n")
+        self.output_file.flush()
+
+    def close(self) -> None:
+        """ Closes the output file. """
+        if self.output_file is not sys.stdout:
+            self.output_file.close()
+
+
+class BatchRunner():
+    """ Runs the pipeline of a saved case using only the data stored in its casedata.dsphdata file. """
+
+    CASE_DATA_FILE_NAME = "casedata.dsphdata"
+    PART_REGEX = re.compile(r"Part_(\d+)")
+
+    def __init__(self, case_path: str, reporter: BatchReporter, device: str = "cpu", bin_dir: str = None, poll_interval: float = 1.0):
+        self.case_data_path: str = case_path if path.isfile(case_path) else "{}/{}".format(case_path, self.CASE_DATA_FILE_NAME)
+        self.reporter: BatchReporter = reporter
+        self.device: str = device
+        self.bin_dir: str = bin_dir
+        self.poll_interval: float = poll_interval
+        self.case = None
+
+    def load_case(self) -> None:
+        """ Loads the case data. The case path is set to the folder the data was loaded from, as projects may be moved. """
+        self.case = read_case_file(self.case_data_path)
+        if not getattr(self.case, "version", None):
+            raise RuntimeError("The case data is older than version 0.6 and cannot be loaded")
+        self.case.path = path.dirname(path.abspath(self.case_data_path))
+        self.reporter.report("case_loaded", case=self.case.name, path=self.case.path, version=self.case.version)
+
+    def get_executable(self, tool: str) -> str:
+        """ Returns the path of a tool executable, looking for it in the binaries folder if one was given. """
+        executable: str = getattr(self.case.executable_paths, tool, "")
+        if self.bin_dir:
+            executable = "{}/{}".format(self.bin_dir, path.basename(executable.replace("\\", "/")) if executable else tool)
+        if not executable or not path.isfile(executable):
+            raise RuntimeError("The {} executable could not be found: {}".format(tool, executable))
+        return path.abspath(executable)
+
+    def start_process(self, executable: str, arguments: list, **kwargs) -> subprocess.Popen:
+        """ Starts a tool from the case folder, with the folder of its executable as library path. """
+        environment: dict = dict(environ)
+        if platform in ("linux", "linux2"):
+            environment["LD_LIBRARY_PATH"] = path.dirname(executable)
+        self.reporter.report("command", command=" ".join([executable] + arguments))
+        return subprocess.Popen([executable] + arguments, cwd=self.case.path, env=environment, **kwargs)
+
+    def run_gencase(self) -> bool:
+        """ Runs GenCase on the saved definition XML, reporting the particles it generated. """
+        self.reporter.report("stage_started", stage="gencase")
+        arguments = ["{path}/{name}_Def".format(path=self.case.path, name=self.case.name),
+                     "{path}/{name}_out/{name}".format(path=self.case.path, name=self.case.name),
+                     "-save:+all"]
+        process = self.start_process(self.get_executable("gencase"), arguments, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        output_parser = GenCaseOutputParser()
+        for line in process.stdout:
+            output_parser.feed(line)
+        output_parser.finish()
+        exit_code = process.wait()
+
+        total_particles = output_parser.get_total_particles()
+        if exit_code or total_particles is None:
+            self.reporter.report("stage_failed", stage="gencase", exit_code=exit_code, output=output_parser.get_output())
+            return False
+        self.case.info.particle_number = total_particles
+        self.reporter.report("stage_finished", stage="gencase", **output_parser.summary)
+        return True
+
+    def run_simulation(self) -> bool:
+        """ Runs DualSPHysics, following its Run.out to report the progress. """
+        self.reporter.report("stage_started", stage="simulation", device=self.device)
+        arguments = [self.case.get_out_xml_file_path(), self.case.get_out_folder_path(), "-{}".format(self.device), "-svres"]
+        if self.case.info.run_additional_parameters:
+            arguments += self.case.info.run_additional_parameters.split(" ")
+
+        follower = RunOutFollower("{}Run.out".format(self.case.get_out_folder_path()))
+        if path.isfile(follower.run_out_path):
+            # The output of a previous run would be mistaken for the output of this one
+            remove(follower.run_out_path)
+        process = self.start_process(self.get_executable("dsphysics"), arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        last_part = None
+        while process.poll() is None:
+            time.sleep(self.poll_interval)
+            follower.poll()
+            if follower.progress.last_part != last_part:
+                last_part = follower.progress.last_part
+                self.report_simulation_progress(follower)
+        follower.flush()
+
+        progress = follower.progress
+        if process.returncode or progress.exception_found:
+            self.reporter.report("stage_failed", stage="simulation", exit_code=process.returncode, exception_found=progress.exception_found)
+            return False
+        follower.save_metrics_csv()
+        self.case.info.is_simulation_done = True
+        self.reporter.report("stage_finished", stage="simulation", last_part=progress.last_part, particles_out=progress.particles_out)
+        return True
+
+    def report_simulation_progress(self, follower: RunOutFollower) -> None:
+        """ Reports the progress of the simulation read from Run.out. """
+        progress = follower.progress
+        timemax = self.case.execution_parameters.timemax
+        if timemax == -1:
+            timemax = progress.timemax
+        percentage = progress.get_percentage(timemax)
+        self.reporter.report("progress", stage="simulation", part=progress.last_part, time=progress.current_time,
+                             percentage=None if percentage is None else round(percentage, 2), particles_out=progress.particles_out,
+                             steps_per_second=progress.get_steps_per_second(), estimated_seconds=progress.get_estimated_seconds(timemax))
+
+    def run_post_processing(self, tool: str, tool_arguments: str) -> bool:
+        """ Runs a post-processing tool on the out folder, reporting the Part it is processing. """
+        self.reporter.report("stage_started", stage=tool)
+        placeholders: dict = {"out": self.case.get_out_folder_path(), "case": self.case.path, "name": self.case.name}
+        arguments = ["-dirin {}".format(self.case.get_out_folder_path())] + shlex.split(tool_arguments.format(**placeholders))
+        process = self.start_process(self.get_executable(tool), arguments, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        output_lines: list = list()
+        last_part = None
+        for line in process.stdout:
+            line = line.decode("utf-8", errors="replace")
+            output_lines.append(line)
+            match = self.PART_REGEX.search(line)
+            if match and match.group(1) != last_part:
+                last_part = match.group(1)
+                self.reporter.report("progress", stage=tool, part=int(last_part))
+        exit_code = process.wait()
+
+        if exit_code:
+            self.reporter.report("stage_failed", stage=tool, exit_code=exit_code, output="".join(output_lines))
+            return False
+        self.reporter.report("stage_finished", stage=tool)
+        return True
+
+    def run(self, gencase: bool = True, simulation: bool = True, post_processing: list = None) -> int:
+        """ Runs the selected stages in order, stopping on the first failure. Returns the process exit code. """
+        try:
+            self.load_case()
+            if gencase and not self.run_gencase():
+                return 1
+            if simulation and not self.run_simulation():
+                return 1
+            for tool, tool_arguments in post_processing or []:
+                if not self.run_post_processing(tool, tool_arguments):
+                    return 1
+        except (OSError, RuntimeError, ValueError, EOFError, pickle.UnpicklingError) as ex:
+            self.reporter.report("error", message=str(ex))
+            return 1
+        self.reporter.report("finished")
+        return 0
+
+
+def parse_post_processing(value: str) -> tuple:
+    """ Parses a TOOL[:ARGUMENTS] post-processing specification. """
+    tool, _, tool_arguments = value.partition(":")
+    if tool not in ("partvtk", "floatinginfo", "computeforces", "measuretool", "isosurface", "boundaryvtk", "flowtool"):
+        raise argparse.ArgumentTypeError("Unknown post-processing tool: {}".format(tool))
+    return tool, tool_arguments
+
+
+def main(argv: list = None) -> int:
+    """ Batch runner entry point. """
+    parser = argparse.ArgumentParser(prog="python -m mod.batch", description="Runs a saved {} case without the FreeCAD GUI.".format(APP_NAME))
+    parser.add_argument("case", help="Case folder or its {} file".format(BatchRunner.CASE_DATA_FILE_NAME))
+    parser.add_argument("--device", choices=("cpu", "gpu"), default="cpu", help="DualSPHysics execution device")
+    parser.add_argument("--skip-gencase", action="store_true", help="Do not run GenCase")
+    parser.add_argument("--skip-simulation", action="store_true", help="Do not run DualSPHysics")
+    parser.add_argument("--post", action="append", type=parse_post_processing, default=[], metavar="TOOL[:ARGUMENTS]",
+                        help="Post-processing tool to run after the simulation. Can be repeated")
+    parser.add_argument("--bin-dir", help="Folder with the DualSPHysics executables, instead of the ones saved with the case")
+    parser.add_argument("--json-lines", metavar="FILE", help="Report the progress as JSON lines to a file, or to the standard output with -")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between Run.out reads")
+    args = parser.parse_args(argv)
+
+    reporter = JsonLinesReporter(args.json_lines) if args.json_lines else BatchReporter()
+    try:
+        runner = BatchRunner(args.case, reporter, device=args.device, bin_dir=args.bin_dir, poll_interval=args.poll_interval)
+        return runner.run(gencase=not args.skip_gencase, simulation=not args.skip_simulation, post_processing=args.post)
+    finally:
+        reporter.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
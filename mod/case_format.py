@@ -0,0 +1,206 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics case data file format.
+
+The case data file (casedata.dsphdata) starts with a JSON header describing its sections: the Case pickled with a
+modern protocol, and the long numeric lists of the case (measuretool grids, velocity series, movement lists...)
+stored as raw arrays, so they are neither pickled nor rebuilt one element at a time.
+
+Files written before this format are plain pickles, read as format version 0. Each format version has a migration
+hook upgrading the data loaded from it to the next version, so changes on the data objects that need them
+must come with a new CASE_FORMAT_VERSION and its hook.
+"""
+
+import os
+import sys
+import json
+import pickle
+import struct
+from array import array
+from io import BytesIO
+from itertools import chain
+
+from mod.constants import VERSION, CASE_FORMAT_VERSION, CASE_PICKLE_PROTOCOL, CASE_ARRAY_MIN_LENGTH
+
+CASE_FILE_MAGIC = b"DSPHCASE"
+HEADER_LENGTH = struct.Struct("<I")
+ARRAY_TYPECODES = {float: "d", int: "q"}
+
+
+def get_array_values(values: list) -> tuple:
+    """ Returns the (array, columns) to store a list of numbers or a list of rows of numbers as a raw array.
+    Returns None if the list can't be stored as one without losing information. """
+    first = values[0]
+    if type(first) is list:
+        columns: int = len(first)
+        if set(map(type, values)) != {list} or set(map(len, values)) != {columns}:
+            return None
+        flat_values: list = list(chain.from_iterable(values))
+    else:
+        columns: int = 0
+        flat_values: list = values
+    item_types: set = set(map(type, flat_values))
+    if len(item_types) != 1:
+        return None
+    typecode: str = ARRAY_TYPECODES.get(item_types.pop())
+    if typecode is None:
+        return None
+    try:
+        return array(typecode, flat_values), columns
+    except OverflowError:
+        # Integers too big for 64 bits stay on the pickle
+        return None
+
+
+class CaseArrayPickler(pickle.Pickler):
+    """ Pickler storing the long numeric lists on a separate array section instead of the pickle stream. """
+
+    def __init__(self, file, protocol: int):
+        super().__init__(file, protocol)
+        self.arrays: BytesIO = BytesIO()
+        self.array_table: list = list()  # [{"type", "offset", "count", "columns"}]
+        self.array_ids: dict = dict()  # {id(list): index on array_table}
+        self.stored_lists: list = list()  # Keeps the stored lists referenced so their ids are not reused
+
+    def persistent_id(self, obj):
+        """ Returns the index on the array table for the lists stored as arrays, None for everything else. """
+        if type(obj) is not list or len(obj) < CASE_ARRAY_MIN_LENGTH:
+            return None
+        index: int = self.array_ids.get(id(obj))
+        if index is not None:
+            return index
+        array_values = get_array_values(obj)
+        if array_values is None:
+            return None
+        values, columns = array_values
+        index = len(self.array_table)
+        self.array_table.append({"type": values.typecode, "offset": self.arrays.tell(), "count": len(values), "columns": columns})
+        self.arrays.write(values.tobytes())
+        self.array_ids[id(obj)] = index
+        self.stored_lists.append(obj)
+        return index
+
+
+class CaseArrayUnpickler(pickle.Unpickler):
+    """ Unpickler restoring the lists stored on the array section of a case data file. """
+
+    def __init__(self, file, array_table: list, arrays: bytes, byteorder: str):
+        super().__init__(file)
+        self.array_table: list = array_table
+        self.arrays: memoryview = memoryview(arrays)
+        self.byteorder: str = byteorder
+        self.loaded_lists: dict = dict()  # {index: list}, so lists shared on the case are shared again
+
+    def persistent_load(self, pid):
+        """ Rebuilds a list from its raw array. """
+        if pid in self.loaded_lists:
+            return self.loaded_lists[pid]
+        try:
+            descriptor: dict = self.array_table[pid]
+            values = array(descriptor["type"])
+            start: int = descriptor["offset"]
+            values.frombytes(self.arrays[start:start + values.itemsize * descriptor["count"]])
+        except (IndexError, KeyError, TypeError, ValueError) as ex:
+            raise pickle.UnpicklingError("Array {} of the case data is not valid: {}".format(pid, ex))
+        if self.byteorder != sys.byteorder:
+            values.byteswap()
+        values: list = values.tolist()
+        columns: int = descriptor["columns"]
+        if columns:
+            values = [values[index:index + columns] for index in range(0, len(values), columns)]
+        self.loaded_lists[pid] = values
+        return values
+
+
+def migrate_from_legacy_pickle(case: "Case") -> "Case":
+    """ Format 0 to 1. Legacy files have no format version, so the attributes added to the data objects since the
+    version they were saved with are filled with their defaults, comparing them with a new Case. """
+    case_class = type(case)
+    case_class.merge_old_object(case, case_class.create_defaults())
+    return case
+
+
+# {format version: hook upgrading the case loaded from a file with that version to the next one}
+CASE_FORMAT_MIGRATIONS: dict = {
+    0: migrate_from_legacy_pickle
+}
+
+
+def migrate_case(case: "Case", format_version: int) -> "Case":
+    """ Upgrades a case loaded from a file with the given format version to the current one. """
+    for version in range(format_version, CASE_FORMAT_VERSION):
+        case = CASE_FORMAT_MIGRATIONS[version](case)
+    return case
+
+
+def read_header(case_file) -> dict:
+    """ Reads the header of an open case data file, leaving it positioned at the start of its sections.
+    Legacy files are reported as format 0 and left at their start. """
+    if case_file.read(len(CASE_FILE_MAGIC)) != CASE_FILE_MAGIC:
+        case_file.seek(0)
+        return {"format": 0}
+    try:
+        header_length, = HEADER_LENGTH.unpack(case_file.read(HEADER_LENGTH.size))
+        header: dict = json.loads(case_file.read(header_length).decode("utf-8"))
+    except (struct.error, UnicodeDecodeError) as ex:
+        raise ValueError("The case data header is not valid: {}".format(ex))
+    if not isinstance(header, dict) or not isinstance(header.get("format"), int):
+        raise ValueError("The case data header is not valid")
+    return header
+
+
+def read_case_header(file_path: str) -> dict:
+    """ Returns the header of a case data file without loading the case. """
+    with open(file_path, "rb") as case_file:
+        return read_header(case_file)
+
+
+def get_section(header: dict, name: str) -> dict:
+    """ Returns the description of a section of a case data file. """
+    for section in header.get("sections", []):
+        if section.get("name") == name:
+            return section
+    raise ValueError("The case data has no {} section".format(name))
+
+
+def read_case_file(file_path: str) -> "Case":
+    """ Loads the case stored on a case data file, of any format version, upgraded to the current one. """
+    with open(file_path, "rb") as case_file:
+        header: dict = read_header(case_file)
+        if header["format"] == 0:
+            return migrate_case(pickle.load(case_file), 0)
+        case_section: dict = get_section(header, "case")
+        arrays_section: dict = get_section(header, "arrays")
+        if case_section.get("encoding") != "pickle":
+            raise ValueError("Unknown case data encoding: {}".format(case_section.get("encoding")))
+        payload: bytes = case_file.read(case_section["length"])
+        arrays: bytes = case_file.read(arrays_section["length"])
+    case = CaseArrayUnpickler(BytesIO(payload), header.get("arrays", []), arrays, arrays_section["byteorder"]).load()
+    return migrate_case(case, min(header["format"], CASE_FORMAT_VERSION))
+
+
+def write_case_file(file_path: str, case: "Case") -> None:
+    """ Writes a case to a case data file with the current format.
+    The file is replaced at once, so an interrupted save keeps the previous one. """
+    payload: BytesIO = BytesIO()
+    pickler: CaseArrayPickler = CaseArrayPickler(payload, CASE_PICKLE_PROTOCOL)
+    pickler.dump(case)
+    header: dict = {
+        "format": CASE_FORMAT_VERSION,
+        "app_version": VERSION,
+        "sections": [
+            {"name": "case", "encoding": "pickle", "protocol": CASE_PICKLE_PROTOCOL, "length": payload.tell()},
+            {"name": "arrays", "encoding": "raw", "byteorder": sys.byteorder, "length": pickler.arrays.tell()}
+        ],
+        "arrays": pickler.array_table
+    }
+    header_bytes: bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+    temporary_path: str = "{}.tmp".format(file_path)
+    with open(temporary_path, "wb") as case_file:
+        case_file.write(CASE_FILE_MAGIC)
+        case_file.write(HEADER_LENGTH.pack(len(header_bytes)))
+        case_file.write(header_bytes)
+        case_file.write(payload.getbuffer())
+        case_file.write(pickler.arrays.getbuffer())
+    os.replace(temporary_path, file_path)
@@ -11,12 +11,24 @@ APP_NAME = "DesignSPHysics"
 DIVIDER = 1000
 LINE_END = "\n"
 PICKLE_PROTOCOL = 1  # Binary mode
+CASE_FORMAT_VERSION = 1  # Version of the case data file layout. Each change needs a migration hook in case_format
+CASE_PICKLE_PROTOCOL = 4  # Highest protocol readable by every supported Python version
+CASE_ARRAY_MIN_LENGTH = 64  # Numeric lists at least this long are stored as raw arrays on the case data file
 VERSION = "0.7.1 (26-11-2024)" # Version must be M.m.p (dd-mm-yyyy)
 WIDTH_2D = 0.001
 MAX_PARTICLE_WARNING = 2000000
 DISK_DUMP_FILE_NAME = "designsphysics-{}.log".format(VERSION)
 MKFLUID_LIMIT = 10
 MKFLUID_OFFSET = 1
+ETA_REGRESSION_SAMPLES = 10  # Number of recent Parts used to estimate the simulation throughput
+GENCASE_CACHE_FOLDER_NAME = ".gencase_cache"
+GENCASE_CACHE_MAX_ENTRIES = 5
+SIMULATION_QUEUE_POLL_MS = 1000  # Interval between progress reads of the queued simulations
+PROGRESS_BUS_WINDOW_MS = 250  # Progress events received within this window are shown as a single UI update
+POST_PROCESSING_MIN_PARTS_PER_SHARD = 50  # Post-processing Part ranges are only split in shards of at least this size
+OUTPUT_BUFFER_SPOOL_BYTES = 4 * 1024 * 1024  # Process output buffers are moved from memory to a temporary file past this size
+OUTPUT_BUFFER_TAIL_CHARS = 4096  # Characters of the latest process output kept at hand
+EXECUTABLE_PROBE_TIMEOUT_MS = 10000  # Executables that take longer to answer to -info or -ver are considered not valid
 GITHUB_MASTER_CONSTANTS_URL = "https://raw.githubusercontent.com/DualSPHysics/DesignSPHysics/master/mod/constants.py"
 
 # FreeCAD Related Constants
@@ -35,3 +47,4 @@ SUPPORTED_TYPES = [FreeCADObjectType.BOX, FreeCADObjectType.SPHERE, FreeCADObjec
 
 MAIN_WIDGET_INTERNAL_NAME = "DSPH Widget"
 PROP_WIDGET_INTERNAL_NAME = "DSPH_Properties"
+QUEUE_WIDGET_INTERNAL_NAME = "DSPH_Simulation_Queue"
@@ -58,6 +58,9 @@ class Case():
         self.inlet_outlet: InletOutletConfig = InletOutletConfig()
         self.moorings: MooringsConfiguration = MooringsConfiguration()
         self.chrono: ChronoConfig = ChronoConfig()
+        self._objects_by_name: dict = dict()  # {name: SimulationObject}
+        self._tmp_objects_by_name: dict = dict()  # {name: SimulationObject}
+        self._objects_by_realmk: dict = dict()  # {realmk: {name: SimulationObject}}
 
     @staticmethod
     def the() -> "Case":
@@ -68,36 +71,100 @@ class Case():
 
     @staticmethod
     def update_from_disk(disk_data: "Case") -> None:
-        """ Updates the current instance for the one passed as parameter. """
-        Case.the().reset()
-        Case.merge_old_object(disk_data, Case.__instance)
+        """ Updates the current instance for the one passed as parameter.
+        The data is expected to be already upgraded to the current version by the case data file loader. """
+        disk_data.rebuild_object_indexes()
         Case.__instance = disk_data
 
+    @staticmethod
+    def create_defaults() -> "Case":
+        """ Returns a new Case with the default values, without replacing the current instance. """
+        current_instance: "Case" = Case.__instance
+        defaults: "Case" = Case(reset=True)
+        Case.__instance = current_instance
+        return defaults
+
     @staticmethod
     def merge_old_object(old, new):
         """ Merges an old object with the current version. """
         # FIXME: Add support for dicts,lists,tuples...
         for attr, value in new.__dict__.items():
-            debug("Evaluating attr {} from the new object of type {}, for the old object of type {}".format(attr, type(new), type(old)))
+            debug("Evaluating attr {} from the new object of type {}, for the old object of type {}", attr, type(new), type(old))
             if not hasattr(old, attr):
                 debug("Old object did not have that attribute. Just updating it and going forward")
                 setattr(old, attr, value)
                 continue
             if hasattr(value, "__dict__") and hasattr(old, attr):
                 # FIXME: old.attr may not have __dict__...
-                debug("The attr {} is an object, and the old object has it. Exploring...".format(attr))
+                debug("The attr {} is an object, and the old object has it. Exploring...", attr)
                 Case.merge_old_object(getattr(old, attr), value)
                 continue
 
-    def get_first_mk_not_used(self, object_type: ObjectType):
-        """ Checks simulation objects to find the first not used MK group number. """
-        mkset = set(map(lambda x: x.obj_mk, filter(lambda y: y.type == object_type, self.objects)))
+    def __getstate__(self):
+        """ Excludes the object indexes from the persisted data. They are rebuilt on load. """
+        state = self.__dict__.copy()
+        for key in ("_objects_by_name", "_tmp_objects_by_name", "_objects_by_realmk"):
+            state.pop(key, None)
+        return state
+
+    @staticmethod
+    def get_object_realmk(simobject: SimulationObject) -> int:
+        """ Returns the realmk used to key MKBasedProperties for a simulation object. """
+        return simobject.obj_mk if simobject.type == ObjectType.FLUID else simobject.obj_mk + MKFLUID_LIMIT
+
+    def rebuild_object_indexes(self) -> None:
+        """ Rebuilds the name and mk indexes from the object lists. """
+        self._objects_by_name = dict()
+        self._tmp_objects_by_name = dict()
+        self._objects_by_realmk = dict()
+        for simobject in self.objects:
+            self._index_object(simobject)
+        for simobject in self.tmp_objects:
+            self._tmp_objects_by_name[simobject.name] = simobject
+
+    def _index_object(self, simobject: SimulationObject) -> None:
+        """ Adds a simulation object to the name and mk indexes. """
+        self._objects_by_name[simobject.name] = simobject
+        self._objects_by_realmk.setdefault(self.get_object_realmk(simobject), dict())[simobject.name] = simobject
+
+    def _unindex_object(self, simobject: SimulationObject) -> None:
+        """ Removes a simulation object from the name and mk indexes. """
+        self._objects_by_name.pop(simobject.name, None)
+        realmk = self.get_object_realmk(simobject)
+        objects_with_realmk = self._objects_by_realmk.get(realmk, None)
+        if objects_with_realmk is not None:
+            objects_with_realmk.pop(simobject.name, None)
+            if not objects_with_realmk:
+                self._objects_by_realmk.pop(realmk)
+
+    def get_first_mk_not_used(self, object_type: ObjectType, reserved: set = None):
+        """ Checks simulation objects to find the first not used MK group number.
+        MK numbers in reserved are skipped too, for objects about to be added in the same batch. """
         limit = {ObjectType.FLUID: 10, ObjectType.BOUND: 240}[object_type]
+        offset = 0 if object_type == ObjectType.FLUID else MKFLUID_LIMIT
         for i in range(0, limit):
-            if i not in mkset:
+            if reserved and i in reserved:
+                continue
+            if not any(simobject.type == object_type for simobject in self._objects_by_realmk.get(i + offset, dict()).values()):
                 return i
         return 0
 
+    def get_objects_with_realmk(self, realmk: int) -> list:
+        """ Returns the simulation objects that use the given realmk. """
+        return list(self._objects_by_realmk.get(realmk, dict()).values())
+
+    def set_object_mk(self, simobject: SimulationObject, obj_mk: int) -> None:
+        """ Changes the mk of a simulation object keeping the mk index updated. """
+        self._unindex_object(simobject)
+        simobject.obj_mk = obj_mk
+        self._index_object(simobject)
+
+    def set_object_type(self, simobject: SimulationObject, obj_type: ObjectType) -> None:
+        """ Changes the type of a simulation object keeping the mk index updated. """
+        self._unindex_object(simobject)
+        simobject.type = obj_type
+        self._index_object(simobject)
+
     def get_all_simulation_object_names(self):
         """ Returns a list with all the internal names used by the objects in the simulation. """
         return list(map(lambda obj: obj.name, self.objects))
@@ -109,12 +176,12 @@ class Case():
     def get_simulation_object(self, name) -> SimulationObject:
         """ Returns a simulation object from its internal name.
         Raises an exception if the selected object is not added to the simulation. """
-        return next(filter(lambda obj: obj.name == name, self.objects), None)
-    
+        return self._objects_by_name.get(name, None)
+
     def get_tmp_object(self, name) -> SimulationObject:
         """ Returns a temporal object from its internal name.
         Raises an exception if the selected object is not added to the simulation. """
-        return next(filter(lambda obj: obj.name == name, self.tmp_objects), None)
+        return self._tmp_objects_by_name.get(name, None)
 
     def get_all_complex_objects(self) -> list:
         """ Returns all complex simulation objects. """
@@ -137,9 +204,9 @@ class Case():
         if obj_type == ObjectType.BOUND:
             mknumber += MKFLUID_LIMIT
         if not self.has_mk_properties(mknumber):
-            debug("Creating MKBasedProperties on demand for realmk: {}".format(mknumber))
+            debug("Creating MKBasedProperties on demand for realmk: {}", mknumber)
             self.mkbasedproperties[mknumber] = MKBasedProperties(mk=mknumber)
-        debug("Returning MKBasedProperties object for realmk: {}".format(mknumber))
+        debug("Returning MKBasedProperties object for realmk: {}", mknumber)
         return self.mkbasedproperties[mknumber]
 
     def has_mk_properties(self, realmk: int) -> bool:
@@ -148,7 +215,7 @@ class Case():
 
     def is_object_in_simulation(self, name) -> bool:
         """ Returns whether an object is contained in the current case for simulating or not. """
-        return name in self.get_all_simulation_object_names()
+        return name in self._objects_by_name
 
     def reset(self):
         """ Recreates the object from scratch. """
@@ -156,44 +223,77 @@ class Case():
 
     def add_object(self, simobject: SimulationObject):
         """ Adds an object to the current case """
-        if simobject.name in self.get_all_simulation_object_names():
+        if simobject.name in self._objects_by_name:
             raise RuntimeError("Object with the name: {} is already added to the case".format(simobject.name))
-        if simobject.name in self.get_all_tmp_object_names():
+        if simobject.name in self._tmp_objects_by_name:
             tmp_obj = self.get_tmp_object(simobject.name)
             tmp_obj.obj_mk = simobject.obj_mk
             #self.remove_tmp_object(simobject.name)
             self.objects.append(tmp_obj)
+            self._index_object(tmp_obj)
         else:
             self.objects.append(simobject)
+            self._index_object(simobject)
+
+    def add_objects(self, simobjects: list) -> None:
+        """ Adds several objects to the current case at once.
+        Names are validated for the whole batch before anything is added. """
+        batch_names: set = set()
+        for simobject in simobjects:
+            if simobject.name in self._objects_by_name or simobject.name in batch_names:
+                raise RuntimeError("Object with the name: {} is already added to the case".format(simobject.name))
+            batch_names.add(simobject.name)
+        for simobject in simobjects:
+            self.add_object(simobject)
 
     def add_tmp_object(self, simobject: SimulationObject):
         """ Adds an object to the current case but not to the simulation """
-        if simobject.name in self.get_all_simulation_object_names() or simobject.name in self.get_all_tmp_object_names():
+        if simobject.name in self._objects_by_name or simobject.name in self._tmp_objects_by_name:
             raise RuntimeError("Object with the name: {} is already added to the case".format(simobject.name))
         self.tmp_objects.append(simobject)
+        self._tmp_objects_by_name[simobject.name] = simobject
 
     def remove_object(self, object_name: str) -> SimulationObject:
         """ Tries to remove the given object name from the simulation.
         If no element is found an error is raised. """
-        if object_name not in self.get_all_simulation_object_names():
+        simobject = self._objects_by_name.get(object_name, None)
+        if simobject is None:
             raise RuntimeError("The object that you are trying to remove ({}) is not present in the simulation")
-        self.objects = list(filter(lambda obj: obj.name != object_name, self.objects))
+        self.objects.remove(simobject)
+        self._unindex_object(simobject)
+        self.delete_orphan_mkbasedproperties()
+
+    def remove_objects(self, object_names: list) -> None:
+        """ Removes several objects from the simulation at once, rebuilding the object list and
+        cleaning orphan MKBasedProperties a single time. If any name is not found an error is raised. """
+        to_remove: dict = dict()
+        for object_name in object_names:
+            simobject = self._objects_by_name.get(object_name, None)
+            if simobject is None:
+                raise RuntimeError("The object that you are trying to remove ({}) is not present in the simulation".format(object_name))
+            to_remove[id(simobject)] = simobject
+        if not to_remove:
+            return
+        self.objects = [simobject for simobject in self.objects if id(simobject) not in to_remove]
+        for simobject in to_remove.values():
+            self._unindex_object(simobject)
         self.delete_orphan_mkbasedproperties()
-    
+
     def remove_tmp_object(self, object_name: str) -> SimulationObject:
         """ Tries to remove the given object name from the temporal object list.
         If no element is found an error is raised. """
-        if object_name in self.get_all_tmp_object_names():
-            self.tmp_objects = list(filter(lambda obj: obj.name != object_name, self.tmp_objects))
+        simobject = self._tmp_objects_by_name.pop(object_name, None)
+        if simobject is not None:
+            self.tmp_objects.remove(simobject)
             self.delete_orphan_mkbasedproperties()
 
+    def get_realmk_object_count(self, realmk: int) -> int:
+        """ Returns how many simulation objects use the given realmk. """
+        return len(self._objects_by_realmk.get(realmk, ()))
+
     def get_orphan_mkbasedproperties(self):
         """ Returns all MKBasedProperties that no longer have an object present in the case. """
-        to_ret: list = list()
-        for realmk in self.mkbasedproperties:
-            if realmk not in map(lambda obj: obj.obj_mk if obj.type == ObjectType.FLUID else obj.obj_mk + MKFLUID_LIMIT, Case.the().objects):
-                to_ret.append(realmk)
-        return to_ret
+        return [realmk for realmk in self.mkbasedproperties if realmk not in self._objects_by_realmk]
 
     def delete_orphan_mkbasedproperties(self):
         """ Deletes all MKBasedProperties that no longer have an object present in the case. """
@@ -18,7 +18,6 @@ class CaseInformation():
         self.particle_number: int = 0
         self.run_additional_parameters: str = ""
         self.needs_to_run_gencase: bool = True
-        self.current_output: str = ""
         self.measuretool_points: list = []
         self.measuretool_grid: list = []
         self.last_3d_width: float = -1.0
@@ -29,6 +28,11 @@ class CaseInformation():
 
         self.load_default_materials()
 
+    def __setstate__(self, state):
+        """ Drops the post-processing output stored by older versions. """
+        state.pop("current_output", None)
+        self.__dict__.update(state)
+
     def update_last_used_directory(self, new_path: str) -> None:
         """ Updates the last used directory with the folder from the provided path. """
         if not new_path:
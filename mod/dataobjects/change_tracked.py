@@ -0,0 +1,21 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics change tracking for data objects. """
+
+
+class ChangeTracked():
+    """ Base for data objects that record when any of their public attributes is assigned.
+    Objects restored from disk do not carry the flag and are considered changed. """
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith("_"):
+            object.__setattr__(self, "_changed", True)
+
+    def is_changed(self) -> bool:
+        """ Returns whether a public attribute was assigned since the last time this object was marked as clean. """
+        return self.__dict__.get("_changed", True)
+
+    def mark_clean(self) -> None:
+        """ Marks this object as not changed. """
+        object.__setattr__(self, "_changed", False)
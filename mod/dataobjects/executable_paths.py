@@ -5,7 +5,7 @@
 import pickle
 import os
 
-from mod.executable_tools import executable_contains_string, get_executable_info_flag
+from mod.executable_tools import executable_contains_string, get_executable_info_flag, ExecutableProbe, ExecutableValidator
 from mod.file_tools import get_saved_config_file, get_default_config_file
 from mod.dialog_tools import error_dialog
 from mod.stdout_tools import debug
@@ -32,11 +32,9 @@ class ExecutablePaths():
 
         self.restore_from_disk()
 
-    def check_and_filter(self):
-        """ Filters the executable removing those not matching the correct application.
-            Returns whether or not all of them were correctly set. """
-        execs_correct: bool = True
-        execs_to_check = {
+    def get_tool_executables(self) -> dict:
+        """ Returns the DualSPHysics package executables, by the word their -ver output should contain. """
+        return {
             "gencase": self.gencase,
             "dualsphysics": self.dsphysics,
             "partvtk": self.partvtk,
@@ -49,20 +47,40 @@ class ExecutablePaths():
             "bathymetrytool": self.bathymetrytool
         }
 
+    def check_and_filter(self):
+        """ Filters the executable removing those not matching the correct application.
+            Returns whether or not all of them were correctly set. """
+        execs_to_check = self.get_tool_executables()
+
+        # Executables not probed before run at the same time instead of one after another
+        ExecutableProbe.the().probe(list(execs_to_check.values()), wait=True)
+
         bad_executables: list = list()
 
         for word, executable in execs_to_check.items():
             if not executable_contains_string(executable, word):
-                debug("Executable {} does not contain the word {}".format(executable, word))
-                execs_correct = False
+                debug("Executable {} does not contain the word {}", executable, word)
                 bad_executables.append(executable)
 
-        if not execs_correct:
+        return self.report_bad_executables(bad_executables)
+
+    def check_and_filter_in_background(self, parent=None) -> None:
+        """ Checks the executables like check_and_filter, but without blocking.
+            The executables are probed concurrently and the ones not correct are reported once all of them answered. """
+        validator = ExecutableValidator(self.get_tool_executables(), parent=parent)
+        validator.finished.connect(self.report_bad_executables)
+        validator.finished.connect(validator.deleteLater)
+        validator.start()
+
+    def report_bad_executables(self, bad_executables: list) -> bool:
+        """ Shows the executables that are not correct, if any, and persists the paths.
+            Returns whether or not all of them were correct. """
+        if bad_executables:
             error_dialog("One or more of the executables set on the configuration is not correct. Please see the details below.",
                          "These executables do not correspond to their appropriate tool or do not have execution permissions:\n\n{}".format(LINE_END.join(bad_executables)))
 
         self.persist()
-        return execs_correct
+        return not bad_executables
 
     def supports_moorings(self) -> bool:
         """ Returns whether this package supports Moorings + MoorDyn or not. """
@@ -2,8 +2,10 @@
 # -*- coding: utf-8 -*-
 """ DesignSPHysics Faces Property data """
 
+from mod.dataobjects.change_tracked import ChangeTracked
 
-class FacesProperty():
+
+class FacesProperty(ChangeTracked):
     """ Stores the faces selected to generate on GenCase for a given object """
 
     def __init__(self, all_faces=False, front_face=False,
@@ -28,11 +28,11 @@ class InletOutletZone:
 
     def __getattr__(self, attr):
         if attr == "refilling":
-            debug("refilling property in InletOutletZone <{}> nonexistent: Creating one".format(self.id))
+            debug("refilling property in InletOutletZone <{}> nonexistent: Creating one", self.id)
             self.refilling: InletOutletRefillingMode = InletOutletRefillingMode.SIMPLE_FULL
             return self.refilling
         if attr == "inputtreatment":
-            debug("inputtreatment property in InletOutletZone <{}> nonexistent: Creating one".format(self.id))
+            debug("inputtreatment property in InletOutletZone <{}> nonexistent: Creating one", self.id)
             self.inputtreatment: InletOutletInputTreatment = InletOutletInputTreatment.NO_CHANGES
             return self.inputtreatment
         raise AttributeError()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics simulation progress data. """
+
+from mod.constants import ETA_REGRESSION_SAMPLES
+
+
+class RunMetricsSample():
+    """ Metrics of a DualSPHysics simulation at the moment a Part was stored. """
+
+    CSV_HEADER = ("part", "sim_time", "wall_time", "total_steps", "steps_per_second", "particles_out", "part_interval")
+
+    def __init__(self, part: int, sim_time: float, wall_time: float, total_steps: int = None):
+        self.part: int = part
+        self.sim_time: float = sim_time  # Simulated seconds
+        self.wall_time: float = wall_time  # Seconds since the monitor started following the run
+        self.total_steps: int = total_steps
+        self.steps_per_second: float = None  # Steps computed per wall-clock second since the previous sample
+        self.particles_out: int = 0
+        self.part_interval: float = None  # Wall-clock seconds since the previous Part
+
+    def to_csv_row(self) -> tuple:
+        """ Returns the sample values in the order of CSV_HEADER. """
+        return (self.part, self.sim_time, "{:.3f}".format(self.wall_time), self.total_steps,
+                "" if self.steps_per_second is None else "{:.3f}".format(self.steps_per_second),
+                self.particles_out,
+                "" if self.part_interval is None else "{:.3f}".format(self.part_interval))
+
+    def to_csv_dict(self) -> dict:
+        """ Returns the sample values keyed by their CSV_HEADER field. """
+        return dict(zip(self.CSV_HEADER, self.to_csv_row()))
+
+
+class RunProgress():
+    """ Progress of a DualSPHysics simulation, as reported on its Run.out file. """
+
+    def __init__(self):
+        self.timemax: float = None  # Read from the TimeMax= line
+        self.current_time: float = None  # Simulated time of the last Part line
+        self.last_part: int = None  # Number of the last Part line
+        self.particles_out: int = 0
+        self.estimated_time: str = None  # ETA as printed on the last Part line
+        self.exception_found: bool = False
+        self.timeline: list = list()  # [RunMetricsSample]
+
+    def get_percentage(self, timemax: float) -> float:
+        """ Returns the completed percentage of the simulation for a given maximum time.
+        Returns None if no Part was stored yet. """
+        if self.current_time is None or not timemax or timemax < 0:
+            return None
+        return (self.current_time * float(100)) / float(timemax)
+
+    def add_sample(self, sample: RunMetricsSample) -> None:
+        """ Appends a sample to the timeline, computing its rates from the previous one. """
+        if self.timeline:
+            previous: RunMetricsSample = self.timeline[-1]
+            elapsed: float = sample.wall_time - previous.wall_time
+            sample.part_interval = elapsed
+            if elapsed > 0 and sample.total_steps is not None and previous.total_steps is not None:
+                sample.steps_per_second = (sample.total_steps - previous.total_steps) / elapsed
+            else:
+                # Parts read in the same poll share their wall time
+                sample.steps_per_second = previous.steps_per_second
+        sample.particles_out = self.particles_out
+        self.timeline.append(sample)
+
+    def set_particles_out(self, particles_out: int) -> None:
+        """ Sets the total particles out, which Run.out reports after the Part line they belong to. """
+        self.particles_out = particles_out
+        if self.timeline:
+            self.timeline[-1].particles_out = particles_out
+
+    def get_recent_samples(self, count: int = ETA_REGRESSION_SAMPLES) -> list:
+        """ Returns the last samples of the timeline. """
+        return self.timeline[-count:]
+
+    def get_steps_per_second(self) -> float:
+        """ Returns the average steps per wall-clock second over the recent samples, or None if unknown. """
+        samples: list = self.get_recent_samples()
+        if len(samples) < 2 or samples[0].total_steps is None or samples[-1].total_steps is None:
+            return None
+        elapsed: float = samples[-1].wall_time - samples[0].wall_time
+        if elapsed <= 0:
+            return None
+        return (samples[-1].total_steps - samples[0].total_steps) / elapsed
+
+    def get_part_cadence(self) -> float:
+        """ Returns the average wall-clock seconds between Parts over the recent samples, or None if unknown. """
+        samples: list = self.get_recent_samples()
+        if len(samples) < 2:
+            return None
+        elapsed: float = samples[-1].wall_time - samples[0].wall_time
+        if elapsed <= 0:
+            return None
+        return elapsed / (len(samples) - 1)
+
+    def get_estimated_seconds(self, timemax: float) -> float:
+        """ Returns the wall-clock seconds left to reach timemax, computed by a least squares fit of the
+        simulated time against the wall-clock time of the recent samples. Returns None if it can't be estimated. """
+        samples: list = self.get_recent_samples()
+        if len(samples) < 2 or not timemax or timemax < 0:
+            return None
+        mean_wall: float = sum(sample.wall_time for sample in samples) / len(samples)
+        mean_sim: float = sum(sample.sim_time for sample in samples) / len(samples)
+        variance: float = sum((sample.wall_time - mean_wall) ** 2 for sample in samples)
+        if variance <= 0:
+            return None
+        covariance: float = sum((sample.wall_time - mean_wall) * (sample.sim_time - mean_sim) for sample in samples)
+        throughput: float = covariance / variance  # Simulated seconds per wall-clock second
+        if throughput <= 0:
+            return None
+        return max(0.0, (timemax - samples[-1].sim_time) / throughput)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics simulation queue job data. """
+
+import time
+import uuid
+
+from mod.enums import JobStatus
+
+
+class SimulationJob():
+    """ A DualSPHysics execution of a saved case, waiting on or run by the simulation queue. """
+
+    def __init__(self, case_path: str = "", case_name: str = "", device: str = "cpu", additional_parameters: str = "", executable: str = ""):
+        self.job_id: str = uuid.uuid4().hex
+        self.case_path: str = case_path
+        self.case_name: str = case_name
+        self.device: str = device  # cpu or gpu
+        self.additional_parameters: str = additional_parameters
+        self.executable: str = executable  # DualSPHysics executable set on the case when the job was queued
+        self.status: str = JobStatus.QUEUED
+        self.exit_code: int = None
+        self.percentage: float = None
+        self.estimated_seconds: float = None
+        self.queued_at: float = time.time()
+        self.started_at: float = None
+        self.finished_at: float = None
+
+    def get_out_folder_path(self) -> str:
+        """ Returns the output folder of the case. """
+        return "{path}/{name}_out/".format(path=self.case_path, name=self.case_name)
+
+    def get_out_xml_file_path(self) -> str:
+        """ Returns the path of the out xml file needed to execute DualSPHysics. """
+        return "{path}/{name}_out/{name}".format(path=self.case_path, name=self.case_name)
+
+    def is_active(self) -> bool:
+        """ Returns whether the job is waiting or running. """
+        return self.status in (JobStatus.QUEUED, JobStatus.RUNNING)
+
+    def to_dict(self) -> dict:
+        """ Returns the job data to persist. """
+        return dict(self.__dict__)
+
+    @staticmethod
+    def from_dict(data: dict) -> "SimulationJob":
+        """ Builds a job from persisted data, ignoring unknown keys. """
+        job = SimulationJob()
+        for key, value in data.items():
+            if key in job.__dict__:
+                setattr(job, key, value)
+        return job
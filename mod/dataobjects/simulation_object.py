@@ -8,10 +8,11 @@ from mod.stdout_tools import debug
 from mod.enums import ObjectType, ObjectFillMode, FreeCADObjectType
 from mod.constants import SUPPORTED_TYPES, MKFLUID_LIMIT, MKFLUID_OFFSET
 
+from mod.dataobjects.change_tracked import ChangeTracked
 from mod.dataobjects.faces_property import FacesProperty
 
 
-class SimulationObject():
+class SimulationObject(ChangeTracked):
     """ Represents an object on a DualSPHysics / GenCase case """
 
     def __init__(self, name: str, obj_mk: int, obj_type: ObjectType, fillmode: ObjectFillMode):
@@ -25,7 +26,7 @@ class SimulationObject():
 
     def __getattr__(self, attr):
         if attr == "frdrawmode":
-            debug("frdrawmode property in simulation object <{}> nonexistent: Creating one".format(self.name))
+            debug("frdrawmode property in simulation object <{}> nonexistent: Creating one", self.name)
             self.frdrawmode: bool = False
             return self.frdrawmode
         raise AttributeError()
@@ -18,12 +18,14 @@ def warning_dialog(warn_text, detailed_text=None):
 
 
 def error_dialog(error_text, detailed_text=None):
-    """Spawns an error dialog with the text and details passed."""
+    """Spawns an error dialog with the text and details passed.
+    The details can be a callable returning them, only called if the user opens them."""
     InformationDialog(__("ERROR"), error_text, detailed_text)
 
 
 def info_dialog(info_text, detailed_text=None):
-    """Spawns an info dialog with the text and details passed."""
+    """Spawns an info dialog with the text and details passed.
+    The details can be a callable returning them, only called if the user opens them."""
     InformationDialog(__("Information"), info_text, detailed_text)
 
 
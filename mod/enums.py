@@ -283,6 +283,15 @@ class ContactMethod:
     SMC = 1
 
 
+class JobStatus:
+    """ States of a job in the simulation queue. """
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
 class HelpText:
     """ Help strings for different zones of the application GUIs. """
     POINTREFX = __("Reference point to create particles in X direction.")
@@ -7,61 +7,286 @@ from os import path, environ, chdir, stat, chmod, access, X_OK
 import stat as unix_stat
 from sys import platform
 import json
+import hashlib
 
 # from PySide import QtCore
 from PySide6 import QtCore
 
+import FreeCAD
 import FreeCADGui
 
 from mod.translation_tools import __
-from mod.constants import APP_NAME
+from mod.stdout_tools import debug, warning
+from mod.constants import APP_NAME, EXECUTABLE_PROBE_TIMEOUT_MS
 
 
 def executable_contains_string(executable: str, string: str) -> bool:
-    """ Returns whether the standard output of the executable contains the passed string.
-        The string passed as a parameters is not case sensitive. """
-    refocus_cwd()
+    """ Returns whether the output of the executable -ver flag contains the passed string.
+        The string passed as a parameters is not case sensitive. The output is cached by ExecutableProbe. """
     if path.isfile(executable):
-        process = QtCore.QProcess(FreeCADGui.getMainWindow())
-
-        if platform in ("linux", "linux2"):
-            environ["LD_LIBRARY_PATH"] = path.dirname(executable)
-
-        ensure_process_is_executable_or_fail(executable)
-        process.start("\"{}\" -ver".format(executable))
-        process.waitForFinished()
-        try:
-            output = str(process.readAllStandardOutput().data(), encoding='utf-8')
-        except UnicodeDecodeError:
-            output = str(process.readAllStandardOutput().data(), encoding='latin1')
-
-        return string.lower() in output.lower()
+        return string.lower() in ExecutableProbe.the().get_version_output(executable).lower()
 
     return False
 
 
 def get_executable_info_flag(executable: str) -> dict:
     """ Returns a dictionary with the JSON generated by the -info flag on the
-        DualSPHysics package executables. """
-    refocus_cwd()
+        DualSPHysics package executables. The output is cached by ExecutableProbe.
+        Raises ValueError if the executable does not generate valid JSON. """
     if path.isfile(executable):
-        process = QtCore.QProcess(FreeCADGui.getMainWindow())
+        info: dict = ExecutableProbe.the().get_info(executable)
+        if info is None:
+            raise ValueError("{} did not report its information with the -info flag".format(executable))
+        return info
+
+    return None
+
+
+class ExecutableProbe(QtCore.QObject):
+    """ Cache of the -info and -ver outputs of the DualSPHysics package executables.
+    Entries are identified by the executable path, and are valid while its size and modification time do not change,
+    or while its contents hash the same. The cache is persisted in the FreeCAD user directory, so executables are only
+    run again after they change. Executables not cached yet are probed concurrently, and killed if they do not answer
+    within EXECUTABLE_PROBE_TIMEOUT_MS. Executables that timed out are not cached. """
+    __instance: "ExecutableProbe" = None
+
+    probed = QtCore.Signal(str)  # Executable path
+
+    FLAGS = ("-info", "-ver")
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self):
+        """ Virtually private constructor. """
+        if ExecutableProbe.__instance is not None:
+            raise Exception("ExecutableProbe class is a singleton and should not be initialized twice")
+        super().__init__()
+        ExecutableProbe.__instance = self
+        self.entries: dict = dict()  # {executable: {"size", "mtime", "hash", "info", "version"}}
+        self.running: dict = dict()  # {executable: {flag: QProcess}}
+        self.outputs: dict = dict()  # {executable: {flag: output}}
+        self.timers: dict = dict()  # {executable: QTimer}
+        self.timed_out: set = set()  # Executables killed for not answering in time
+        self.failures: dict = dict()  # {executable: entry} of the probes that failed, kept until the next explicit probe
+        self.restore_from_disk()
+
+    @staticmethod
+    def the() -> "ExecutableProbe":
+        """ Static access method. """
+        if ExecutableProbe.__instance is None:
+            ExecutableProbe()
+        return ExecutableProbe.__instance
+
+    def get_save_file(self) -> str:
+        """ Returns the path of the cache file saved in the FreeCAD user directory. """
+        return "{datadir}/designsphysics-executable-probes.json".format(datadir=FreeCAD.getUserAppDataDir())
+
+    def restore_from_disk(self) -> None:
+        """ Restores the persisted cache. """
+        if not path.exists(self.get_save_file()):
+            return
+        try:
+            with open(self.get_save_file(), "r", encoding="utf-8") as save_file:
+                entries: dict = json.load(save_file)
+            # Failed probes persisted by previous versions are probed again
+            self.entries = {key: entry for key, entry in entries.items() if entry.get("version")}
+        except (OSError, ValueError) as ex:
+            warning("Could not restore the executable probe cache: {}", ex)
+
+    def persist(self) -> None:
+        """ Persists the cache to disk. """
+        try:
+            with open(self.get_save_file(), "w", encoding="utf-8") as save_file:
+                json.dump(self.entries, save_file, indent=4)
+        except OSError as ex:
+            warning("Could not save the executable probe cache: {}", ex)
+
+    @staticmethod
+    def get_key(executable: str) -> str:
+        """ Returns the key of an executable on the cache. """
+        return path.abspath(executable)
 
+    @staticmethod
+    def compute_hash(executable: str) -> str:
+        """ Returns the hash of the contents of an executable. """
+        digest = hashlib.sha256()
+        with open(executable, "rb") as executable_file:
+            for chunk in iter(lambda: executable_file.read(ExecutableProbe.HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get_entry(self, executable: str) -> dict:
+        """ Returns the cached entry of an executable if it is still valid, or None. """
+        entry: dict = self.entries.get(self.get_key(executable))
+        if entry is None:
+            return None
+        try:
+            executable_stat = stat(executable)
+        except OSError:
+            return None
+        if entry["size"] == executable_stat.st_size and entry["mtime"] == executable_stat.st_mtime_ns:
+            return entry
+        if entry["size"] != executable_stat.st_size or entry["hash"] != self.compute_hash(executable):
+            return None
+        # Touched but not modified
+        entry["mtime"] = executable_stat.st_mtime_ns
+        self.persist()
+        return entry
+
+    def is_pending(self, executable: str) -> bool:
+        """ Returns whether an executable is being probed. """
+        return self.get_key(executable) in self.running
+
+    def get_info(self, executable: str) -> dict:
+        """ Returns the parsed -info output of an executable, or None if it is not valid JSON. Probes it if it is not cached. """
+        return self.get_or_probe(executable)["info"]
+
+    def get_version_output(self, executable: str) -> str:
+        """ Returns the -ver output of an executable. Probes it if it is not cached. """
+        return self.get_or_probe(executable)["version"]
+
+    def get_or_probe(self, executable: str) -> dict:
+        """ Returns the cached entry of an executable, waiting for it to be probed if needed. """
+        entry: dict = self.get_entry(executable)
+        if entry is None and self.get_key(executable) in self.failures:
+            return self.failures[self.get_key(executable)]
+        if entry is None:
+            self.probe([executable], wait=True)
+            entry = self.get_entry(executable)
+        return entry or self.failures.get(self.get_key(executable)) or {"info": None, "version": ""}
+
+    def probe(self, executables: list, wait: bool = False) -> None:
+        """ Probes, concurrently, the executables that are not cached yet, retrying the ones that failed before.
+        Waits for them to finish if requested. """
+        for executable in set(executables):
+            if executable and path.isfile(executable) and not self.is_pending(executable) and self.get_entry(executable) is None:
+                self.failures.pop(self.get_key(executable), None)
+                self.start_probe(executable)
+        if wait:
+            for executable in executables:
+                for process in list(self.running.get(self.get_key(executable), dict()).values()):
+                    if not process.waitForFinished(EXECUTABLE_PROBE_TIMEOUT_MS):
+                        self.on_probe_timeout(executable)
+                        process.waitForFinished()
+
+    def start_probe(self, executable: str) -> None:
+        """ Launches an executable with each probed flag. """
+        refocus_cwd()
+        key: str = self.get_key(executable)
+        try:
+            ensure_process_is_executable_or_fail(executable)
+        except RuntimeError as ex:
+            warning(str(ex))
+            return
+        environment = QtCore.QProcessEnvironment.systemEnvironment()
         if platform in ("linux", "linux2"):
-            environ["LD_LIBRARY_PATH"] = path.dirname(executable)
+            environment.insert("LD_LIBRARY_PATH", path.dirname(executable))
+
+        debug("Probing {}", executable)
+        self.running[key] = dict()
+        self.outputs[key] = dict()
+        for flag in self.FLAGS:
+            process = QtCore.QProcess(self)
+            process.setProcessEnvironment(environment)
+            process.finished.connect(lambda _exit_code, _exit_status, e=executable, f=flag: self.on_probe_finished(e, f))
+            process.errorOccurred.connect(lambda error, e=executable, f=flag: self.on_probe_error(e, f, error))
+            self.running[key][flag] = process
+        timer = QtCore.QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda e=executable: self.on_probe_timeout(e))
+        timer.start(EXECUTABLE_PROBE_TIMEOUT_MS)
+        self.timers[key] = timer
+        for flag, process in list(self.running[key].items()):
+            process.start(executable, [flag])
 
-        executable_cli = "\"{}\" -info".format(executable)
-        ensure_process_is_executable_or_fail(executable)
-        process.start(executable_cli)
-        process.waitForFinished()
+    def on_probe_timeout(self, executable: str) -> None:
+        """ Kills the probes of an executable that did not answer in time. """
+        key: str = self.get_key(executable)
+        if key not in self.running:
+            return
+        warning("{} did not answer within {} ms", executable, EXECUTABLE_PROBE_TIMEOUT_MS)
+        self.timed_out.add(key)
+        for flag, process in list(self.running[key].items()):
+            if flag not in self.outputs[key]:
+                process.kill()
+
+    def on_probe_error(self, executable: str, flag: str, error) -> None:
+        """ Finishes a probe whose process could not start, as no finished signal follows. """
+        if error == QtCore.QProcess.FailedToStart:
+            self.on_probe_finished(executable, flag, failed=True)
+
+    def on_probe_finished(self, executable: str, flag: str, failed: bool = False) -> None:
+        """ Stores the output of a probe, caching the executable once all its probes finished.
+        Only probes whose processes exited normally with some output are persisted. The rest are kept in memory,
+        so a transient failure (a missing driver, a mount not ready yet) is retried on the next explicit probe. """
+        key: str = self.get_key(executable)
+        process: QtCore.QProcess = self.running.get(key, dict()).get(flag)
+        if process is None or flag in self.outputs[key]:
+            return
+        data: bytes = process.readAllStandardOutput().data()
+        if failed or process.exitStatus() != QtCore.QProcess.NormalExit or not data:
+            self.outputs[key][flag] = None
+        else:
+            try:
+                self.outputs[key][flag] = str(data, encoding="utf-8")
+            except UnicodeDecodeError:
+                self.outputs[key][flag] = str(data, encoding="latin1")
+        if len(self.outputs[key]) < len(self.FLAGS):
+            return
+
+        for finished_process in self.running.pop(key).values():
+            finished_process.deleteLater()
+        self.timers.pop(key).stop()
+        outputs: dict = self.outputs.pop(key)
+        if key in self.timed_out or None in outputs.values():
+            self.timed_out.discard(key)
+            debug("The probe of {} failed, it will be retried on the next check", executable)
+            self.failures[key] = {"info": None, "version": outputs["-ver"] or ""}
+            self.probed.emit(executable)
+            return
         try:
-            output = str(process.readAllStandardOutput().data(), encoding='utf-8')
-        except UnicodeDecodeError:
-            output = str(process.readAllStandardOutput().data(), encoding='latin1')
+            info: dict = json.loads(outputs["-info"])
+        except ValueError:
+            info = None
+        try:
+            executable_stat = stat(executable)
+            self.entries[key] = {"size": executable_stat.st_size, "mtime": executable_stat.st_mtime_ns, "hash": self.compute_hash(executable),
+                                 "info": info, "version": outputs["-ver"]}
+            self.persist()
+        except OSError as ex:
+            warning("Could not cache the probe of {}: {}", executable, ex)
+        self.probed.emit(executable)
 
-        return json.loads(output)
 
-    return None
+class ExecutableValidator(QtCore.QObject):
+    """ Checks, without blocking, that each executable is the tool it should be, by the word its -ver output contains.
+    Every executable is probed at the same time, and the ones that are not valid are reported through the finished signal. """
+
+    finished = QtCore.Signal(list)  # Executables that are not valid
+
+    def __init__(self, tool_executables: dict, parent=None):
+        super().__init__(parent=parent)
+        self.tool_executables: dict = tool_executables  # {word: executable}
+        self.probe: ExecutableProbe = ExecutableProbe.the()
+        self.done: bool = False
+
+    def start(self) -> None:
+        """ Probes the executables that are not cached yet. Reports right away if all of them are. """
+        self.probe.probe(list(self.tool_executables.values()))
+        self.probe.probed.connect(self.on_probed)
+        self.on_probed("")
+
+    def on_probed(self, _executable: str) -> None:
+        """ Reports the executables that are not valid once none of them is being probed. """
+        if self.done or any(self.probe.is_pending(executable) for executable in self.tool_executables.values() if executable):
+            return
+        self.done = True
+        self.probe.probed.disconnect(self.on_probed)
+        self.finished.emit([executable for word, executable in self.tool_executables.items() if not self.is_valid(executable, word)])
+
+    def is_valid(self, executable: str, word: str) -> bool:
+        """ Returns whether the cached -ver output of an executable contains a word. Executables that could not be probed are not valid. """
+        entry: dict = self.probe.get_entry(executable) if executable and path.isfile(executable) else None
+        return entry is not None and word.lower() in entry["version"].lower()
 
 
 def refocus_cwd():
@@ -10,15 +10,14 @@ meant to use with FreeCAD.
 
 """
 
-import pickle
 import json
 import shutil
-import re
 
 from sys import platform
+from pickle import UnpicklingError
 from traceback import print_exc
 from glob import glob
-from os import path, chdir, makedirs
+from os import path, makedirs, remove
 
 import FreeCAD
 import FreeCADGui
@@ -31,10 +30,13 @@ from mod.translation_tools import __
 from mod.xml.xml_exporter import XMLExporter
 from mod.dialog_tools import error_dialog, warning_dialog
 from mod.executable_tools import refocus_cwd
-from mod.freecad_tools import document_count, prompt_close_all_documents, get_fc_object
+from mod.freecad_tools import document_count, prompt_close_all_documents, get_fc_object, get_fc_object_signature
 from mod.enums import ObjectType, ObjectFillMode
+from mod.part_index import PartIndex
+from mod.case_format import read_case_file, write_case_file
+from mod.save_manifest import SaveManifest
 
-from mod.constants import VERSION, PICKLE_PROTOCOL
+from mod.constants import VERSION
 
 from mod.dataobjects.flow_tool_box import FlowToolBox
 from mod.dataobjects.motion.special_movement import SpecialMovement
@@ -48,10 +50,8 @@ from mod.dataobjects.properties.material_property import MaterialProperty
 
 
 def get_total_exported_parts_from_disk(out_folder_path) -> int:
-    """ Gets the integer for the part with largest number on the out folder. """
-    files_glob = glob("{}/Part_*.bi4".format(out_folder_path))
-    files_glob.sort()
-    return int(re.search("Part_(.*).bi4", files_glob[-1]).group(1))
+    """ Gets the integer for the part with largest number on the out folder, or None if there are no parts. """
+    return PartIndex.for_folder(out_folder_path).get_last_part()
 
 
 def load_case(load_path: str) -> "Case":
@@ -69,26 +69,25 @@ def load_case(load_path: str) -> "Case":
 
     FreeCAD.open(project_folder_path + "/DSPH_Case.FCStd")
 
-    with open(load_path, "rb") as load_picklefile:
-        try:
-            loaded_data = pickle.load(load_picklefile)
-            if not loaded_data.version:
-                warning_dialog(__("The case data you're trying to load is older than version 0.6 and cannot be loaded."))
-                prompt_close_all_documents(prompt=False)
-                return None
-            if loaded_data.version < VERSION:
-                warning_dialog(__("The case data you are loading is from a previous version ({}) of this software. They may be missing features or errors.").format(loaded_data.version))
-            elif loaded_data.version > VERSION:
-                warning_dialog(__("You're loading a case data from a future version ({}) of this software. You should upgrade DesignSPHysics as they may be errors using this file.").format(loaded_data.version))
-
-            return loaded_data
-        except AttributeError:
-            error_dialog(__("There was an error opening the case. Case Data file seems to be corrupted."))
+    try:
+        loaded_data = read_case_file(load_path)
+        if not loaded_data.version:
+            warning_dialog(__("The case data you're trying to load is older than version 0.6 and cannot be loaded."))
+            prompt_close_all_documents(prompt=False)
             return None
+        if loaded_data.version < VERSION:
+            warning_dialog(__("The case data you are loading is from a previous version ({}) of this software. They may be missing features or errors.").format(loaded_data.version))
+        elif loaded_data.version > VERSION:
+            warning_dialog(__("You're loading a case data from a future version ({}) of this software. You should upgrade DesignSPHysics as they may be errors using this file.").format(loaded_data.version))
+
+        return loaded_data
+    except (AttributeError, ValueError, EOFError, UnpicklingError):
+        error_dialog(__("There was an error opening the case. Case Data file seems to be corrupted."))
+        return None
 
 
-def save_case(save_name: str, case: "Case") -> None:
-    """ Saves a case to disk in the given path. """
+def save_case(save_name: str, case: "Case") -> bool:
+    """ Saves a case to disk in the given path. Returns whether the case data could be saved. """
     project_name = save_name.split("/")[-1]
 
     case.path = save_name
@@ -100,11 +99,22 @@ def save_case(save_name: str, case: "Case") -> None:
     if not path.exists("{}/{}_out".format(save_name, project_name)):
         makedirs("{}/{}_out".format(save_name, project_name))
 
+    # Only the assets that changed since the last save are exported or copied again
+    manifest = SaveManifest(save_name)
+    out_folder = "{}/{}_out".format(save_name, project_name)
+
     # Export all complex objects to STL
     for obj in case.get_all_complex_objects():
-        Mesh.export([get_fc_object(obj.name)], "{}/{}.stl".format(save_name, obj.name))
-
-    # FIXME: Too many branches
+        fc_object = get_fc_object(obj.name)
+        stl_path = "{}/{}.stl".format(save_name, obj.name)
+        signature = get_fc_object_signature(fc_object)
+        if manifest.is_generated_current(stl_path, signature):
+            continue
+        # Mesh.export rewrites an existing file in place, which would change every hardlink to it
+        if path.lexists(stl_path):
+            remove(stl_path)
+        Mesh.export([fc_object], stl_path)
+        manifest.record_generated(stl_path, signature)
 
     # Copy files from movements and change its paths to be inside the project.
     for _, mkproperties in case.mkbasedproperties.items():
@@ -112,164 +122,87 @@ def save_case(save_name: str, case: "Case") -> None:
             if isinstance(movement, SpecialMovement):
                 if isinstance(movement.generator, (FileGen, RotationFileGen)):
                     filename = movement.generator.filename
-                    debug("Copying {} to {}".format(filename, save_name))
-
-                    # Change directory to de case one, so if file path is already relative it copies it to the
-                    # out folder
-                    chdir(save_name)
-
-                    try:
-                        # Copy to project root
-                        shutil.copy2(filename, save_name)
-                    except shutil.Error:
-                        # Probably already copied the file.
-                        pass
-                    except IOError:
-                        error("Unable to copy {} into {}".format(filename, save_name))
-
-                    try:
-                        # Copy to project out folder
-                        shutil.copy2(filename, save_name + "/" + project_name + "_out")
-
+                    if copy_project_file(manifest, filename, save_name, out_folder):
                         movement.generator.filename = "{}".format(filename.split("/")[-1])
-                    except shutil.Error:
-                        # Probably already copied the file.
-                        pass
-                    except IOError:
-                        error("Unable to copy {} into {}".format(filename, save_name + "/" + project_name + "_out"))
 
     # Copy files from Acceleration input and change paths to be inside the project folder.
     for aid in case.acceleration_input.acclist:
         filename = aid.datafile
-        debug("Copying {} to {}".format(filename, save_name + "/" + project_name + "_out"))
-
-        # Change directory to de case one, so if file path is already relative it copies it to the
-        # out folder
-        chdir(save_name)
-
-        try:
-            # Copy to project root
-            shutil.copy2(filename, save_name)
-        except shutil.Error:
-            # Probably already copied the file.
-            pass
-        except IOError:
-            error("Unable to copy {} into {}".format(filename, save_name))
-
-        try:
-            # Copy to project out folder
-            shutil.copy2(filename, save_name + "/" + project_name + "_out")
-
+        if copy_project_file(manifest, filename, save_name, out_folder):
             aid.datafile = filename.split("/")[-1]
 
-        except shutil.Error:
-            # Probably already copied the file.
-            pass
-        except IOError:
-            error("Unable to copy {} into {}".format(filename, save_name))
-
     # Copy files from pistons and change paths to be inside the project folder.
     for _, mkproperties in case.mkbasedproperties.items():
         if isinstance(mkproperties.mlayerpiston, MLPiston1D):
             filename = mkproperties.mlayerpiston.filevelx
-            debug("Copying {} to {}".format(filename, save_name + "/" + project_name + "_out"))
-            # Change directory to de case one, so if file path is already relative it copies it to the
-            # out folder
-            chdir(save_name)
-
-            try:
-                # Copy to project root
-                shutil.copy2(filename, save_name)
-            except shutil.Error:
-                # Probably already copied the file.
-                pass
-            except IOError:
-                error("Unable to copy {} into {}".format(filename, save_name))
-
-            try:
-                # Copy to project out folder
-                shutil.copy2(filename, save_name + "/" + project_name + "_out")
-
+            if copy_project_file(manifest, filename, save_name, out_folder):
                 mkproperties.mlayerpiston.filevelx = filename.split("/")[-1]
-            except shutil.Error:
-                # Probably already copied the file.
-                pass
-            except IOError:
-                error("Unable to copy {} into {}".format(filename, save_name))
 
         if isinstance(mkproperties.mlayerpiston, MLPiston2D):
             veldata = mkproperties.mlayerpiston.veldata
             for v in veldata:
                 filename = v.filevelx
-                debug("Copying {} to {}".format(filename, save_name + "/" + project_name + "_out"))
-                # Change directory to de case one, so if file path is already relative it copies it to the
-                # out folder
-                chdir(save_name)
-
-                try:
-                    # Copy to project root
-                    shutil.copy2(filename, save_name)
-                except shutil.Error:
-                    # Probably already copied the file.
-                    pass
-                except IOError:
-                    error("Unable to copy {} into {}".format(filename, save_name))
-
-                try:
-                    # Copy to project out folder
-                    shutil.copy2(filename, save_name + "/" + project_name + "_out")
-
+                if copy_project_file(manifest, filename, save_name, out_folder):
                     v.filevelx = filename.split("/")[-1]
-                except shutil.Error:
-                    # Probably already copied the file.
-                    pass
-                except IOError:
-                    error("Unable to copy {} into {}".format(filename, save_name))
 
     # Copies files needed for RelaxationZones into the project folder and changes data paths to relative ones.
     if isinstance(case.relaxation_zone, RelaxationZoneFile) and case.relaxation_zone.filesvel:
         # Need to copy the abc_x*_y*.csv file series to the out folder
         filename = case.relaxation_zone.filesvel
 
-        # Change directory to de case one, so if file path is already relative it copies it to the
-        # out folder
-        chdir(save_name)
-
-        for f in glob("{}*".format(filename)):
-            debug("Copying {} to {}".format(filename, save_name + "/" + project_name + "_out"))
-            try:
-                # Copy to project root
-                shutil.copy2(f, save_name)
-            except shutil.Error:
-                # Probably already copied the file.
-                pass
-            except IOError:
-                error("Unable to copy {} into {}".format(filename, save_name))
-
-            try:
-                # Copy to project out folder
-                shutil.copy2(f, save_name + "/" + project_name + "_out")
-
+        for f in glob("{}*".format(path.join(save_name, filename))):
+            if copy_project_file(manifest, f, save_name, out_folder):
                 case.relaxation_zone.filesvel = filename.split("/")[-1]
-            except shutil.Error:
-                # Probably already copied the file.
-                pass
-            except IOError:
-                error("Unable to copy {} into {}".format(filename, save_name))
+
+    try:
+        manifest.save()
+    except OSError as ex:
+        debug("The save manifest of {} could not be written: {}", save_name, ex)
 
     # Dumps all the case data to an XML file.
-    XMLExporter().save_to_disk(save_name, case)
+    XMLExporter().save_to_disk(save_name, case, stream=True)
 
-    case.version = VERSION
     # Save data array on disk. It is saved as a binary file with Pickle.
+    saved = True
     try:
-        with open(save_name + "/casedata.dsphdata", "wb") as picklefile:
-            pickle.dump(case, picklefile, PICKLE_PROTOCOL)
+        save_case_data(save_name, case)
     except Exception:
         print_exc()
         error_dialog(__("There was a problem saving the DSPH information file (casedata.dsphdata)."))
+        saved = False
 
     refocus_cwd()
+    return saved
+
+
+def copy_project_file(manifest: SaveManifest, filename: str, save_name: str, out_folder: str) -> bool:
+    """ Copies a file used by the case to the project folder and links it to the out folder, skipping the
+    copies that are already up to date. Relative paths are resolved from the project folder.
+    Returns whether the file is available on the out folder. """
+    debug("Copying {} to {}", filename, out_folder)
+    source = path.join(save_name, filename)
+    project_copy = path.join(save_name, path.basename(source))
+
+    try:
+        # Copy to project root
+        manifest.place_file(source, project_copy)
+    except (OSError, shutil.Error):
+        error("Unable to copy {} into {}".format(filename, save_name))
+        project_copy = source
+
+    try:
+        # Link to project out folder
+        manifest.place_file(project_copy, path.join(out_folder, path.basename(source)), link=True)
+    except (OSError, shutil.Error):
+        error("Unable to copy {} into {}".format(filename, out_folder))
+        return False
+    return True
+
+
+def save_case_data(save_name: str, case: "Case") -> None:
+    """ Writes the case data file (casedata.dsphdata) to the given project folder. """
+    case.version = VERSION
+    write_case_file(save_name + "/casedata.dsphdata", case)
 
 
 def get_default_config_file():
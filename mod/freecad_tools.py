@@ -3,6 +3,8 @@
 
 """ FreeCAD related tools. """
 
+import hashlib
+
 from tempfile import gettempdir
 from shutil import copyfile
 
@@ -19,16 +21,17 @@ from mod.dialog_tools import ok_cancel_dialog, error_dialog
 
 from mod.constants import APP_NAME, SINGLETON_DOCUMENT_NAME, DEFAULT_WORKBENCH, CASE_LIMITS_OBJ_NAME, CASE_LIMITS_3D_LABEL
 from mod.constants import CASE_LIMITS_LINE_COLOR, CASE_LIMITS_LINE_WIDTH, CASE_LIMITS_DEFAULT_LENGTH, FREECAD_MIN_VERSION
-from mod.constants import MAIN_WIDGET_INTERNAL_NAME, PROP_WIDGET_INTERNAL_NAME, WIDTH_2D, FILLBOX_DEFAULT_LENGTH, FILLBOX_DEFAULT_RADIUS
+from mod.constants import MAIN_WIDGET_INTERNAL_NAME, PROP_WIDGET_INTERNAL_NAME, QUEUE_WIDGET_INTERNAL_NAME, WIDTH_2D, FILLBOX_DEFAULT_LENGTH, FILLBOX_DEFAULT_RADIUS
 from mod.enums import FreeCADObjectType, FreeCADDisplayMode
 
 
 def delete_existing_docks():
     """ Searches for existing docks related to DesignSPHysics destroys them. """
     for previous_dock in [get_fc_main_window().findChild(QtWidgets.QDockWidget, MAIN_WIDGET_INTERNAL_NAME),
-                          get_fc_main_window().findChild(QtWidgets.QDockWidget, PROP_WIDGET_INTERNAL_NAME)]:
+                          get_fc_main_window().findChild(QtWidgets.QDockWidget, PROP_WIDGET_INTERNAL_NAME),
+                          get_fc_main_window().findChild(QtWidgets.QDockWidget, QUEUE_WIDGET_INTERNAL_NAME)]:
         if previous_dock:
-            debug("Removing previous {} dock".format(APP_NAME))
+            debug("Removing previous {} dock", APP_NAME)
             previous_dock.setParent(None)
             previous_dock = None
 
@@ -166,6 +169,24 @@ def get_fc_object(internal_name):
     return FreeCAD.ActiveDocument.getObject(internal_name)
 
 
+def get_fc_object_signature(fc_object) -> str:
+    """ Returns a digest of the geometry a FreeCAD object exports, so exports can be skipped if it did not change.
+    Returns None if it can't be computed. """
+    try:
+        if hasattr(fc_object, "Mesh"):
+            mesh = fc_object.Mesh
+            geometry = (mesh.CountPoints, mesh.CountFacets, mesh.Area, mesh.Volume, mesh.BoundBox)
+        else:
+            shape = fc_object.Shape
+            geometry = (shape.ShapeType, len(shape.Faces), len(shape.Edges), shape.Area, shape.Volume, shape.BoundBox,
+                        tuple((vertex.X, vertex.Y, vertex.Z) for vertex in shape.Vertexes))
+        description: str = repr((fc_object.TypeId, fc_object.Placement, geometry))
+    except (AttributeError, RuntimeError, ValueError) as ex:
+        debug("Could not compute the signature of {}: {}", getattr(fc_object, "Name", fc_object), ex)
+        return None
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
 def get_fc_view_object(internal_name):
     """ Returns a FreeCADGui View provider object by a name. """
     return FreeCADGui.ActiveDocument.getObject(internal_name)
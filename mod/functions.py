@@ -3,6 +3,8 @@
 """ General functions to be used in DesingSPHysics."""
 
 import re
+import os
+import shutil
 from mod.stdout_tools import debug
 
 def make_float(num):
@@ -49,3 +51,11 @@ def has_special_char(text: str) -> bool:
     if regex.search(text) is None: 
         return False
     return True
+
+
+def link_or_copy(source: str, destination: str) -> None:
+    """ Hardlinks a file, copying it if the file system does not allow it. """
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+
+""" GenCase related tools. """
+
+import re
+import os
+import codecs
+import shutil
+import hashlib
+from os import path
+from glob import glob, escape as glob_escape
+from xml.etree import ElementTree
+
+from mod.stdout_tools import debug
+from mod.functions import link_or_copy
+from mod.constants import GENCASE_CACHE_FOLDER_NAME, GENCASE_CACHE_MAX_ENTRIES
+
+
+class GenCaseOutputParser():
+    """ Parses the standard output of GenCase as it is streamed, keeping the full output and
+    the summary fields found so far. Chunks may end in the middle of a line or of a character. """
+
+    SUMMARY_REGEXES = {
+        "total_particles": re.compile(r"Total particles: (\d+)"),
+        "bound_particles": re.compile(r"\(bound=(\d+)"),
+        "fixed_particles": re.compile(r"fixed=(\d+)"),
+        "moving_particles": re.compile(r"moving=(\d+)"),
+        "floating_particles": re.compile(r"floating=(\d+)"),
+        "fluid_particles": re.compile(r"fluid=(\d+)"),
+    }
+
+    def __init__(self):
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.chunks: list = list()
+        self.pending_line: str = ""
+        self.summary: dict = dict()  # {summary field: int}
+
+    def feed(self, data: bytes) -> str:
+        """ Parses a new chunk of output and returns it decoded. """
+        text: str = self.decoder.decode(data)
+        self.process_text(text)
+        return text
+
+    def finish(self) -> str:
+        """ Parses whatever is left after the process finished and returns it decoded. """
+        text: str = self.decoder.decode(b"", final=True)
+        self.process_text(text)
+        if self.pending_line:
+            self.parse_line(self.pending_line)
+            self.pending_line = ""
+        return text
+
+    def process_text(self, text: str) -> None:
+        """ Stores decoded text and parses its complete lines. """
+        if not text:
+            return
+        self.chunks.append(text)
+        lines: list = (self.pending_line + text).split("\n")
+        self.pending_line = lines.pop()
+        for line in lines:
+            self.parse_line(line)
+
+    def parse_line(self, line: str) -> None:
+        """ Updates the summary with the fields found on a line. """
+        if "Total particles: " not in line:
+            return
+        for field, regex in self.SUMMARY_REGEXES.items():
+            match = regex.search(line)
+            if match:
+                self.summary[field] = int(match.group(1))
+
+    def get_total_particles(self) -> int:
+        """ Returns the total number of particles reported, or None if not reported yet. """
+        return self.summary.get("total_particles", None)
+
+    def get_output(self) -> str:
+        """ Returns the full output received so far. """
+        return "".join(self.chunks)
+
+
+class GenCaseCache():
+    """ Content-addressed store of GenCase outputs for a case.
+    Entries are keyed by a hash of the definition XML, every input file it references, the
+    GenCase arguments and the GenCase version, so any change on them produces a different key. """
+
+    HASH_BLOCK_SIZE = 1024 * 1024
+    OUTPUT_FILE_NAME = "gencase_stdout.txt"
+    FILES_FOLDER_NAME = "files"
+    FILE_ELEMENT_ATTRIBUTES = ("name", "value")  # Attributes holding the path on elements named like a file
+    FILE_SERIES_ELEMENTS = ("filesvel",)  # Elements holding the main name of a series of files
+    VOLATILE_ROOT_ATTRIBUTES = ("date",)  # Attributes of <case> that change on every save without changing the case
+    XML_DECLARATION = "<?xml"
+
+    def __init__(self, case_path: str):
+        self.case_path: str = case_path
+        self.cache_path: str = "{}/{}".format(case_path, GENCASE_CACHE_FOLDER_NAME)
+
+    def hash_file(self, file_path: str, digest) -> None:
+        """ Updates a digest with the contents of a file. """
+        with open(file_path, "rb") as input_file:
+            for block in iter(lambda: input_file.read(self.HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+
+    def parse_definition(self, xml_path: str) -> ElementTree.Element:
+        """ Returns the root element of a GenCase definition XML.
+        The XML exported by DesignSPHysics starts with a comment before its declaration, which is skipped. """
+        with open(xml_path, "r", encoding="utf-8") as xml_file:
+            text: str = xml_file.read()
+        declaration_start: int = text.find(self.XML_DECLARATION)
+        if declaration_start > 0:
+            text = text[declaration_start:]
+        # Parsed from bytes, as ElementTree does not accept str with an encoding declaration
+        return ElementTree.fromstring(text.encode("utf-8"))
+
+    def get_referenced_files(self, xml_path: str, root: ElementTree.Element = None) -> list:
+        """ Returns the sorted paths of the files referenced by a GenCase definition XML: attributes named like a file
+        (<drawfilestl file="...">) and the name or value of elements named like one (<file name="...">,
+        <datafile value="...">). Series given by their main name (<filesvel value="...">) include every file of the series. """
+        referenced: set = set()
+        xml_folder: str = path.dirname(xml_path)
+        if root is None:
+            root = self.parse_definition(xml_path)
+        for element in root.iter():
+            file_element: bool = "file" in element.tag.lower()
+            for attribute, value in element.attrib.items():
+                if not value:
+                    continue
+                if "file" not in attribute.lower() and not (file_element and attribute in self.FILE_ELEMENT_ATTRIBUTES):
+                    continue
+                file_path: str = path.normpath(path.join(xml_folder, value))
+                referenced.add(file_path)
+                if element.tag in self.FILE_SERIES_ELEMENTS:
+                    referenced.update(path.normpath(series_file) for series_file in glob("{}*".format(glob_escape(file_path))))
+        return sorted(referenced)
+
+    def compute_key(self, xml_path: str, arguments: list, executable_version: str) -> str:
+        """ Returns the cache key for a GenCase execution, or None if the definition XML can't be read. """
+        try:
+            return self.compute_digest(xml_path, arguments, executable_version).hexdigest()
+        except (OSError, ValueError, ElementTree.ParseError) as ex:
+            debug("Could not compute the GenCase cache key: {}", ex)
+            return None
+
+    def compute_digest(self, xml_path: str, arguments: list, executable_version: str):
+        """ Hashes every input of a GenCase execution.
+        The definition is hashed without the attributes DesignSPHysics changes on every save, like the export date. """
+        digest = hashlib.sha256()
+        digest.update(executable_version.encode("utf-8"))
+        digest.update("\0".join(arguments).encode("utf-8"))
+        root: ElementTree.Element = self.parse_definition(xml_path)
+        referenced_files: list = self.get_referenced_files(xml_path, root)
+        for attribute in self.VOLATILE_ROOT_ATTRIBUTES:
+            root.attrib.pop(attribute, None)
+        digest.update(ElementTree.tostring(root, encoding="utf-8"))
+        for file_path in referenced_files:
+            digest.update(b"\0" + file_path.encode("utf-8") + b"\0")
+            if path.isfile(file_path):
+                self.hash_file(file_path, digest)
+            else:
+                digest.update(b"<missing>")
+        return digest
+
+    def get_entry_path(self, key: str) -> str:
+        """ Returns the folder of a cache entry. """
+        return "{}/{}".format(self.cache_path, key)
+
+    def has(self, key: str) -> bool:
+        """ Returns whether there is a complete entry for a key. """
+        return path.isfile("{}/{}".format(self.get_entry_path(key), self.OUTPUT_FILE_NAME))
+
+    @staticmethod
+    def snapshot_folder(folder: str) -> dict:
+        """ Returns the size and modification time of the files in a folder. """
+        if not path.isdir(folder):
+            return dict()
+        return {entry.name: (entry.stat().st_size, entry.stat().st_mtime_ns) for entry in os.scandir(folder) if entry.is_file()}
+
+    def store(self, key: str, out_folder: str, previous_snapshot: dict, output: str) -> None:
+        """ Stores the files GenCase created or modified in the out folder, compared to a snapshot taken before running it. """
+        current_snapshot: dict = self.snapshot_folder(out_folder)
+        generated: list = [name for name, stats in current_snapshot.items() if previous_snapshot.get(name, None) != stats]
+
+        entry_path: str = self.get_entry_path(key)
+        temporary_path: str = "{}.tmp".format(entry_path)
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        os.makedirs("{}/{}".format(temporary_path, self.FILES_FOLDER_NAME))
+        for name in generated:
+            link_or_copy("{}/{}".format(out_folder, name), "{}/{}/{}".format(temporary_path, self.FILES_FOLDER_NAME, name))
+        with open("{}/{}".format(temporary_path, self.OUTPUT_FILE_NAME), "w", encoding="utf-8") as output_file:
+            output_file.write(output)
+
+        shutil.rmtree(entry_path, ignore_errors=True)
+        os.rename(temporary_path, entry_path)
+        debug("Stored {} GenCase outputs with key {}", len(generated), key)
+        self.evict()
+
+    def restore(self, key: str, out_folder: str) -> str:
+        """ Places the files of a cache entry on the out folder and returns the GenCase output stored with them. """
+        entry_path: str = self.get_entry_path(key)
+        files_path: str = "{}/{}".format(entry_path, self.FILES_FOLDER_NAME)
+        os.makedirs(out_folder, exist_ok=True)
+        for name in os.listdir(files_path):
+            destination: str = "{}/{}".format(out_folder, name)
+            if path.exists(destination):
+                os.remove(destination)
+            link_or_copy("{}/{}".format(files_path, name), destination)
+
+        # Mark the entry as recently used
+        os.utime(entry_path)
+        with open("{}/{}".format(entry_path, self.OUTPUT_FILE_NAME), "r", encoding="utf-8") as output_file:
+            return output_file.read()
+
+    def evict(self) -> None:
+        """ Removes the least recently used entries beyond GENCASE_CACHE_MAX_ENTRIES. """
+        entries: list = [entry for entry in os.scandir(self.cache_path) if entry.is_dir() and not entry.name.endswith(".tmp")]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in entries[GENCASE_CACHE_MAX_ENTRIES:]:
+            shutil.rmtree(entry.path, ignore_errors=True)
@@ -24,6 +24,7 @@ from mod.freecad_tools import check_compatibility, document_count, prompt_close_
 from mod.freecad_tools import delete_existing_docks, valid_document_environment, enforce_case_limits_restrictions, enforce_fillbox_restrictions
 from mod.dialog_tools import info_dialog
 from mod.stdout_tools import print_license, log, debug
+from mod.executable_tools import ExecutableProbe
 
 from mod.constants import APP_NAME, VERSION, DEFAULT_WORKBENCH, DIVIDER, GITHUB_MASTER_CONSTANTS_URL
 
@@ -32,6 +33,7 @@ from mod.dataobjects.application_settings import ApplicationSettings
 
 from mod.widgets.dock.designsphysics_dock import DesignSPHysicsDock
 from mod.widgets.properties_dock_widget import PropertiesDockWidget
+from mod.widgets.simulation_queue_dock_widget import SimulationQueueDockWidget
 
 __author__ = "Andrés Vieira, Iván Martínez Estévez"
 __copyright__ = "Copyright 2016-2023, DualSHPysics Team"
@@ -73,10 +75,12 @@ def on_tree_item_selection_change(properties_widget, designsphysics_dock):
         properties_widget.configure_to_no_selection()
 
     # Delete invalid or already deleted (in FreeCAD) objects
+    invalid_object_names: list = list()
     for object_name in Case.the().get_all_simulation_object_names():
         fc_object = get_fc_object(object_name)
         if not fc_object or fc_object.InList:
-            Case.the().remove_object(object_name)
+            invalid_object_names.append(object_name)
+    Case.the().remove_objects(invalid_object_names)
 
     for damping_to_delete in list(filter(lambda x: not get_fc_object(x), Case.the().damping_zones)):
         Case.the().remove_damping_zone(damping_to_delete)
@@ -139,11 +143,16 @@ def boot():
     # Tries to delete docks created by a previous execution of DesignSPHysics
     delete_existing_docks()
 
+    # Executables that changed since they were last probed are probed in the background
+    ExecutableProbe.the().probe(list(Case.the().executable_paths.get_tool_executables().values()))
+
     designsphysics_dock = DesignSPHysicsDock(get_fc_main_window())
     properties_widget = PropertiesDockWidget(parent=get_fc_main_window())
+    simulation_queue_widget = SimulationQueueDockWidget(parent=get_fc_main_window())
 
     get_fc_main_window().addDockWidget(QtCore.Qt.RightDockWidgetArea, designsphysics_dock)
     get_fc_main_window().addDockWidget(QtCore.Qt.LeftDockWidgetArea, properties_widget)
+    get_fc_main_window().addDockWidget(QtCore.Qt.RightDockWidgetArea, simulation_queue_widget)
 
     # Subscribe the FreeCAD Objects tree to the item selection change function.
     # This helps FreeCAD notify DesignSPHysics for the deleted and changed objects to get updated correctly.
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics process output buffer. """
+
+from collections import deque
+from tempfile import SpooledTemporaryFile
+
+from mod.constants import OUTPUT_BUFFER_SPOOL_BYTES, OUTPUT_BUFFER_TAIL_CHARS
+
+
+class OutputBuffer():
+    """ Accumulates the output of a process in linear time.
+    Chunks are written to a temporary file that is kept in memory until it grows past OUTPUT_BUFFER_SPOOL_BYTES,
+    and only the last OUTPUT_BUFFER_TAIL_CHARS characters are kept at hand. The full text is only read back on request. """
+
+    def __init__(self):
+        self.spool = SpooledTemporaryFile(max_size=OUTPUT_BUFFER_SPOOL_BYTES, mode="w+", encoding="utf-8", newline="")
+        self.tail: deque = deque()
+        self.tail_length: int = 0
+        self.length: int = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def append(self, text: str) -> None:
+        """ Adds a chunk of output. """
+        if not text:
+            return
+        self.spool.write(text)
+        self.length += len(text)
+        self.tail.append(text)
+        self.tail_length += len(text)
+        while self.tail_length - len(self.tail[0]) >= OUTPUT_BUFFER_TAIL_CHARS:
+            self.tail_length -= len(self.tail.popleft())
+
+    def get_tail(self) -> str:
+        """ Returns the last characters of the output. """
+        return "".join(self.tail)[-OUTPUT_BUFFER_TAIL_CHARS:]
+
+    def get_text(self) -> str:
+        """ Returns the full output. """
+        self.spool.seek(0)
+        text: str = self.spool.read()
+        self.spool.seek(0, 2)
+        return text
+
+    def close(self) -> None:
+        """ Discards the output. """
+        self.spool.close()
+        self.tail.clear()
+        self.tail_length = 0
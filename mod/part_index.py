@@ -0,0 +1,237 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics Part index.
+
+Keeps a persistent record of the Part_*.bi4 files of an out folder, with the size, modification time
+and simulated time of each one, so the Parts of a case are known without listing and sorting the folder.
+"""
+
+import os
+import re
+import json
+import time
+from bisect import bisect_right
+from os import path
+
+from mod.stdout_tools import debug
+from mod.run_out_tools import RunOutFollower
+
+
+class PartIndex():
+    """ Index of the Parts stored on an out folder, ordered by part number.
+    It is updated incrementally: the folder is only listed again when its modification time changes, only new Part
+    files are inspected, and Run.out is followed from where it was left to read the simulated time of each Part.
+    As a folder may change without changing a coarse modification time, it is also listed again if it was last
+    listed within the modification time granularity, or if the Part after the last one exists.
+    Changes are appended to a journal on the out folder, so persisting them does not depend on the number of Parts. """
+
+    INDEX_FILE_NAME = "PartIndex.jsonl"
+    FORMAT_VERSION = 1
+    JOURNAL_SLACK = 1000  # Journal entries allowed over the size of the index before it is rewritten
+    MTIME_GRANULARITY_NS = 2 * 10 ** 9  # Coarsest folder modification time resolution expected (FAT, SMB, NFS)
+    PART_FILE_REGEX = re.compile(r"^Part_(\d+)\.bi4$")
+
+    __indexes: dict = dict()  # {out folder: PartIndex}
+
+    def __init__(self, out_folder: str):
+        self.out_folder: str = path.abspath(out_folder)
+        self.parts: dict = dict()  # {part: [size, mtime]}
+        self.times: dict = dict()  # {part: simulated time}, as reported on Run.out
+        self.folder_mtime: int = None
+        self.run_out_follower: RunOutFollower = RunOutFollower(path.join(self.out_folder, "Run.out"))
+        self.last_part: int = None
+        self.last_part_file_name: str = None
+        self.sorted_parts: list = None  # Part numbers in order, built on demand
+        self.sorted_times: list = None  # Simulated times of the parts that have one, in part order
+        self.timed_parts: list = None  # Part numbers for sorted_times
+        self.pending_entries: list = list()  # Journal entries not persisted yet
+        self.journal_length: int = 0
+        self.load()
+
+    @staticmethod
+    def for_folder(out_folder: str) -> "PartIndex":
+        """ Returns the up to date index of an out folder, reusing the one already in memory. """
+        key: str = path.abspath(out_folder)
+        if key not in PartIndex.__indexes:
+            PartIndex.__indexes[key] = PartIndex(key)
+        index: PartIndex = PartIndex.__indexes[key]
+        index.refresh()
+        return index
+
+    def get_index_file_path(self) -> str:
+        """ Returns the path of the file the index is persisted to. """
+        return path.join(self.out_folder, self.INDEX_FILE_NAME)
+
+    def load(self) -> None:
+        """ Restores the index persisted on the out folder, if any, replaying its journal. """
+        try:
+            with open(self.get_index_file_path(), "r", encoding="utf-8") as index_file:
+                if json.loads(index_file.readline()).get("version") != self.FORMAT_VERSION:
+                    return
+                for line in index_file:
+                    self.apply_entry(json.loads(line))
+                    self.journal_length += 1
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # A damaged index is rebuilt from the folder
+            self.parts = dict()
+            self.times = dict()
+            self.folder_mtime = None
+            self.run_out_follower.offset = 0
+            self.journal_length = 0
+        self.on_parts_changed()
+
+    def apply_entry(self, entry: list) -> None:
+        """ Applies a journal entry to the index. """
+        kind = entry[0]
+        if kind == "p":
+            self.parts[entry[1]] = [entry[2], entry[3]]
+        elif kind == "t":
+            self.times[entry[1]] = entry[2]
+        elif kind == "d":
+            self.parts.pop(entry[1], None)
+            self.times.pop(entry[1], None)
+        elif kind == "c":
+            self.times = dict()
+        elif kind == "s":
+            self.folder_mtime = entry[1]
+            self.run_out_follower.offset = entry[2]
+
+    def record(self, entry: list) -> None:
+        """ Applies a journal entry and queues it to be persisted. """
+        self.apply_entry(entry)
+        self.pending_entries.append(entry)
+
+    def save(self) -> None:
+        """ Persists the changes since the last save, appending them to the journal.
+        The journal is rewritten from the current state when it gets too long. """
+        follower: RunOutFollower = self.run_out_follower
+        self.pending_entries.append(["s", self.folder_mtime, follower.offset - len(follower.pending_bytes)])
+        if self.journal_length + len(self.pending_entries) > 2 * (len(self.parts) + len(self.times)) + self.JOURNAL_SLACK:
+            entries: list = [["p", part] + self.parts[part] for part in self.get_parts()]
+            entries += [["t", part, self.times[part]] for part in sorted(self.times)]
+            entries.append(self.pending_entries[-1])
+            mode: str = "w"
+            self.journal_length = 0
+        else:
+            entries: list = self.pending_entries
+            mode: str = "a" if self.journal_length else "w"
+        with open(self.get_index_file_path(), mode, encoding="utf-8") as index_file:
+            if mode == "w":
+                index_file.write(json.dumps({"version": self.FORMAT_VERSION}) + "\n")
+            index_file.write("".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries))
+        self.journal_length += len(entries)
+        self.pending_entries = list()
+
+    def on_parts_changed(self) -> None:
+        """ Drops the orderings built from the previous parts. """
+        self.last_part = max(self.parts) if self.parts else None
+        if self.last_part is not None and self.last_part_file_name is None:
+            self.last_part_file_name = "Part_{:04d}.bi4".format(self.last_part)
+        self.sorted_parts = None
+        self.sorted_times = None
+        self.timed_parts = None
+
+    def refresh(self) -> bool:
+        """ Brings the index up to date with the out folder. Returns whether any Part changed. """
+        if not path.isdir(self.out_folder):
+            changed: bool = bool(self.parts)
+            self.parts = dict()
+            self.times = dict()
+            self.on_parts_changed()
+            return changed
+
+        self.refresh_times()
+        folder_mtime: int = os.stat(self.out_folder).st_mtime_ns
+        if folder_mtime != self.folder_mtime or self.has_unlisted_part():
+            self.refresh_files()
+            # Files created later within the same modification time tick would not change it
+            listing_complete: bool = time.time_ns() - folder_mtime >= self.MTIME_GRANULARITY_NS
+            self.folder_mtime = folder_mtime if listing_complete else None
+        elif self.last_part is not None:
+            # The last Part may still have been written on the previous refresh
+            self.stat_part(self.last_part, self.last_part_file_name)
+
+        if not self.pending_entries:
+            return False
+        self.on_parts_changed()
+        try:
+            self.save()
+        except OSError as ex:
+            debug("The Part index of {} could not be saved: {}", self.out_folder, ex)
+            self.pending_entries = list()
+        return True
+
+    def has_unlisted_part(self) -> bool:
+        """ Returns whether the Part after the last indexed one exists. """
+        next_part: int = 0 if self.last_part is None else self.last_part + 1
+        return path.exists(path.join(self.out_folder, "Part_{:04d}.bi4".format(next_part)))
+
+    def refresh_files(self) -> None:
+        """ Lists the out folder, forgetting removed Parts and inspecting the new ones. """
+        found: dict = dict()  # {part: file name}
+        with os.scandir(self.out_folder) as entries:
+            for entry in entries:
+                match = self.PART_FILE_REGEX.match(entry.name)
+                if match:
+                    found[int(match.group(1))] = entry.name
+        for part in [part for part in set(self.parts) | set(self.times) if part not in found]:
+            self.record(["d", part])
+        last_part: int = max(found) if found else None
+        for part, file_name in found.items():
+            if part not in self.parts or part == last_part or part == self.last_part:
+                self.stat_part(part, file_name)
+        self.last_part_file_name = found.get(last_part)
+
+    def stat_part(self, part: int, file_name: str) -> None:
+        """ Records the size and modification time of a Part file if they changed. """
+        try:
+            stat_result = os.stat(path.join(self.out_folder, file_name))
+        except OSError:
+            return
+        if self.parts.get(part) != [stat_result.st_size, stat_result.st_mtime]:
+            self.record(["p", part, stat_result.st_size, stat_result.st_mtime])
+
+    def refresh_times(self) -> None:
+        """ Reads the simulated time of the Parts reported on Run.out since the last refresh. """
+        follower: RunOutFollower = self.run_out_follower
+        previous_progress = follower.progress
+        follower.poll()
+        if follower.progress is not previous_progress and self.times:
+            # Run.out was replaced by a new run, so the recorded times are not valid anymore
+            self.record(["c"])
+        for sample in follower.progress.timeline:
+            if self.times.get(sample.part) != sample.sim_time:
+                self.record(["t", sample.part, sample.sim_time])
+        # Samples are only needed once
+        follower.progress.timeline = list()
+
+    def get_part_count(self) -> int:
+        """ Returns the number of Parts on the folder. """
+        return len(self.parts)
+
+    def get_last_part(self) -> int:
+        """ Returns the largest part number, or None if there are no Parts. """
+        return self.last_part
+
+    def get_parts(self) -> list:
+        """ Returns the part numbers, in order. """
+        if self.sorted_parts is None:
+            self.sorted_parts = sorted(self.parts)
+        return self.sorted_parts
+
+    def get_part_info(self, part: int) -> tuple:
+        """ Returns the (size, mtime, simulated time) recorded for a Part. The simulated time is None if it is not known. """
+        size, mtime = self.parts[part]
+        return size, mtime, self.times.get(part)
+
+    def get_part_time(self, part: int) -> float:
+        """ Returns the simulated time of a Part, or None if it is not known. """
+        return self.times.get(part)
+
+    def get_part_at_time(self, sim_time: float) -> int:
+        """ Returns the last Part stored at or before a simulated time, or None if there is none. """
+        if self.sorted_times is None:
+            self.timed_parts = [part for part in self.get_parts() if part in self.times]
+            self.sorted_times = [self.times[part] for part in self.timed_parts]
+        position: int = bisect_right(self.sorted_times, sim_time)
+        return self.timed_parts[position - 1] if position else None
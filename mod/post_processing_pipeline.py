@@ -0,0 +1,308 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics post-processing pipeline.
+
+Runs the DualSPHysics post-processing tools in the background. The Part range of a tool
+execution is split into shards with the -first: and -last: options, each one run as a separate
+process, and the files written by the shards are merged once all of them finished.
+"""
+
+import os
+import re
+import codecs
+from os import path
+from sys import platform
+
+# from PySide import QtCore
+from PySide6 import QtCore
+
+from mod.stdout_tools import debug, warning
+from mod.constants import POST_PROCESSING_MIN_PARTS_PER_SHARD
+from mod.output_buffer import OutputBuffer
+
+
+class PostProcessingShard():
+    """ A contiguous Part range of a post-processing job, run as a single process. """
+
+    SHARD_SUFFIX = "__shard{}__"  # Closed, so the suffix of a shard is never the start of another one
+
+    def __init__(self, job: "PostProcessingJob", index: int, first_part: int, last_part: int, parameters: list):
+        self.job: "PostProcessingJob" = job
+        self.index: int = index
+        self.first_part: int = first_part
+        self.last_part: int = last_part
+        self.parameters: list = parameters
+        self.process: QtCore.QProcess = None
+        self.current_part: int = None
+        self.exit_code: int = None
+        self.output: OutputBuffer = OutputBuffer()
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def is_pending(self) -> bool:
+        """ Returns whether the shard was not started yet. """
+        return self.process is None and self.exit_code is None
+
+    def get_processed_parts(self) -> int:
+        """ Returns the number of parts of the range processed so far. """
+        if self.exit_code == 0:
+            return self.last_part - self.first_part + 1
+        if self.current_part is None:
+            return 0
+        return max(0, min(self.current_part, self.last_part) - self.first_part + 1)
+
+
+class PostProcessingJob(QtCore.QObject):
+    """ An execution of a post-processing tool over a Part range, split in shards.
+    Output parameters are the (template, prefix) pairs of the parameters that set the path the tool writes its files
+    with, like ("-savecsv {}", "/case_out/Forces"). They are kept apart from the rest of the parameters, as only them
+    get a suffix on each shard so the files don't collide. The files get their original names back when merged. """
+
+    progress = QtCore.Signal(int)  # Parts processed
+    finished = QtCore.Signal(int)  # Exit code. -1 if the job was cancelled
+
+    MERGEABLE_EXTENSIONS = (".csv", ".txt", ".out")
+    MAX_HEADER_LINES = 50
+    PART_RANGE_REGEX = re.compile(r"(^|\s)-(first|last):")
+
+    def __init__(self, tool_name: str, executable: str, parameters: list, output_parameters: list, part_regex: str,
+                 first_part: int, last_part: int, shard_count: int, parent=None):
+        super().__init__(parent=parent)
+        self.tool_name: str = tool_name
+        self.executable: str = executable
+        self.parameters: list = parameters
+        self.output_parameters: list = output_parameters  # [(template, prefix)]
+        self.output_prefixes: list = [prefix for _, prefix in output_parameters if prefix]
+        self.part_regex = re.compile(part_regex)
+        self.first_part: int = first_part
+        self.last_part: int = last_part
+        self.cancelled: bool = False
+        self.exit_code: int = None
+        self.failed_shard: PostProcessingShard = None
+        self.ended: bool = False
+        self.shards: list = self.build_shards(max(1, min(shard_count, self.get_total_parts())))
+
+    @staticmethod
+    def selects_parts(parameters: list) -> bool:
+        """ Returns whether some parameters already select the Part range with -first: or -last:. """
+        return any(PostProcessingJob.PART_RANGE_REGEX.search(parameter) for parameter in parameters)
+
+    def get_shard_parameters(self, suffix: str) -> list:
+        """ Returns the parameters of the tool with the given suffix on its output prefixes. """
+        return list(self.parameters) + [template.format(prefix + suffix) for template, prefix in self.output_parameters]
+
+    def build_shards(self, shard_count: int) -> list:
+        """ Splits the part range in contiguous shards of similar size. A single shard runs the tool as is. """
+        if shard_count == 1:
+            return [PostProcessingShard(self, 0, self.first_part, self.last_part, self.get_shard_parameters(""))]
+
+        shards: list = list()
+        total_parts: int = self.get_total_parts()
+        for index in range(shard_count):
+            first: int = self.first_part + (total_parts * index) // shard_count
+            last: int = self.first_part + (total_parts * (index + 1)) // shard_count - 1
+            parameters: list = self.get_shard_parameters(PostProcessingShard.SHARD_SUFFIX.format(index))
+            parameters += ["-first:{}".format(first), "-last:{}".format(last)]
+            shards.append(PostProcessingShard(self, index, first, last, parameters))
+        return shards
+
+    def get_total_parts(self) -> int:
+        """ Returns the number of parts to process. """
+        return self.last_part - self.first_part + 1
+
+    def get_processed_parts(self) -> int:
+        """ Returns the number of parts processed by all the shards. """
+        return sum(shard.get_processed_parts() for shard in self.shards)
+
+    def get_command_lines(self) -> str:
+        """ Returns the command line of each shard. """
+        return "\n".join("{} {}".format(self.executable, " ".join(shard.parameters)) for shard in self.shards)
+
+    def get_output(self) -> str:
+        """ Returns the output of every shard, in part order. """
+        return "".join(shard.output.get_text() for shard in self.shards)
+
+    def get_output_tail(self) -> str:
+        """ Returns the last output of the shard that failed, or of the last shard if none did. """
+        return (self.failed_shard or self.shards[-1]).output.get_tail()
+
+    def release_output(self) -> None:
+        """ Discards the output of every shard. """
+        for shard in self.shards:
+            shard.output.close()
+
+    def is_done(self) -> bool:
+        """ Returns whether every shard finished or was dropped. """
+        return all(shard.exit_code is not None for shard in self.shards)
+
+    def on_shard_output(self, shard: PostProcessingShard, data: bytes, final: bool = False) -> None:
+        """ Stores the output of a shard and reports the progress it shows. Chunks may end in the middle of a character. """
+        output: str = shard.decoder.decode(data, final=final)
+        if not output:
+            return
+        shard.output.append(output)
+        parts: list = self.part_regex.findall(output)
+        if parts:
+            shard.current_part = int(parts[-1])
+            self.progress.emit(self.get_processed_parts())
+
+    def stop_shards(self) -> None:
+        """ Drops the shards that did not start and kills the running ones. """
+        for shard in self.shards:
+            if shard.is_pending():
+                shard.exit_code = -1
+            elif shard.process is not None:
+                shard.process.kill()
+
+    def cancel(self) -> None:
+        """ Cancels the job. It finishes with -1 once its running shards are killed. """
+        self.cancelled = True
+        self.stop_shards()
+
+    def merge_outputs(self) -> None:
+        """ Gives the files written by each shard their original names, concatenating the text files
+        written by more than one shard. The leading lines repeated by later shards are skipped. """
+        if len(self.shards) == 1:
+            return
+        folder_listings: dict = dict()  # {folder: [file names]}
+        for prefix in self.output_prefixes:
+            folder, base_name = path.split(prefix)
+            if folder not in folder_listings:
+                folder_listings[folder] = sorted(os.listdir(folder or "."))
+            groups: dict = dict()  # {final name: [shard file paths in shard order]}
+            for shard in self.shards:
+                shard_name: str = base_name + PostProcessingShard.SHARD_SUFFIX.format(shard.index)
+                for file_name in folder_listings[folder]:
+                    if file_name.startswith(shard_name):
+                        groups.setdefault(base_name + file_name[len(shard_name):], list()).append(path.join(folder, file_name))
+
+            for final_name, file_paths in groups.items():
+                final_path: str = path.join(folder, final_name)
+                if len(file_paths) == 1:
+                    os.replace(file_paths[0], final_path)
+                elif final_name.lower().endswith(self.MERGEABLE_EXTENSIONS):
+                    self.concatenate(file_paths, final_path)
+                else:
+                    warning("Several {} shards wrote {}. Their files were kept with the shard suffix.", self.tool_name, final_name)
+
+    def concatenate(self, file_paths: list, final_path: str) -> None:
+        """ Concatenates text files into one, skipping the leading lines each one shares with the first. """
+        with open(file_paths[0], "r", encoding="utf-8", errors="replace") as first_file:
+            header: list = [first_file.readline() for _ in range(self.MAX_HEADER_LINES)]
+        with open(final_path + ".tmp", "w", encoding="utf-8") as final_file:
+            for position, file_path in enumerate(file_paths):
+                with open(file_path, "r", encoding="utf-8", errors="replace") as shard_file:
+                    in_header: bool = position > 0
+                    for line_number, line in enumerate(shard_file):
+                        if in_header and line_number < len(header) and line == header[line_number]:
+                            continue
+                        in_header = False
+                        final_file.write(line)
+        os.replace(final_path + ".tmp", final_path)
+        for file_path in file_paths:
+            os.remove(file_path)
+
+
+class PostProcessingPipeline(QtCore.QObject):
+    """ Runs the shards of every submitted post-processing job, in order, limiting the processes running at once. """
+    __instance: "PostProcessingPipeline" = None
+
+    def __init__(self):
+        """ Virtually private constructor. """
+        if PostProcessingPipeline.__instance is not None:
+            raise Exception("PostProcessingPipeline class is a singleton and should not be initialized twice")
+        super().__init__()
+        PostProcessingPipeline.__instance = self
+        self.max_processes: int = os.cpu_count() or 1
+        self.pending: list = list()  # [PostProcessingShard]
+        self.running: list = list()  # [PostProcessingShard]
+
+    @staticmethod
+    def the() -> "PostProcessingPipeline":
+        """ Static access method. """
+        if PostProcessingPipeline.__instance is None:
+            PostProcessingPipeline()
+        return PostProcessingPipeline.__instance
+
+    def get_shard_count(self, total_parts: int) -> int:
+        """ Returns the number of shards for a part range, so each one has enough parts to make up for starting a process. """
+        return max(1, min(self.max_processes, total_parts // POST_PROCESSING_MIN_PARTS_PER_SHARD))
+
+    def create_job(self, tool_name: str, executable: str, parameters: list, output_parameters: list, part_regex: str, last_part: int,
+                   shardable: bool = True) -> PostProcessingJob:
+        """ Returns a job for the parts from 0 to last_part, split in as many shards as worth it.
+        Tools whose results depend on consecutive Parts are not shardable, and neither are executions that already
+        select their Part range with their parameters. """
+        shard_count: int = 1
+        if shardable and not PostProcessingJob.selects_parts(parameters):
+            shard_count = self.get_shard_count(last_part + 1)
+        return PostProcessingJob(tool_name, executable, parameters, output_parameters, part_regex, 0, last_part, shard_count, parent=self)
+
+    def submit(self, job: PostProcessingJob) -> None:
+        """ Queues the shards of a job and starts as many as possible. """
+        debug("Running {} on {} shards", job.tool_name, len(job.shards))
+        self.pending += job.shards
+        self.schedule()
+
+    def schedule(self) -> None:
+        """ Starts pending shards while there are free process slots. """
+        self.pending = [shard for shard in self.pending if shard.is_pending()]
+        while self.pending and len(self.running) < self.max_processes:
+            self.start_shard(self.pending.pop(0))
+
+    def start_shard(self, shard: PostProcessingShard) -> None:
+        """ Launches the process of a shard. """
+        environment = QtCore.QProcessEnvironment.systemEnvironment()
+        if platform in ("linux", "linux2"):
+            environment.insert("LD_LIBRARY_PATH", path.dirname(shard.job.executable))
+
+        process = QtCore.QProcess(self)
+        process.setProcessEnvironment(environment)
+        process.readyReadStandardOutput.connect(lambda s=shard: self.on_shard_stdout_ready(s))
+        process.finished.connect(lambda exit_code, _exit_status, s=shard: self.on_shard_finished(s, exit_code))
+        process.errorOccurred.connect(lambda error, s=shard: self.on_shard_error(s, error))
+        shard.process = process
+        self.running.append(shard)
+        process.start(shard.job.executable, shard.parameters)
+
+    def on_shard_stdout_ready(self, shard: PostProcessingShard, final: bool = False) -> None:
+        """ Passes the available output of a shard to its job. """
+        shard.job.on_shard_output(shard, shard.process.readAllStandardOutput().data(), final)
+
+    def on_shard_error(self, shard: PostProcessingShard, error) -> None:
+        """ Finishes a shard whose process could not start, as no finished signal follows. """
+        if error == QtCore.QProcess.FailedToStart:
+            warning("{} could not be started: {}", shard.job.tool_name, shard.process.errorString())
+            self.on_shard_finished(shard, -1)
+
+    def on_shard_finished(self, shard: PostProcessingShard, exit_code: int) -> None:
+        """ Records the result of a shard, finishing its job if it was the last one. """
+        job: PostProcessingJob = shard.job
+        if shard.process is None:
+            return
+        self.on_shard_stdout_ready(shard, final=True)
+        shard.exit_code = exit_code
+        shard.process.deleteLater()
+        shard.process = None
+        self.running.remove(shard)
+
+        if exit_code and not job.cancelled and job.exit_code is None:
+            # The rest of a failed job is not worth running
+            job.exit_code = exit_code
+            job.failed_shard = shard
+            job.stop_shards()
+
+        if job.is_done() and not job.ended:
+            job.ended = True
+            if job.cancelled:
+                job.finished.emit(-1)
+            elif job.exit_code:
+                job.finished.emit(job.exit_code)
+            else:
+                try:
+                    job.merge_outputs()
+                except OSError as ex:
+                    warning("The outputs of {} could not be merged: {}", job.tool_name, ex)
+                    job.finished.emit(1)
+                else:
+                    job.finished.emit(0)
+        self.schedule()
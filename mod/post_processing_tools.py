@@ -2,96 +2,99 @@
 # -*- coding: utf-8 -*-
 """DesignSPHysics Post-Processing tools utilities. """
 
+import re
 import subprocess
 
-# from PySide import QtCore
-from PySide6 import QtCore
-
 from mod.translation_tools import __
+from mod.stdout_tools import error
 from mod.dialog_tools import error_dialog, info_dialog
 from mod.freecad_tools import get_fc_main_window
 from mod.file_tools import get_total_exported_parts_from_disk, save_measuretool_info
 from mod.executable_tools import ensure_process_is_executable_or_fail
+from mod.post_processing_pipeline import PostProcessingPipeline, PostProcessingJob
 
 from mod.widgets.postprocessing.export_progress_dialog import ExportProgressDialog
 
 
-def partvtk_export(options, case, post_processing_widget) -> None:
-    """ Export VTK button behaviour. Launches a process while disabling the button. """
+def run_post_processing_job(tool_name, executable, executable_parameters, output_parameters, part_regex, case, post_processing_widget,
+                            on_success=None, shardable=True) -> None:
+    """ Runs a post-processing tool on the post-processing pipeline, showing its progress.
+    The Part range of the case is split in shards run in parallel, unless it is not shardable. Output parameters are
+    the (template, prefix) pairs of the parameters that set where the tool writes its files. The files each shard
+    writes with them are merged when all of them finish. """
+    ensure_process_is_executable_or_fail(executable)
+    last_part: int = get_total_exported_parts_from_disk(case.get_out_folder_path())
+    if last_part is None:
+        error_dialog(__("There are no Part files on the out folder of the case. Run the simulation first."))
+        return
     post_processing_widget.adapt_to_export_start()
 
-    save_extension: str = {0: "vtk", 1: "csv", 2: "asc"}[options["save_mode"]]
-    save_flag: str = {0: "-savevtk", 1: "-savecsv", 2: "-saveascii"}[options["save_mode"]]
-
-    exported_parts: int = get_total_exported_parts_from_disk(case.get_out_folder_path())
+    job: PostProcessingJob = PostProcessingPipeline.the().create_job(tool_name, executable, executable_parameters, output_parameters, part_regex, last_part, shardable)
 
-    export_dialog = ExportProgressDialog(0, exported_parts, parent=get_fc_main_window())
+    export_dialog = ExportProgressDialog(0, job.get_total_parts(), parent=get_fc_main_window())
     export_dialog.show()
 
-    case.info.current_output = ""
-
-    # Build parameters
-    executable_parameters = ["-dirin {}".format(case.get_out_folder_path()),
-                             "{save_flag} {out_path}{file_name}".format(save_flag=save_flag, out_path=case.get_out_folder_path(), file_name=options["file_name"]),
-                             "-onlytype:{save_types} {additional}".format(save_types=options["save_types"], additional=options["additional_parameters"])]
-
-    # Information ready handler.
-    def on_stdout_ready():
-        """ Updates the export dialog on every stdout available from the process. """
-        current_output = str(export_process.readAllStandardOutput().data(), encoding='utf-8')
-        case.info.current_output += current_output
-        try:
-            current_part = current_output.split("{}_".format(options["file_name"]))[1]
-            current_part = int(current_part.split(".{}".format(save_extension))[0])
-        except IndexError:
-            current_part = export_dialog.get_value()
-        export_dialog.update_data(current_part)
-
     # Cancel button handler
     def on_cancel():
-        """ Kills the process and cancels the export dialog. """
-        export_process.kill()
-        post_processing_widget.adapt_to_export_finished()
+        """ Cancels the job and the export dialog. """
+        job.cancel()
         export_dialog.reject()
 
-    # PartVTK export finish handler
+    # Job finish handler
     def on_export_finished(exit_code):
         """ Closes and displays info/error about the process. """
         post_processing_widget.adapt_to_export_finished()
         export_dialog.accept()
-        detailed_text = "The executed command line was: {} {}\n\n{}".format(case.executable_paths.partvtk, " ".join(executable_parameters), case.info.current_output)
+        job.deleteLater()
+        if job.cancelled:
+            job.release_output()
+            return
+
+        def detailed_text():
+            """ Returns the command lines and the whole output. Only read back if the details are opened. """
+            return "The executed command line was: {}\n\n{}".format(job.get_command_lines(), job.get_output())
 
         if not exit_code:
-            info_dialog(info_text=__("PartVTK finished successfully"), detailed_text=detailed_text)
+            info_dialog(info_text=__("{} finished successfully").format(tool_name), detailed_text=detailed_text)
+            job.release_output()
+            if on_success:
+                on_success()
         else:
+            error("{} failed with exit code {}. Last output:\n{}", tool_name, exit_code, job.get_output_tail())
             error_dialog(__("There was an error on the post-processing. Show details to view the errors."), detailed_text=detailed_text)
+            job.release_output()
+
+    export_dialog.on_cancel.connect(on_cancel)
+    job.progress.connect(export_dialog.publish_progress)
+    job.finished.connect(on_export_finished)
+    PostProcessingPipeline.the().submit(job)
+
 
+def partvtk_export(options, case, post_processing_widget) -> None:
+    """ Export VTK button behaviour. Launches the tool on the post-processing pipeline. """
+    save_extension: str = {0: "vtk", 1: "csv", 2: "asc"}[options["save_mode"]]
+    save_flag: str = {0: "-savevtk", 1: "-savecsv", 2: "-saveascii"}[options["save_mode"]]
+    output_prefix: str = "{out_path}{file_name}".format(out_path=case.get_out_folder_path(), file_name=options["file_name"])
+
+    # Build parameters
+    executable_parameters = ["-dirin {}".format(case.get_out_folder_path()),
+                             "-onlytype:{save_types} {additional}".format(save_types=options["save_types"], additional=options["additional_parameters"])]
+
+    def on_success():
+        """ Opens the exported files on ParaView if requested. """
         if options["open_paraview"]:
             subprocess.Popen([case.executable_paths.paraview, "--data={}\\{}_..{}".format(case.get_out_folder_path(), options["file_name"], save_extension)], stdout=subprocess.PIPE)
 
-    export_dialog.on_cancel.connect(on_cancel)
-    export_process = QtCore.QProcess(get_fc_main_window())
-    export_process.finished.connect(on_export_finished)
-    export_process.readyReadStandardOutput.connect(on_stdout_ready)
-    ensure_process_is_executable_or_fail(case.executable_paths.partvtk)
-    export_process.start(case.executable_paths.partvtk, executable_parameters)
+    run_post_processing_job("PartVTK", case.executable_paths.partvtk, executable_parameters, [(save_flag + " {}", output_prefix)],
+                            r"{}_(\d+)\.{}".format(re.escape(options["file_name"]), save_extension), case, post_processing_widget, on_success)
 
 
 def floatinginfo_export(options, case, post_processing_widget) -> None:
     """ FloatingInfo tool export. """
-    post_processing_widget.adapt_to_export_start()
-
-    exported_parts: int = get_total_exported_parts_from_disk(case.get_out_folder_path())
-
-    export_dialog = ExportProgressDialog(0, exported_parts, parent=get_fc_main_window())
-    export_dialog.show()
-
-    case.info.current_output = ""
+    output_prefix: str = "{out_path}{file_name}".format(out_path=case.get_out_folder_path(), file_name=options["filename"])
 
     # Build parameters
-    executable_parameters = ["-dirin {}".format(case.get_out_folder_path()),
-                             "-savedata {out_path}{file_name}".format(out_path=case.get_out_folder_path(), file_name=options["filename"])]
-
+    executable_parameters = ["-dirin {}".format(case.get_out_folder_path())]
 
     if options["onlyprocess"]:
         executable_parameters.append("-onlymk:" + options["onlyprocess"])
@@ -99,57 +102,17 @@ def floatinginfo_export(options, case, post_processing_widget) -> None:
     if options["additional_parameters"]:
         executable_parameters.append(options["additional_parameters"])
 
-    def on_stdout_ready():
-        """ Updates the export dialog on every stdout avasilable from the process. """
-        current_output = str(export_process.readAllStandardOutput().data(), encoding='utf-8')
-        case.info.current_output += current_output
-        try:
-            current_part = int(current_output.split("Part_")[-1].split(".bi4")[0])
-        except (IndexError, ValueError):
-            current_part = export_dialog.get_value()
-        export_dialog.update_data(current_part)
-
-    def on_cancel():
-        """ Kills the process and cancels the export dialog. """
-        export_process.kill()
-        post_processing_widget.adapt_to_export_finished()
-        export_dialog.reject()
-
-    def on_export_finished(exit_code):
-        """ Closes and displays info/error about the process. """
-        post_processing_widget.adapt_to_export_finished()
-        export_dialog.accept()
-        detailed_text = "The executed command line was: {} {}\n\n{}".format(case.executable_paths.floatinginfo, " ".join(executable_parameters), case.info.current_output)
-
-        if not exit_code:
-            info_dialog(info_text=__("FloatingInfo finished successfully"), detailed_text=detailed_text)
-        else:
-            error_dialog(__("There was an error on the post-processing. Show details to view the errors."), detailed_text=detailed_text)
-
-    export_dialog.on_cancel.connect(on_cancel)
-    export_process = QtCore.QProcess(get_fc_main_window())
-    export_process.finished.connect(on_export_finished)
-    export_process.readyReadStandardOutput.connect(on_stdout_ready)
-    ensure_process_is_executable_or_fail(case.executable_paths.floatinginfo)
-    export_process.start(case.executable_paths.floatinginfo, executable_parameters)
+    run_post_processing_job("FloatingInfo", case.executable_paths.floatinginfo, executable_parameters, [("-savedata {}", output_prefix)],
+                            r"Part_(\d+)\.bi4", case, post_processing_widget)
 
 
 def computeforces_export(options, case, post_processing_widget) -> None:
     """ ComputeForces tool export. """
-    post_processing_widget.adapt_to_export_start()
-
     save_flag: str = {0: "-savevtk", 1: "-savecsv", 2: "-saveascii"}[options["save_mode"]]
-
-    exported_parts: int = get_total_exported_parts_from_disk(case.get_out_folder_path())
-
-    export_dialog = ExportProgressDialog(0, exported_parts, parent=get_fc_main_window())
-    export_dialog.show()
-
-    case.info.current_output = ""
+    output_prefix: str = "{out_path}{file_name}".format(out_path=case.get_out_folder_path(), file_name=options["filename"])
 
     executable_parameters = ["-dirin {}".format(case.get_out_folder_path()),
-                             "-filexml {out_path}{case_name}.xml".format(out_path=case.get_out_folder_path(), case_name=case.name),
-                             "{save_flag} {out_path}{file_name}".format(save_flag=save_flag, out_path=case.get_out_folder_path(), file_name=options["filename"])]
+                             "-filexml {out_path}{case_name}.xml".format(out_path=case.get_out_folder_path(), case_name=case.name)]
 
     if options["onlyprocess"]:
         executable_parameters.append("{}{}".format(options["onlyprocess_tag"], options["onlyprocess"]))
@@ -157,58 +120,19 @@ def computeforces_export(options, case, post_processing_widget) -> None:
     if options["additional_parameters"]:
         executable_parameters.append(options["additional_parameters"])
 
-    def on_stdout_ready():
-        """ Updates the export dialog on every stdout available from the process. """
-        current_output = str(export_process.readAllStandardOutput().data(), encoding='utf-8')
-        case.info.current_output += current_output
-        try:
-            current_part = int(current_output.split("Part_")[1].split(".bi4")[0])
-        except IndexError:
-            current_part = export_dialog.get_value()
-        export_dialog.update_data(current_part)
-
-    def on_cancel():
-        """ Kills the process and cancels the export dialog. """
-        export_process.kill()
-        post_processing_widget.adapt_to_export_finished()
-        export_dialog.reject()
-
-    def on_export_finished(exit_code):
-        """ Closes and displays info/error about the process. """
-        post_processing_widget.adapt_to_export_finished()
-        export_dialog.accept()
-        detailed_text = "The executed command line was: {} {}\n\n{}".format(case.executable_paths.computeforces, " ".join(executable_parameters), case.info.current_output)
-
-        if not exit_code:
-            info_dialog(info_text=__("ComputeForces finished successfully"), detailed_text=detailed_text)
-        else:
-            error_dialog(__("There was an error on the post-processing. Show details to view the errors."), detailed_text=detailed_text)
-
-    export_dialog.on_cancel.connect(on_cancel)
-    export_process = QtCore.QProcess(get_fc_main_window())
-    export_process.finished.connect(on_export_finished)
-    export_process.readyReadStandardOutput.connect(on_stdout_ready)
-    ensure_process_is_executable_or_fail(case.executable_paths.computeforces)
-    export_process.start(case.executable_paths.computeforces, executable_parameters)
+    run_post_processing_job("ComputeForces", case.executable_paths.computeforces, executable_parameters, [(save_flag + " {}", output_prefix)],
+                            r"Part_(\d+)\.bi4", case, post_processing_widget)
 
 
 def measuretool_export(options, case, post_processing_widget) -> None:
     """ MeasureTool tool export. """
-    post_processing_widget.adapt_to_export_start()
-
     save_flag: str = {0: "-savevtk", 1: "-savecsv", 2: "-saveascii"}[options["save_mode"]]
-    exported_parts: int = get_total_exported_parts_from_disk(case.get_out_folder_path())
-
-    export_dialog = ExportProgressDialog(0, exported_parts, parent=get_fc_main_window())
-    export_dialog.show()
-
-    case.info.current_output = ""
+    output_prefix: str = "{out_path}{file_name}".format(out_path=case.get_out_folder_path(), file_name=options["filename"])
 
     save_measuretool_info(case.path, case.info.measuretool_points, case.info.measuretool_grid)
 
     executable_parameters = ["-dirin {out_path}".format(out_path=case.get_out_folder_path()),
                              "-filexml {out_path}{case_name}.xml".format(out_path=case.get_out_folder_path(), case_name=case.name),
-                             "{save_flag} {out_path}{file_name}".format(save_flag=save_flag, out_path=case.get_out_folder_path(), file_name=options["filename"]),
                              "-points {case_path}/points.txt".format(case_path=case.path),
                              "-vars:{save_vars}".format(save_vars=options["save_vars"]),
                              "-height" if options["calculate_water_elevation"] else ""]
@@ -216,146 +140,40 @@ def measuretool_export(options, case, post_processing_widget) -> None:
     if options["additional_parameters"]:
         executable_parameters.append(options["additional_parameters"])
 
-    def on_stdout_ready():
-        """ Updates the export dialog on every stdout available from the process. """
-        current_output = str(export_process.readAllStandardOutput().data(), encoding='utf-8')
-        case.info.current_output += current_output
-        try:
-            current_part = int(current_output.split("/Part_")[1].split(".bi4")[0])
-        except IndexError:
-            current_part = export_dialog.get_value()
-        export_dialog.update_data(current_part)
-
-    def on_cancel():
-        """ Kills the process and cancels the export dialog. """
-        export_process.kill()
-        post_processing_widget.adapt_to_export_finished()
-        export_dialog.reject()
-
-    def on_export_finished(exit_code):
-        """ Closes and displays info/error about the process. """
-        post_processing_widget.adapt_to_export_finished()
-        export_dialog.accept()
-        detailed_text = "The executed command line was: {} {}\n\n{}".format(case.executable_paths.measuretool, " ".join(executable_parameters), case.info.current_output)
-
-        if not exit_code:
-            info_dialog(info_text=__("MeasureTool finished successfully."), detailed_text=detailed_text)
-        else:
-            error_dialog(__("There was an error on the post-processing. Show details to view the errors."), detailed_text=detailed_text)
-
-    export_dialog.on_cancel.connect(on_cancel)
-    export_process = QtCore.QProcess(get_fc_main_window())
-    export_process.finished.connect(on_export_finished)
-    export_process.readyReadStandardOutput.connect(on_stdout_ready)
-    ensure_process_is_executable_or_fail(case.executable_paths.measuretool)
-    export_process.start(case.executable_paths.measuretool, executable_parameters)
+    run_post_processing_job("MeasureTool", case.executable_paths.measuretool, executable_parameters, [(save_flag + " {}", output_prefix)],
+                            r"Part_(\d+)\.bi4", case, post_processing_widget)
 
 
 def isosurface_export(options, case, post_processing_widget) -> None:
-    """ Export IsoSurface button behaviour. Launches a process while disabling the button. """
-    post_processing_widget.adapt_to_export_start()
-
-    exported_parts: int = get_total_exported_parts_from_disk(case.get_out_folder_path())
-    export_dialog = ExportProgressDialog(0, exported_parts, parent=get_fc_main_window())
-    export_dialog.show()
-
-    case.info.current_output = ""
+    """ Export IsoSurface button behaviour. Launches the tool on the post-processing pipeline. """
+    output_prefix: str = "{out_path}{file_name}".format(out_path=case.get_out_folder_path(), file_name=options["file_name"])
 
     # Build parameters
-    executable_parameters = ["-dirin {out_path}".format(out_path=case.get_out_folder_path()),
-                             "{surface_or_slice} {out_path}{file_name}".format(surface_or_slice=options["surface_or_slice"], out_path=case.get_out_folder_path(), file_name=options["file_name"])]
+    executable_parameters = ["-dirin {out_path}".format(out_path=case.get_out_folder_path())]
 
     if options["additional_parameters"]:
         executable_parameters.append(options["additional_parameters"])
 
-    def on_stdout_ready():
-        """ Updates the export dialog on every stdout available from the process. """
-        current_output = str(export_process.readAllStandardOutput().data(), encoding='utf-8')
-        case.info.current_output += current_output
-        try:
-            current_part = current_output.split("{}_".format(options["file_name"]))[1]
-            current_part = int(current_part.split(".vtk")[0])
-        except IndexError:
-            current_part = export_dialog.get_value()
-        export_dialog.update_data(current_part)
-
-    def on_cancel():
-        """ Kills the process and cancels the export dialog. """
-        export_process.kill()
-        post_processing_widget.adapt_to_export_finished()
-        export_dialog.reject()
-
-    def on_export_finished(exit_code):
-        """ Closes and displays info/error about the process. """
-        post_processing_widget.adapt_to_export_finished()
-        export_dialog.accept()
-        detailed_text = "The executed command line was: {} {}\n\n{}".format(case.executable_paths.isosurface, " ".join(executable_parameters), case.info.current_output)
-
-        if not exit_code:
-            info_dialog(info_text=__("IsoSurface finished successfully"), detailed_text=detailed_text)
-        else:
-            error_dialog(__("There was an error on the post-processing. Show details to view the errors."), detailed_text=detailed_text)
-
+    def on_success():
+        """ Opens the exported files on ParaView if requested. """
         if options["open_paraview"]:
             subprocess.Popen([case.executable_paths.paraview, "--data={}\\{}_..{}".format(case.path + "\\" + case.name + "_out", options["file_name"], "vtk")], stdout=subprocess.PIPE)
 
-    export_dialog.on_cancel.connect(on_cancel)
-    export_process = QtCore.QProcess(get_fc_main_window())
-    export_process.finished.connect(on_export_finished)
-    export_process.readyReadStandardOutput.connect(on_stdout_ready)
-    ensure_process_is_executable_or_fail(case.executable_paths.isosurface)
-    export_process.start(case.executable_paths.isosurface, executable_parameters)
+    run_post_processing_job("IsoSurface", case.executable_paths.isosurface, executable_parameters, [(options["surface_or_slice"] + " {}", output_prefix)],
+                            r"{}_(\d+)\.vtk".format(re.escape(options["file_name"])), case, post_processing_widget, on_success)
 
 
 def flowtool_export(options, case, post_processing_widget) -> None:
-    """ Export FlowTool button behaviour. Launches a process while disabling the button. """
-    post_processing_widget.adapt_to_export_start()
-
-    exported_parts: int = get_total_exported_parts_from_disk(case.get_out_folder_path())
-    export_dialog = ExportProgressDialog(0, exported_parts, parent=get_fc_main_window())
-    export_dialog.show()
-
-    case.info.current_output = ""
+    """ Export FlowTool button behaviour. Launches the tool on the post-processing pipeline. """
+    csv_prefix: str = "{out_path}{file_name}".format(out_path=case.get_out_folder_path(), file_name=options["csv_name"])
+    vtk_prefix: str = "{out_path}{file_name}".format(out_path=case.get_out_folder_path(), file_name=options["vtk_name"])
 
     executable_parameters = ["-dirin {}".format(case.get_out_folder_path()),
-                             "-fileboxes {case_path}/fileboxes.txt".format(case_path=case.path),
-                             "-savecsv {out_path}{file_name}.csv".format(out_path=case.get_out_folder_path(), file_name=options["csv_name"]),
-                             "-savevtk {out_path}{file_name}.vtk".format(out_path=case.get_out_folder_path(), file_name=options["vtk_name"])]
+                             "-fileboxes {case_path}/fileboxes.txt".format(case_path=case.path)]
 
     if options["additional_parameters"]:
         executable_parameters.append(options["additional_parameters"])
 
-    def on_stdout_ready():
-        """ Updates the export dialog on every stdout available from the process. """
-        current_output = str(export_process.readAllStandardOutput().data(), encoding='utf-8')
-        case.info.current_output += current_output
-        try:
-            current_part = current_output.split("{}_".format(options["vtk_name"]))[1]
-            current_part = int(current_part.split(".vtk")[0])
-        except IndexError:
-            current_part = export_dialog.get_value()
-        export_dialog.update_data(current_part)
-
-    def on_cancel():
-        """ Kills the process and cancels the export dialog. """
-        export_process.kill()
-        post_processing_widget.adapt_to_export_finished()
-        export_dialog.reject()
-
-    def on_export_finished(exit_code):
-        """ Closes and displays info/error about the process. """
-        post_processing_widget.adapt_to_export_finished()
-        export_dialog.accept()
-        detailed_text = "The executed command line was: {} {}\n\n{}".format(case.executable_paths.flowtool, " ".join(executable_parameters), case.info.current_output)
-
-        if not exit_code:
-            info_dialog(info_text=__("FlowTool finished successfully"), detailed_text=detailed_text)
-        else:
-            error_dialog(__("There was an error on the post-processing. Show details to view the errors."), detailed_text=detailed_text)
-
-    export_dialog.on_cancel.connect(on_cancel)
-    export_process = QtCore.QProcess(get_fc_main_window())
-    export_process.finished.connect(on_export_finished)
-    export_process.readyReadStandardOutput.connect(on_stdout_ready)
-    ensure_process_is_executable_or_fail(case.executable_paths.flowtool)
-    export_process.start(case.executable_paths.flowtool, executable_parameters)
+    # FlowTool counts the particles crossing each box between consecutive Parts, so it can't be split in Part ranges
+    run_post_processing_job("FlowTool", case.executable_paths.flowtool, executable_parameters, [("-savecsv {}.csv", csv_prefix), ("-savevtk {}.vtk", vtk_prefix)],
+                            r"{}_(\d+)\.vtk".format(re.escape(options["vtk_name"])), case, post_processing_widget, shardable=False)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics progress event bus. """
+
+# from PySide import QtCore
+from PySide6 import QtCore
+
+from mod.constants import PROGRESS_BUS_WINDOW_MS
+
+
+class ProgressBus(QtCore.QObject):
+    """ Coalesces the progress events published by the DualSPHysics tools.
+    Every event received within the window is merged into a single state, which is emitted
+    once when the window ends. The UI work depends on the window and not on the event rate. """
+
+    updated = QtCore.Signal(dict)
+
+    def __init__(self, window_ms: int = PROGRESS_BUS_WINDOW_MS, parent=None):
+        super().__init__(parent=parent)
+        self.pending: dict = dict()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(window_ms)
+        self.timer.timeout.connect(self.dispatch)
+
+    def set_window(self, window_ms: int) -> None:
+        """ Changes the coalescing window. """
+        self.timer.setInterval(window_ms)
+
+    def publish(self, **state) -> None:
+        """ Merges an event into the pending state. Later values replace earlier ones for the same key. """
+        self.pending.update(state)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def dispatch(self) -> None:
+        """ Emits the pending state, if any. """
+        if not self.pending:
+            return
+        state, self.pending = self.pending, dict()
+        self.updated.emit(state)
+
+    def flush(self) -> None:
+        """ Emits the pending state immediately instead of waiting for the window to end. """
+        self.timer.stop()
+        self.dispatch()
+
+    def stop(self) -> None:
+        """ Discards the pending state. """
+        self.timer.stop()
+        self.pending = dict()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+
+""" DualSPHysics Run.out related tools. """
+
+import csv
+import time
+from os import path
+
+from mod.dataobjects.run_progress import RunProgress, RunMetricsSample
+
+
+class RunOutFollower():
+    """ Follows a growing Run.out file, reading only the bytes appended since the last poll
+    and parsing the new lines into a RunProgress record.
+    Wall-clock times are taken when a line is read, relative to the moment the follower started. """
+
+    METRICS_FILE_NAME = "Run_metrics.csv"
+
+    def __init__(self, run_out_path: str):
+        self.run_out_path: str = run_out_path
+        self.offset: int = 0
+        self.pending_bytes: bytes = b""
+        self.progress: RunProgress = RunProgress()
+        self.started_at: float = time.monotonic()
+
+    def reset(self) -> None:
+        """ Forgets everything read so far. """
+        self.offset = 0
+        self.pending_bytes = b""
+        self.progress = RunProgress()
+        self.started_at = time.monotonic()
+
+    def poll(self) -> str:
+        """ Reads the complete lines appended to the file since the last poll, updates the progress
+        with them and returns them as text. Incomplete trailing lines are kept for the next poll. """
+        if not path.isfile(self.run_out_path):
+            return ""
+
+        if path.getsize(self.run_out_path) < self.offset:
+            # The file was truncated or replaced: start over.
+            self.reset()
+
+        with open(self.run_out_path, "rb") as run_file:
+            run_file.seek(self.offset)
+            new_bytes = run_file.read()
+        self.offset += len(new_bytes)
+
+        data = self.pending_bytes + new_bytes
+        last_line_end = data.rfind(b"\n")
+        if last_line_end == -1:
+            self.pending_bytes = data
+            return ""
+        self.pending_bytes = data[last_line_end + 1:]
+
+        text = data[:last_line_end + 1].decode("utf-8", errors="replace")
+        self.feed(text.splitlines(keepends=True))
+        return text
+
+    def flush(self) -> str:
+        """ Polls the file and also parses the trailing line even if it is not terminated. Used once the process finished. """
+        text = self.poll()
+        if self.pending_bytes:
+            trailing = self.pending_bytes.decode("utf-8", errors="replace")
+            self.pending_bytes = b""
+            self.feed([trailing])
+            text += trailing
+        return text
+
+    def feed(self, lines: list) -> None:
+        """ Updates the progress with a list of new lines. """
+        for line in lines:
+            self.parse_line(line)
+
+    def parse_line(self, line: str) -> None:
+        """ Updates the progress with the information of a single line. """
+        progress = self.progress
+        if "TimeMax=" in line:
+            if progress.timemax is not None:
+                return
+            try:
+                progress.timemax = float(line.split("=")[1])
+            except ValueError:
+                pass
+        elif "Part_" in line and "stored" not in line and "      " in line:
+            fields = line.split(None)
+            try:
+                progress.current_time = float(fields[1])
+                progress.last_part = int(fields[0].split("_")[-1])
+            except (IndexError, ValueError):
+                return
+            progress.estimated_time = str(" ".join(fields[-2:]))
+            try:
+                total_steps = int(fields[2])
+            except (IndexError, ValueError):
+                total_steps = None
+            progress.add_sample(RunMetricsSample(progress.last_part, progress.current_time, time.monotonic() - self.started_at, total_steps))
+        elif "total out: " in line:
+            try:
+                progress.set_particles_out(int(line.split("(total out: ")[1].split(")")[0]))
+            except (IndexError, ValueError):
+                pass
+        if "exception" in line.lower():
+            progress.exception_found = True
+
+    def get_metrics_csv_path(self) -> str:
+        """ Returns the path of the metrics CSV, saved next to Run.out. """
+        return "{}/{}".format(path.dirname(self.run_out_path), self.METRICS_FILE_NAME)
+
+    def save_metrics_csv(self) -> None:
+        """ Writes the metrics timeline read so far as a CSV file next to Run.out. """
+        with open(self.get_metrics_csv_path(), "w", encoding="utf-8", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(RunMetricsSample.CSV_HEADER)
+            for sample in self.progress.timeline:
+                writer.writerow(sample.to_csv_row())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics project save manifest.
+
+Keeps a record of the files a save places on a project folder, so the next saves can skip the ones
+that are already up to date instead of exporting or copying them again.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from os import path
+
+from mod.stdout_tools import debug
+from mod.functions import link_or_copy
+
+
+class SaveManifest():
+    """ Record of the assets written on a project folder by the last save.
+    Generated files (the STL of each complex object) are recorded with a signature of what they were generated from.
+    Copied files are recorded with the size and modification time of their source, and a content hash computed
+    when the source is touched without changing its size. A file is written again only if its source changed or
+    the file itself was modified since it was recorded. """
+
+    MANIFEST_FILE_NAME = "SaveManifest.json"
+    FORMAT_VERSION = 1
+    HASH_BLOCK_SIZE = 1024 * 1024
+
+    def __init__(self, project_folder: str):
+        self.project_folder: str = path.abspath(project_folder)
+        self.generated: dict = dict()  # {relative path: {"signature", "size", "mtime_ns"}}
+        self.copied: dict = dict()  # {relative path: {"source", "source_size", "source_mtime_ns", "sha256", "size", "mtime_ns"}}
+        self.used: set = set()  # Relative paths placed by the current save
+        self.load()
+
+    def get_manifest_file_path(self) -> str:
+        """ Returns the path of the file the manifest is persisted to. """
+        return path.join(self.project_folder, self.MANIFEST_FILE_NAME)
+
+    def get_key(self, file_path: str) -> str:
+        """ Returns the key of a file of the project folder on the manifest. """
+        return path.relpath(path.abspath(file_path), self.project_folder).replace("\\", "/")
+
+    def load(self) -> None:
+        """ Restores the manifest persisted on the project folder, if any. """
+        try:
+            with open(self.get_manifest_file_path(), "r", encoding="utf-8") as manifest_file:
+                data: dict = json.load(manifest_file)
+            if data.get("version") != self.FORMAT_VERSION:
+                return
+            self.generated = dict(data["generated"])
+            self.copied = dict(data["copied"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # Without a valid manifest every asset is placed again
+            self.generated = dict()
+            self.copied = dict()
+
+    def save(self) -> None:
+        """ Persists the entries of the files placed by the current save, forgetting the rest. """
+        data: dict = {
+            "version": self.FORMAT_VERSION,
+            "generated": {key: entry for key, entry in self.generated.items() if key in self.used},
+            "copied": {key: entry for key, entry in self.copied.items() if key in self.used}
+        }
+        temporary_path: str = "{}.tmp".format(self.get_manifest_file_path())
+        with open(temporary_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(data, manifest_file)
+        os.replace(temporary_path, self.get_manifest_file_path())
+
+    @staticmethod
+    def get_stats(file_path: str) -> tuple:
+        """ Returns the (size, mtime_ns) of a file, or None if it does not exist. """
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return None
+        return stat_result.st_size, stat_result.st_mtime_ns
+
+    def hash_file(self, file_path: str) -> str:
+        """ Returns the sha256 of the contents of a file. """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as input_file:
+            for block in iter(lambda: input_file.read(self.HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def is_generated_current(self, file_path: str, signature: str) -> bool:
+        """ Returns whether a generated file exists and was generated from the given signature. """
+        key: str = self.get_key(file_path)
+        self.used.add(key)
+        entry: dict = self.generated.get(key)
+        if signature is None or not entry or entry["signature"] != signature:
+            return False
+        return self.get_stats(file_path) == (entry["size"], entry["mtime_ns"])
+
+    def record_generated(self, file_path: str, signature: str) -> None:
+        """ Records a file just generated from the given signature. """
+        key: str = self.get_key(file_path)
+        self.used.add(key)
+        stats: tuple = self.get_stats(file_path)
+        if signature is None or stats is None:
+            self.generated.pop(key, None)
+            return
+        self.generated[key] = {"signature": signature, "size": stats[0], "mtime_ns": stats[1]}
+
+    def is_copy_current(self, source: str, source_stats: tuple, destination: str) -> bool:
+        """ Returns whether the destination already holds the current contents of the source. """
+        key: str = self.get_key(destination)
+        entry: dict = self.copied.get(key)
+        destination_stats: tuple = self.get_stats(destination)
+        if destination_stats is None:
+            return False
+        if not entry or entry["source"] != source:
+            # Not recorded, as after saving with a previous version: copies and links keep the source stats
+            return destination_stats == source_stats
+        if destination_stats != (entry["size"], entry["mtime_ns"]):
+            return False
+        if source_stats == (entry["source_size"], entry["source_mtime_ns"]):
+            return True
+        if source_stats[0] != entry["source_size"]:
+            return False
+        # The source was touched but kept its size, so its contents decide
+        recorded_hash: str = entry.get("sha256") or self.hash_file(destination)
+        source_hash: str = self.hash_file(source)
+        entry["sha256"] = source_hash
+        if source_hash != recorded_hash:
+            return False
+        entry["source_size"], entry["source_mtime_ns"] = source_stats
+        return True
+
+    def place_file(self, source: str, destination: str, link: bool = False) -> bool:
+        """ Copies a file to a destination of the project folder, or hardlinks it if link is set, unless the
+        destination is already up to date. Returns whether the file was written. Raises OSError if it can't be placed. """
+        source = path.abspath(source)
+        destination = path.abspath(destination)
+        if path.normcase(source) == path.normcase(destination):
+            return False
+        key: str = self.get_key(destination)
+        self.used.add(key)
+
+        source_stats: tuple = self.get_stats(source)
+        if source_stats is None:
+            raise FileNotFoundError("{} does not exist".format(source))
+        if self.is_copy_current(source, source_stats, destination):
+            entry: dict = self.copied.get(key)
+            if not entry or entry["source"] != source:
+                self.record_copy(source, source_stats, destination)
+            return False
+
+        # Never write through an existing file, as it may be a hardlink shared with another one
+        if path.lexists(destination):
+            os.remove(destination)
+        if link:
+            link_or_copy(source, destination)
+        else:
+            shutil.copy2(source, destination)
+        debug("Placed {} on {}", source, destination)
+        self.record_copy(source, source_stats, destination)
+        return True
+
+    def record_copy(self, source: str, source_stats: tuple, destination: str) -> None:
+        """ Records a file placed from a source. """
+        size, mtime_ns = self.get_stats(destination)
+        self.copied[self.get_key(destination)] = {"source": source, "source_size": source_stats[0], "source_mtime_ns": source_stats[1],
+                                                  "sha256": None, "size": size, "mtime_ns": mtime_ns}
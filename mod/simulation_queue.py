@@ -0,0 +1,289 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics simulation queue. """
+
+import os
+import json
+import time
+from sys import platform
+
+# from PySide import QtCore
+from PySide6 import QtCore
+
+import FreeCAD
+
+from mod.stdout_tools import log, warning
+from mod.enums import JobStatus
+from mod.constants import SIMULATION_QUEUE_POLL_MS
+from mod.executable_tools import ensure_process_is_executable_or_fail
+from mod.run_out_tools import RunOutFollower
+
+from mod.dataobjects.simulation_job import SimulationJob
+
+
+class SimulationQueue(QtCore.QObject):
+    """ Runs queued DualSPHysics jobs in the background, with a limit of concurrent CPU and GPU jobs.
+    The queue is persisted in the FreeCAD user directory, so pending jobs survive a restart.
+    Jobs that were running when FreeCAD closed are queued again. """
+    __instance: "SimulationQueue" = None
+
+    job_updated = QtCore.Signal(str)  # job_id
+    queue_changed = QtCore.Signal()
+
+    def __init__(self):
+        """ Virtually private constructor. """
+        if SimulationQueue.__instance is not None:
+            raise Exception("SimulationQueue class is a singleton and should not be initialized twice")
+        super().__init__()
+        SimulationQueue.__instance = self
+        self.jobs: list = list()  # [SimulationJob]
+        self.max_cpu_jobs: int = 1
+        self.max_gpu_jobs: int = 1
+        self.cpu_threads_per_job: int = 0  # 0 lets DualSPHysics use every core
+        self.processes: dict = dict()  # {job_id: QProcess}
+        self.followers: dict = dict()  # {job_id: RunOutFollower}
+        self.cpu_slots: dict = dict()  # {job_id: slot used to pin the job to a range of cores}
+
+        self.poll_timer = QtCore.QTimer(self)
+        self.poll_timer.setInterval(SIMULATION_QUEUE_POLL_MS)
+        self.poll_timer.timeout.connect(self.poll_running_jobs)
+
+        self.restore_from_disk()
+
+    @staticmethod
+    def the() -> "SimulationQueue":
+        """ Static access method. """
+        if SimulationQueue.__instance is None:
+            SimulationQueue()
+        return SimulationQueue.__instance
+
+    def get_save_file(self) -> str:
+        """ Returns the path of the queue file saved in the FreeCAD user directory. """
+        return "{datadir}/designsphysics-queue.json".format(datadir=FreeCAD.getUserAppDataDir())
+
+    def restore_from_disk(self) -> None:
+        """ Restores the persisted queue, queueing again the jobs that were running. """
+        queue_file: str = self.get_save_file()
+        if not os.path.exists(queue_file):
+            return
+        try:
+            with open(queue_file, "r", encoding="utf-8") as save_file:
+                disk_data: dict = json.load(save_file)
+        except (OSError, ValueError) as ex:
+            warning("Could not restore the simulation queue: {}", ex)
+            return
+        self.max_cpu_jobs = disk_data.get("max_cpu_jobs", self.max_cpu_jobs)
+        self.max_gpu_jobs = disk_data.get("max_gpu_jobs", self.max_gpu_jobs)
+        self.cpu_threads_per_job = disk_data.get("cpu_threads_per_job", self.cpu_threads_per_job)
+        self.jobs = [SimulationJob.from_dict(job_data) for job_data in disk_data.get("jobs", [])]
+        for job in self.jobs:
+            if job.status == JobStatus.RUNNING:
+                job.status = JobStatus.QUEUED
+                job.started_at = None
+                job.percentage = None
+
+    def persist(self) -> None:
+        """ Persists the queue to disk. """
+        disk_data: dict = {"max_cpu_jobs": self.max_cpu_jobs,
+                           "max_gpu_jobs": self.max_gpu_jobs,
+                           "cpu_threads_per_job": self.cpu_threads_per_job,
+                           "jobs": [job.to_dict() for job in self.jobs]}
+        with open(self.get_save_file(), "w", encoding="utf-8") as save_file:
+            json.dump(disk_data, save_file, indent=4)
+
+    def get_job(self, job_id: str) -> SimulationJob:
+        """ Returns the job with the given id, or None. """
+        for job in self.jobs:
+            if job.job_id == job_id:
+                return job
+        return None
+
+    def has_active_job_for(self, case_path: str) -> bool:
+        """ Returns whether a case has a job waiting or running, as two runs of the same case would share its out folder. """
+        return any(job.is_active() and job.case_path == case_path for job in self.jobs)
+
+    def set_limits(self, max_cpu_jobs: int, max_gpu_jobs: int, cpu_threads_per_job: int) -> None:
+        """ Changes the concurrency limits. Running jobs are not affected. """
+        self.max_cpu_jobs = max_cpu_jobs
+        self.max_gpu_jobs = max_gpu_jobs
+        self.cpu_threads_per_job = cpu_threads_per_job
+        self.persist()
+        self.schedule()
+
+    def add_job(self, job: SimulationJob) -> bool:
+        """ Queues a job. Returns False if its case already has a job waiting or running. """
+        if self.has_active_job_for(job.case_path):
+            return False
+        self.jobs.append(job)
+        self.persist()
+        self.queue_changed.emit()
+        self.schedule()
+        return True
+
+    def remove_job(self, job_id: str) -> None:
+        """ Removes a job that is not running from the queue. """
+        job = self.get_job(job_id)
+        if job is None or job.status == JobStatus.RUNNING:
+            return
+        self.jobs.remove(job)
+        self.persist()
+        self.queue_changed.emit()
+
+    def remove_inactive_jobs(self) -> None:
+        """ Removes the jobs that already finished, failed or were cancelled. """
+        self.jobs = [job for job in self.jobs if job.is_active()]
+        self.persist()
+        self.queue_changed.emit()
+
+    def cancel_job(self, job_id: str) -> None:
+        """ Cancels a waiting job, or kills a running one. """
+        job = self.get_job(job_id)
+        if job is None or not job.is_active():
+            return
+        if job.status == JobStatus.QUEUED:
+            self.finish_job(job, JobStatus.CANCELLED)
+            return
+        job.status = JobStatus.CANCELLED
+        self.processes[job_id].kill()
+
+    def count_running(self, device: str) -> int:
+        """ Returns the number of running jobs on a device. """
+        return sum(1 for job in self.jobs if job.status == JobStatus.RUNNING and job.device == device)
+
+    def schedule(self) -> None:
+        """ Starts queued jobs, in order, while there are free slots for their device. """
+        limits: dict = {"cpu": self.max_cpu_jobs, "gpu": self.max_gpu_jobs}
+        for job in self.jobs:
+            if job.status == JobStatus.QUEUED and self.count_running(job.device) < limits.get(job.device, 1):
+                self.start_job(job)
+
+    def get_free_cpu_slot(self) -> int:
+        """ Returns the lowest core range slot not used by a running CPU job. """
+        used: set = set(self.cpu_slots.values())
+        slot = 0
+        while slot in used:
+            slot += 1
+        return slot
+
+    def build_environment(self, job: SimulationJob) -> QtCore.QProcessEnvironment:
+        """ Returns the environment for a job. CPU jobs with a thread limit are pinned to their own range of cores. """
+        environment = QtCore.QProcessEnvironment.systemEnvironment()
+        if platform in ("linux", "linux2"):
+            environment.insert("LD_LIBRARY_PATH", os.path.dirname(job.executable))
+        if job.device == "cpu" and self.cpu_threads_per_job > 0:
+            slot: int = self.get_free_cpu_slot()
+            self.cpu_slots[job.job_id] = slot
+            first_core: int = slot * self.cpu_threads_per_job
+            environment.insert("OMP_NUM_THREADS", str(self.cpu_threads_per_job))
+            environment.insert("OMP_PROC_BIND", "true")
+            environment.insert("GOMP_CPU_AFFINITY", "{}-{}".format(first_core, first_core + self.cpu_threads_per_job - 1))
+        return environment
+
+    def start_job(self, job: SimulationJob) -> None:
+        """ Launches DualSPHysics for a job. """
+        out_folder: str = job.get_out_folder_path()
+        if not os.path.isdir(out_folder) or not os.path.isfile(job.executable):
+            warning("Can't run the queued simulation of {}: its out folder or executable does not exist", job.case_name)
+            self.finish_job(job, JobStatus.FAILED)
+            return
+        try:
+            ensure_process_is_executable_or_fail(job.executable)
+        except RuntimeError as ex:
+            warning(str(ex))
+            self.finish_job(job, JobStatus.FAILED)
+            return
+
+        # Parts and Run.out from a previous run would be mistaken for the output of this one
+        for file_name in os.listdir(out_folder):
+            if file_name.startswith("Part") or file_name == "Run.out":
+                os.remove(out_folder + file_name)
+
+        arguments: list = [job.get_out_xml_file_path(), out_folder, "-{}".format(job.device), "-svres"]
+        if job.device == "cpu" and self.cpu_threads_per_job > 0:
+            arguments.append("-ompthreads:{}".format(self.cpu_threads_per_job))
+        if job.additional_parameters:
+            arguments += job.additional_parameters.split(" ")
+
+        process = QtCore.QProcess(self)
+        process.setWorkingDirectory(job.case_path)
+        process.setProcessEnvironment(self.build_environment(job))
+        process.finished.connect(lambda exit_code, _exit_status, job_id=job.job_id: self.on_job_finished(job_id, exit_code))
+        process.errorOccurred.connect(lambda error, job_id=job.job_id: self.on_job_error(job_id, error))
+        self.processes[job.job_id] = process
+        self.followers[job.job_id] = RunOutFollower(out_folder + "Run.out")
+
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        job.percentage = 0
+        log("Starting queued simulation of {}", job.case_name)
+        process.start(job.executable, arguments)
+
+        self.persist()
+        self.job_updated.emit(job.job_id)
+        if self.followers and not self.poll_timer.isActive():
+            self.poll_timer.start()
+
+    def poll_running_jobs(self) -> None:
+        """ Reads the progress of the running jobs from their Run.out files. """
+        for job_id, follower in self.followers.items():
+            job = self.get_job(job_id)
+            follower.poll()
+            progress = follower.progress
+            job.percentage = progress.get_percentage(progress.timemax)
+            job.estimated_seconds = progress.get_estimated_seconds(progress.timemax)
+            self.job_updated.emit(job_id)
+
+    def release_job_process(self, job_id: str) -> RunOutFollower:
+        """ Frees the process, Run.out follower and core slot of a job that ended. Returns its follower. """
+        follower: RunOutFollower = self.followers.pop(job_id)
+        self.processes.pop(job_id).deleteLater()
+        self.cpu_slots.pop(job_id, None)
+        if not self.followers:
+            self.poll_timer.stop()
+        return follower
+
+    def on_job_error(self, job_id: str, error) -> None:
+        """ Fails a job whose process could not start, as no finished signal follows. """
+        if error != QtCore.QProcess.FailedToStart or job_id not in self.processes:
+            return
+        warning("The queued simulation could not be started: {}", self.processes[job_id].errorString())
+        self.release_job_process(job_id)
+        job = self.get_job(job_id)
+        if job is None:
+            return
+        job.exit_code = -1
+        self.finish_job(job, JobStatus.FAILED)
+
+    def on_job_finished(self, job_id: str, exit_code: int) -> None:
+        """ Stores the result of a job and starts the next ones. """
+        if job_id not in self.processes:
+            return
+        job = self.get_job(job_id)
+        follower: RunOutFollower = self.release_job_process(job_id)
+        if job is None:
+            return
+
+        follower.flush()
+        job.exit_code = exit_code
+        if job.status == JobStatus.CANCELLED:
+            status = JobStatus.CANCELLED
+        elif exit_code or follower.progress.exception_found:
+            status = JobStatus.FAILED
+        else:
+            status = JobStatus.FINISHED
+            job.percentage = 100
+            try:
+                follower.save_metrics_csv()
+            except OSError as ex:
+                warning("Could not save the simulation metrics: {}", ex)
+        log("Queued simulation of {} ended as {}", job.case_name, status)
+        self.finish_job(job, status)
+
+    def finish_job(self, job: SimulationJob, status: str) -> None:
+        """ Marks a job as ended and starts the next ones. """
+        job.status = status
+        job.finished_at = time.time()
+        job.estimated_seconds = None
+        self.persist()
+        self.job_updated.emit(job.job_id)
+        self.schedule()
@@ -3,7 +3,7 @@
 
 """ Standard output and error related tools. """
 
-from inspect import getframeinfo, stack
+import sys
 from os import path
 
 import FreeCAD
@@ -13,32 +13,40 @@ from mod.constants import APP_NAME, DISK_DUMP_FILE_NAME
 from mod.dataobjects.application_settings import ApplicationSettings
 
 
-def log(message):
-    """ Prints a log in the default output."""
+def _format_record(prefix, message, args) -> str:
+    """ Builds the final record line for a message. Only called when the record is going to be emitted.
+    The caller is resolved two frames up: the public logging function and this helper. """
+    caller = sys._getframe(2)  # pylint: disable=protected-access
+    if callable(message):
+        message = message()
+    elif args:
+        message = message.format(*args)
+    return "{}[{}] {}:{} -> {}\n".format(prefix, APP_NAME, path.basename(caller.f_code.co_filename), caller.f_lineno, message)
+
+
+def log(message, *args):
+    """ Prints a log in the default output.
+    The message can be a callable or a format string with its arguments, only evaluated if the log is emitted. """
     if ApplicationSettings.the().verbose_enabled:
-        caller = getframeinfo(stack()[1][0])
-        FreeCAD.Console.PrintMessage("[{}] {}:{} -> {}\n".format(APP_NAME, path.basename(caller.filename), caller.lineno, message))
+        FreeCAD.Console.PrintMessage(_format_record("", message, args))
 
 
-def warning(message):
+def warning(message, *args):
     """ Prints a warning in the default output. """
     if ApplicationSettings.the().verbose_enabled:
-        caller = getframeinfo(stack()[1][0])
-        FreeCAD.Console.PrintWarning("[WARNING][{}] {}:{} -> {}\n".format(APP_NAME, path.basename(caller.filename), caller.lineno, message))
+        FreeCAD.Console.PrintWarning(_format_record("[WARNING]", message, args))
 
 
-def error(message):
+def error(message, *args):
     """ Prints an error in the default output."""
     if ApplicationSettings.the().verbose_enabled:
-        caller = getframeinfo(stack()[1][0])
-        FreeCAD.Console.PrintError("[ERROR][{}] {}:{} -> {}\n".format(APP_NAME, path.basename(caller.filename), caller.lineno, message))
+        FreeCAD.Console.PrintError(_format_record("[ERROR]", message, args))
 
 
-def debug(message):
+def debug(message, *args):
     """ Prints a debug message in the default output"""
     if ApplicationSettings.the().debug_enabled:
-        caller = getframeinfo(stack()[1][0])
-        FreeCAD.Console.PrintWarning("[DEBUG][{}] {}:{} -> {}\n".format(APP_NAME, path.basename(caller.filename), caller.lineno, message))
+        FreeCAD.Console.PrintWarning(_format_record("[DEBUG]", message, args))
 
 
 def dump_to_disk(text):
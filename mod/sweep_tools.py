@@ -0,0 +1,191 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+
+""" Parameter sweep tools.
+
+Field paths address a value inside a Case with attribute names, list indexes and dictionary keys,
+for example "execution_parameters.visco" or "mkbasedproperties[11].movements[0].generator.wave_height".
+"""
+
+import os
+import re
+import csv
+import pickle
+import shutil
+import random
+import itertools
+from os import path
+
+from mod.stdout_tools import debug
+from mod.constants import CASE_PICKLE_PROTOCOL
+from mod.functions import link_or_copy
+from mod.file_tools import save_case_data
+from mod.save_manifest import SaveManifest
+from mod.xml.xml_exporter import XMLExporter
+
+
+FIELD_PATH_TOKEN_REGEX = re.compile(r"\.?([A-Za-z_]\w*)|\[\s*(-?\d+|'[^']*'|\"[^\"]*\")\s*\]")
+
+
+def parse_field_path(field_path: str) -> list:
+    """ Splits a field path into ("attr", name) and ("item", key) tokens. Raises ValueError if it is not valid. """
+    tokens: list = list()
+    position = 0
+    while position < len(field_path):
+        match = FIELD_PATH_TOKEN_REGEX.match(field_path, position)
+        if not match or (position == 0 and field_path.startswith(".")):
+            raise ValueError("Invalid field path {} at position {}".format(field_path, position))
+        if match.group(1):
+            tokens.append(("attr", match.group(1)))
+        else:
+            key = match.group(2)
+            tokens.append(("item", key[1:-1] if key[0] in "'\"" else int(key)))
+        position = match.end()
+    if not tokens:
+        raise ValueError("Empty field path")
+    return tokens
+
+
+def resolve_token(obj, token: tuple):
+    """ Returns the value a token points to inside an object. """
+    kind, key = token
+    if kind == "attr":
+        return getattr(obj, key)
+    return obj[key]
+
+
+def get_field(obj, field_path: str):
+    """ Returns the value of a field path inside an object. Raises AttributeError, KeyError, IndexError or ValueError if it does not exist. """
+    for token in parse_field_path(field_path):
+        obj = resolve_token(obj, token)
+    return obj
+
+
+def set_field(obj, field_path: str, value) -> None:
+    """ Sets the value of a field path inside an object, converting it to the type of the current value.
+    Raises ValueError if the field has no current value. """
+    tokens: list = parse_field_path(field_path)
+    for token in tokens[:-1]:
+        obj = resolve_token(obj, token)
+    kind, key = tokens[-1]
+    current = resolve_token(obj, tokens[-1])
+    if current is None:
+        raise ValueError("The field {} has no value to take its type from".format(field_path))
+    if isinstance(current, bool):
+        value = value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes")
+    elif isinstance(current, int):
+        value = int(round(float(value)))
+    elif isinstance(current, float):
+        value = float(value)
+    if kind == "attr":
+        setattr(obj, key, value)
+    else:
+        obj[key] = value
+
+
+class ParameterSweep():
+    """ Generates variants of a saved case, each one with different values for a set of field paths.
+    Variants are written as case folders next to each other. The XML and case data of every variant are generated,
+    while the input files of the base case (motion files, velocity series...) are shared through hardlinks.
+    Files that saving a case rewrites in place (geometry exports, the FreeCAD document) are copied instead, so
+    saving one case can't change the others. """
+
+    MANIFEST_FILE_NAME = "sweep.csv"
+    COPIED_FILE_SUFFIXES = (".stl", ".fcstd")  # Compared in lower case
+    CASE_DATA_FILE_NAME = "casedata.dsphdata"
+
+    def __init__(self, base_case: "Case"):
+        self.base_case = base_case
+        self.grid_parameters: list = list()  # [(field_path, [values])]
+        self.range_parameters: list = list()  # [(field_path, minimum, maximum)]
+
+    def add_grid_parameter(self, field_path: str, values: list) -> None:
+        """ Adds a field path that takes each of the given values on a grid sweep. """
+        if get_field(self.base_case, field_path) is None:
+            raise ValueError("The field {} has no value to take its type from".format(field_path))
+        self.grid_parameters.append((field_path, list(values)))
+
+    def add_range_parameter(self, field_path: str, minimum: float, maximum: float) -> None:
+        """ Adds a field path sampled between two values on a Latin hypercube sweep. """
+        current = get_field(self.base_case, field_path)
+        if isinstance(current, bool) or not isinstance(current, (int, float)):
+            raise ValueError("The field {} is not numeric and can't be sampled from a range".format(field_path))
+        self.range_parameters.append((field_path, minimum, maximum))
+
+    def get_grid_variants(self) -> list:
+        """ Returns every combination of the grid parameter values, as [{field_path: value}]. """
+        field_paths: list = [field_path for field_path, _ in self.grid_parameters]
+        return [dict(zip(field_paths, values)) for values in itertools.product(*[values for _, values in self.grid_parameters])]
+
+    def get_latin_hypercube_variants(self, samples: int, seed: int = None) -> list:
+        """ Returns a Latin hypercube sampling of the range parameters, as [{field_path: value}].
+        Each parameter range is split in as many strata as samples, and every stratum is used exactly once. """
+        generator = random.Random(seed)
+        variants: list = [dict() for _ in range(samples)]
+        for field_path, minimum, maximum in self.range_parameters:
+            strata: list = list(range(samples))
+            generator.shuffle(strata)
+            for variant, stratum in zip(variants, strata):
+                variant[field_path] = minimum + (stratum + generator.random()) / samples * (maximum - minimum)
+        return variants
+
+    def get_shared_files(self) -> tuple:
+        """ Returns the files of the base case folder to share with the variants, and the subset of them that is also on its out folder.
+        The XML and case data are generated for each variant, and outputs of previous executions are not shared. """
+        base_path: str = self.base_case.path
+        generated: set = {self.CASE_DATA_FILE_NAME, XMLExporter.MATERIAL_FILE_NAME, "{}{}".format(self.base_case.name, XMLExporter.GENCASE_XML_SUFFIX),
+                          SaveManifest.MANIFEST_FILE_NAME}
+        root_files: list = [entry.name for entry in os.scandir(base_path) if entry.is_file() and entry.name not in generated]
+        base_out_path: str = self.base_case.get_out_folder_path()
+        out_files: list = [name for name in root_files if path.isfile(base_out_path + name)]
+        return root_files, out_files
+
+    def share_file(self, source: str, destination: str) -> None:
+        """ Shares a base case file with a variant, replacing the one written on a previous sweep. """
+        if path.exists(destination):
+            os.remove(destination)
+        if source.lower().endswith(self.COPIED_FILE_SUFFIXES):
+            shutil.copy2(source, destination)
+        else:
+            link_or_copy(source, destination)
+
+    def write(self, output_folder: str, variants: list, name_prefix: str = None) -> list:
+        """ Writes a case folder for each variant on the output folder, with a manifest of the values used.
+        Returns the paths of the variant folders. """
+        name_prefix = name_prefix or "{}_sweep".format(self.base_case.name)
+        os.makedirs(output_folder, exist_ok=True)
+        root_files, out_files = self.get_shared_files()
+        serialized_case: bytes = pickle.dumps(self.base_case, CASE_PICKLE_PROTOCOL)
+        exporter = XMLExporter()
+        field_paths: list = sorted({field_path for variant in variants for field_path in variant})
+        variant_paths: list = list()
+
+        with open("{}/{}".format(output_folder, self.MANIFEST_FILE_NAME), "w", encoding="utf-8", newline="") as manifest_file:
+            manifest = csv.writer(manifest_file)
+            manifest.writerow(["case"] + field_paths)
+            for index, variant in enumerate(variants):
+                variant_name: str = "{}_{:04d}".format(name_prefix, index)
+                variant_path: str = "{}/{}".format(output_folder, variant_name)
+                variant_case = pickle.loads(serialized_case)
+                variant_case.rebuild_object_indexes()
+                for field_path, value in variant.items():
+                    set_field(variant_case, field_path, value)
+                variant_case.path = variant_path
+                variant_case.name = variant_name
+                variant_case.info.is_gencase_done = False
+                variant_case.info.needs_to_run_gencase = True
+                variant_case.info.is_simulation_done = False
+
+                os.makedirs(variant_case.get_out_folder_path(), exist_ok=True)
+                for name in root_files:
+                    self.share_file("{}/{}".format(self.base_case.path, name), "{}/{}".format(variant_path, name))
+                for name in out_files:
+                    self.share_file("{}/{}".format(self.base_case.path, name), variant_case.get_out_folder_path() + name)
+
+                exporter.save_to_disk(variant_path, variant_case, stream=True)
+                save_case_data(variant_path, variant_case)
+                manifest.writerow([variant_name] + [get_field(variant_case, field_path) for field_path in field_paths])
+                variant_paths.append(variant_path)
+
+        debug("Wrote {} sweep variants to {}", len(variant_paths), output_folder)
+        return variant_paths
@@ -3,17 +3,65 @@
 
 """ Template loading and formatting related tools. """
 
+import os
 from os import path
 
 
+class TemplateRegistry():
+    """ In-memory registry of the template files under mod/templates.
+    All templates are read once and kept in memory keyed by their path relative to the mod folder.
+    An entry is reloaded from disk when the modification time of its file changes. """
+    __instance: "TemplateRegistry" = None
+
+    TEMPLATES_FOLDER = "/templates"
+
+    def __init__(self):
+        """ Virtually private constructor. """
+        if TemplateRegistry.__instance is not None:
+            raise Exception("TemplateRegistry class is a singleton and should not be initialized twice")
+        TemplateRegistry.__instance = self
+        self.mod_folder: str = path.dirname(path.realpath(__file__))
+        self.templates: dict = dict()  # {template_path: (mtime, text)}
+        self.generation: int = 0  # Increased each time a loaded template changes on disk
+        self.preload()
+
+    @staticmethod
+    def the() -> "TemplateRegistry":
+        """ Static access method. """
+        if TemplateRegistry.__instance is None:
+            TemplateRegistry()
+        return TemplateRegistry.__instance
+
+    def preload(self) -> None:
+        """ Loads every template available under the templates folder. """
+        templates_root = "{}{}".format(self.mod_folder, self.TEMPLATES_FOLDER)
+        for directory, _, filenames in os.walk(templates_root):
+            for filename in filenames:
+                template_path = "{}/{}".format(directory[len(self.mod_folder):].replace(os.sep, "/"), filename)
+                self.load(template_path)
+
+    def load(self, template_path: str) -> str:
+        """ Reads a template from disk and stores it in the registry. """
+        full_path = "{}{}".format(self.mod_folder, template_path)
+        mtime = os.stat(full_path).st_mtime_ns
+        with open(full_path, "r", encoding="utf-8") as template:
+            text = template.read()
+        if template_path in self.templates:
+            self.generation += 1
+        self.templates[template_path] = (mtime, text)
+        return text
+
+    def get(self, template_path: str) -> str:
+        """ Returns the text for the given template, reloading it if the file changed on disk. """
+        entry = self.templates.get(template_path, None)
+        if entry is None or entry[0] != os.stat("{}{}".format(self.mod_folder, template_path)).st_mtime_ns:
+            return self.load(template_path)
+        return entry[1]
+
+
 def get_template_text(template_path) -> str:
     """ Returns the text for a given template. """
-    template_data = ""
-    mod_folder = path.dirname(path.realpath(__file__))
-
-    with open("{}{}".format(mod_folder, template_path), "r", encoding="utf-8") as template:
-        template_data = template.read()
-    return template_data
+    return TemplateRegistry.the().get(template_path)
 
 
 def obj_to_dict(obj, classkey=None):
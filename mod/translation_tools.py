@@ -4,35 +4,95 @@
 """ Translation related tools. """
 
 from os import path
+import atexit
 import json
 
 import FreeCADGui
 
 
-def __(text):
-    """ Translation helper. Takes a string and tries to return its translation to the current FreeCAD locale.
-    If the translation is missing or the file does not exists, return default english string. """
-    # Get FreeCAD current language
-    freecad_locale = FreeCADGui.getLocale().lower().replace(", ", "-").replace(" ", "-")
+class TranslationCatalog():
+    """ Process-wide in-memory translation catalog.
+    Loads each locale file once, serves lookups from memory and keeps track of missing strings
+    so they can be written to the locale file a single time per session. """
+    __instance: "TranslationCatalog" = None
 
-    # Find mod directory
-    mod_directory = path.dirname(path.abspath(__file__))
+    FALLBACK_LOCALE = "english"
 
-    # Open translation file and print the matching string, if it's defined.
-    filename = "{mod_directory}/lang/{locale}.json".format(mod_directory=mod_directory, locale=freecad_locale)
+    def __init__(self):
+        """ Virtually private constructor. """
+        if TranslationCatalog.__instance is not None:
+            raise Exception("TranslationCatalog class is a singleton and should not be initialized twice")
+        TranslationCatalog.__instance = self
+        self.lang_directory: str = "{}/lang".format(path.dirname(path.abspath(__file__)))
+        self.raw_locale: str = None
+        self.filename: str = None
+        self.translations: dict = dict()  # {text: translated_text}
+        self.pending: set = set()  # {text}
+        self.flushed: bool = False
+        atexit.register(self.flush)
 
-    if not path.isfile(filename):
-        filename = "{mod_directory}/lang/{locale}.json".format(mod_directory=mod_directory, locale="english")
+    @staticmethod
+    def the() -> "TranslationCatalog":
+        """ Static access method. """
+        if TranslationCatalog.__instance is None:
+            TranslationCatalog()
+        return TranslationCatalog.__instance
 
-    with open(filename, "r", encoding="utf-8") as f:
-        translation = json.load(f)
+    def get_locale_filename(self, raw_locale: str) -> str:
+        """ Returns the translation file to use for a FreeCAD locale, falling back to english if it does not exist. """
+        freecad_locale = raw_locale.lower().replace(", ", "-").replace(" ", "-")
+        filename = "{}/{}.json".format(self.lang_directory, freecad_locale)
+        if not path.isfile(filename):
+            filename = "{}/{}.json".format(self.lang_directory, self.FALLBACK_LOCALE)
+        return filename
 
-    # Tries to return the translation. It it does not exist, creates it
-    to_ret = translation.get(text, None)
+    def ensure_locale(self) -> None:
+        """ Loads the translation file for the current FreeCAD locale if it is not the one already in memory. """
+        raw_locale = FreeCADGui.getLocale()
+        if raw_locale == self.raw_locale:
+            return
+        filename = self.get_locale_filename(raw_locale)
+        if filename != self.filename:
+            self.flush_pending()
+            with open(filename, "r", encoding="utf-8") as f:
+                self.translations = json.load(f)
+            self.filename = filename
+        self.raw_locale = raw_locale
 
-    if not to_ret:
-        translation[text] = text
-        with open(filename, "w", encoding="utf-8") as f:
+    def translate(self, text: str) -> str:
+        """ Returns the translation for the text on the current locale, or the text itself if it is missing. """
+        self.ensure_locale()
+        to_ret = self.translations.get(text, None)
+        if not to_ret:
+            if text not in self.translations:
+                self.pending.add(text)
+            return text
+        return to_ret
+
+    def flush_pending(self) -> None:
+        """ Writes the pending missing strings to the loaded translation file, at most once per session. """
+        if not self.pending or self.flushed or not self.filename:
+            self.pending.clear()
+            return
+        with open(self.filename, "r", encoding="utf-8") as f:
+            translation = json.load(f)
+        for text in self.pending:
+            translation.setdefault(text, text)
+        with open(self.filename, "w", encoding="utf-8") as f:
             json.dump(translation, f, indent=4)
-        return text
-    return to_ret
+        self.pending.clear()
+        self.flushed = True
+
+    def flush(self) -> None:
+        """ Flushes pending missing strings. Registered to run when the interpreter exits. """
+        try:
+            self.flush_pending()
+        except OSError:
+            # Translation files may be read-only in some installations. Missing strings are not critical.
+            pass
+
+
+def __(text):
+    """ Translation helper. Takes a string and tries to return its translation to the current FreeCAD locale.
+    If the translation is missing or the file does not exists, return default english string. """
+    return TranslationCatalog.the().translate(text)
@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 """DesignSPHysics Add STL Dialog. """
 
+from os import path
+from sys import platform
 from uuid import uuid4
 from tempfile import gettempdir
 
@@ -737,6 +739,10 @@ class AddGEODialog(QtWidgets.QDialog):
         """ Executes bathymetry tool and returns the output path of the generated file. """
 
         export_process = QtCore.QProcess(get_fc_main_window())
+        environment = QtCore.QProcessEnvironment.systemEnvironment()
+        if platform in ("linux", "linux2"):
+            environment.insert("LD_LIBRARY_PATH", path.dirname(Case.the().executable_paths.bathymetrytool))
+        export_process.setProcessEnvironment(environment)
         temp_dir = gettempdir()
         working_dialog = WorkingDialog(self)
 
@@ -797,7 +803,7 @@ class AddGEODialog(QtWidgets.QDialog):
 
         export_process.finished.connect(on_export_finished)
         ensure_process_is_executable_or_fail(Case.the().executable_paths.bathymetrytool)
-        debug("Executing: {} {}".format(Case.the().executable_paths.bathymetrytool, " ".join(executable_parameters)))
+        debug("Executing: {} {}", Case.the().executable_paths.bathymetrytool, " ".join(executable_parameters))
         export_process.start(Case.the().executable_paths.bathymetrytool, executable_parameters)
         working_dialog.exec()
 
@@ -6,7 +6,7 @@
 from PySide6 import QtWidgets
 
 from mod.translation_tools import __
-from mod.template_tools import get_template_text, obj_to_dict
+from mod.template_tools import get_template_text
 from mod.freecad_tools import get_fc_object
 
 from mod.constants import CASE_LIMITS_OBJ_NAME, MKFLUID_LIMIT, MKFLUID_OFFSET
@@ -16,6 +16,8 @@ from mod.dataobjects.case import Case
 from mod.dataobjects.simulation_object import SimulationObject
 from mod.dataobjects.motion.movement import Movement
 
+from mod.xml.case_adapter import CaseAdapter
+
 
 class CaseSummary(QtWidgets.QDialog):
     """ Dialog that shows summarized case details in html format. """
@@ -43,7 +45,7 @@ class CaseSummary(QtWidgets.QDialog):
 
     def get_formatter(self) -> dict:
         """ Returns a dictionary to format the summary template. """
-        case_dict = obj_to_dict(Case.the())
+        case_dict = CaseAdapter.adapt_case(Case.the())
 
         # FIXME: Add domainfixed on parameters
         # FIXME: Add periodicity in template
@@ -66,12 +66,21 @@ class DockPostProcessingWidget(QtWidgets.QWidget):
 
         self.setLayout(self.main_layout)
 
+        self.running_exports: int = 0
+
     def adapt_to_export_start(self) -> None:
-        """ Adapts the widget to post processing tool start. """
-        self.setWindowTitle("<b>{} ({})</b>".format(__("Post-processing"), __("Exporting")))
-        self.setEnabled(False)
+        """ Adapts the widget to post processing tool start. Other tools can still be launched while it runs. """
+        self.running_exports += 1
+        self.update_title()
 
     def adapt_to_export_finished(self) -> None:
         """ Adapts the widget to post processing tool finish. """
-        self.setEnabled(True)
-        self.setWindowTitle("<b>{}</b>".format(__("Post-processing")))
+        self.running_exports = max(0, self.running_exports - 1)
+        self.update_title()
+
+    def update_title(self) -> None:
+        """ Shows the number of running post processing tools on the title. """
+        if self.running_exports:
+            self.title_label.setText("<b>{} ({}: {})</b>".format(__("Post-processing"), __("Exporting"), self.running_exports))
+        else:
+            self.title_label.setText("<b>{}</b>".format(__("Post-processing")))
@@ -2,19 +2,21 @@
 # -*- coding: utf-8 -*-
 """DesignSPHysics Dock Pre Processing Widget """
 
-from os import path, walk
+from os import path, walk, stat
+from sys import platform
+import json
 import shutil
-from traceback import print_exc
 
 # from PySide import QtCore, QtGui
 from PySide6 import QtCore, QtWidgets, QtGui
 
 from mod.translation_tools import __
 from mod.gui_tools import get_icon
-from mod.stdout_tools import error, debug
+from mod.stdout_tools import error, warning, debug
 from mod.dialog_tools import error_dialog, warning_dialog
-from mod.executable_tools import refocus_cwd, ensure_process_is_executable_or_fail
+from mod.executable_tools import refocus_cwd, ensure_process_is_executable_or_fail, get_executable_info_flag
 from mod.file_tools import save_case, load_case
+from mod.gencase_tools import GenCaseOutputParser, GenCaseCache
 from mod.freecad_tools import document_count, prompt_close_all_documents, create_dsph_document, create_dsph_document_from_fcstd, add_fillbox_objects
 from mod.freecad_tools import get_fc_main_window, valid_document_environment, save_current_freecad_document, get_fc_object
 
@@ -25,8 +27,10 @@ from mod.functions import has_special_char
 from mod.widgets.add_geo_dialog import AddGEODialog
 from mod.widgets.special_options_selector_dialog import SpecialOptionsSelectorDialog
 from mod.widgets.gencase_completed_dialog import GencaseCompletedDialog
+from mod.widgets.gencase_progress_dialog import GenCaseProgressDialog
 from mod.widgets.mode_2d_config_dialog import Mode2DConfigDialog
 from mod.widgets.case_summary import CaseSummary
+from mod.widgets.parameter_sweep_dialog import ParameterSweepDialog
 
 from mod.dataobjects.case import Case
 from mod.dataobjects.simulation_object import SimulationObject
@@ -46,6 +50,8 @@ class DockPreProcessingWidget(QtWidgets.QWidget):
     def __init__(self, parent=None):
         super().__init__(parent=parent)
 
+        self.gencase_process: QtCore.QProcess = None  # Running GenCase, if any
+
         self.main_layout = QtWidgets.QVBoxLayout()
         self.main_layout.setContentsMargins(0, 0, 0, 0)
 
@@ -83,6 +89,7 @@ class DockPreProcessingWidget(QtWidgets.QWidget):
         self.save_button.setIconSize(QtCore.QSize(28, 28))
         self.save_menu = QtWidgets.QMenu()
         self.save_menu.addAction(QtGui.QIcon.fromTheme("document-save-as", get_icon("save.png")), __("Save as..."))
+        self.save_menu.addAction(QtGui.QIcon.fromTheme("document-save-as", get_icon("save.png")), __("Generate parameter sweep..."))
         self.save_button.setMenu(self.save_menu)
 
         self.load_button = QtWidgets.QToolButton()
@@ -230,6 +237,10 @@ class DockPreProcessingWidget(QtWidgets.QWidget):
             warning_dialog(__("GenCase executable is not set."))
             return
 
+        if self.gencase_process is not None:
+            warning_dialog(__("GenCase is already running."))
+            return
+
         gencase_full_path = path.abspath(Case.the().executable_paths.gencase)
         arguments = ["{path}/{name}_Def".format(path=Case.the().path, name=Case.the().name),
                      "{path}/{name}_out/{name}".format(path=Case.the().path, name=Case.the().name),
@@ -248,39 +259,111 @@ class DockPreProcessingWidget(QtWidgets.QWidget):
                 # Remove some folders before execute GenCase
                 self.delete_sub_folder(dirout,"Vtk")
                 self.delete_root_folder(dirout)
-            
+
+        # Restore the outputs of a previous execution with the same inputs instead of running GenCase again
+        gencase_cache = GenCaseCache(Case.the().path)
+        cache_key = gencase_cache.compute_key("{}.xml".format(arguments[0]), arguments, self.get_gencase_version(gencase_full_path))
+        if cache_key and gencase_cache.has(cache_key):
+            debug("Restoring GenCase outputs from cache with key {}", cache_key)
+            output = gencase_cache.restore(cache_key, dirout)
+            output_parser = GenCaseOutputParser()
+            output_parser.feed(output.encode("utf-8"))
+            output_parser.finish()
+            self.on_gencase_succeeded(output_parser.get_total_particles(), output, cmd_string)
+            self.gencase_completed.emit(Case.the().info.is_gencase_done)
+            return
+        out_snapshot = GenCaseCache.snapshot_folder(dirout)
+
         refocus_cwd()
         process = QtCore.QProcess(get_fc_main_window())
         process.setWorkingDirectory(Case.the().path)
-        ensure_process_is_executable_or_fail(gencase_full_path)
-        process.start(gencase_full_path, arguments)
-        debug("Executing -> {}".format(cmd_string))
-        process.waitForFinished()
-
-        try:
-            output = str(process.readAllStandardOutput().data(), encoding='utf-8')
-        except UnicodeDecodeError:
-            output = str(process.readAllStandardOutput().data(), encoding='latin1')
-
-        if process.exitCode():
+        environment = QtCore.QProcessEnvironment.systemEnvironment()
+        if platform in ("linux", "linux2"):
+            environment.insert("LD_LIBRARY_PATH", path.dirname(gencase_full_path))
+        process.setProcessEnvironment(environment)
+        output_parser = GenCaseOutputParser()
+        progress_dialog = GenCaseProgressDialog(case_name=Case.the().name, cmd_string=cmd_string, parent=get_fc_main_window())
+        cancelled = [False]
+
+        def on_stdout_ready():
+            """ Streams the new output to the progress dialog and parses its summary fields. """
+            progress_dialog.append_output(output_parser.feed(process.readAllStandardOutput().data()))
+            progress_dialog.update_summary(output_parser.summary)
+
+        def on_cancel():
+            """ Kills GenCase. The finished handler takes care of the case state. """
+            cancelled[0] = True
+            process.kill()
+
+        def on_error(process_error):
+            """ Handles GenCase not being able to start, as the finished handler is not called then. """
+            if process_error != QtCore.QProcess.FailedToStart:
+                return
+            progress_dialog.accept()
+            self.gencase_process = None
             Case.the().info.is_gencase_done = False
-            error_dialog(__("Error executing GenCase. Did you add objects to the case?. Another reason could be memory issues. View details for more info."), output)
-        else:
-            try:
-                total_particles_text = output[output.index("Total particles: "):output.index(" (bound=")]
-                total_particles = int(total_particles_text[total_particles_text.index(": ") + 2:])
-                Case.the().info.particle_number = total_particles
-                GencaseCompletedDialog(particle_count=total_particles, detail_text=output, cmd_string=cmd_string, parent=get_fc_main_window()).show()
-                Case.the().info.is_gencase_done = True
-                self.on_save_case()
-                Case.the().info.needs_to_run_gencase = False
-            except ValueError:
-                print_exc()
+            error_dialog(__("Error on GenCase start. Check that the GenCase executable is correctly set."))
+            self.gencase_completed.emit(Case.the().info.is_gencase_done)
+
+        def on_gencase_finished(exit_code, _exit_status):
+            """ Checks the result of GenCase once it finishes. """
+            on_stdout_ready()
+            progress_dialog.append_output(output_parser.finish())
+            progress_dialog.accept()
+            self.gencase_process = None
+            output = output_parser.get_output()
+
+            if cancelled[0]:
                 Case.the().info.is_gencase_done = False
                 Case.the().info.needs_to_run_gencase = True
+            elif exit_code:
+                Case.the().info.is_gencase_done = False
+                error_dialog(__("Error executing GenCase. Did you add objects to the case?. Another reason could be memory issues. View details for more info."), output)
+            else:
+                total_particles = output_parser.get_total_particles()
+                if cache_key and total_particles is not None:
+                    # Stored before saving the case, as saving copies other files to the out folder
+                    try:
+                        gencase_cache.store(cache_key, dirout, out_snapshot, output)
+                    except OSError as ex:
+                        warning("Could not store the GenCase outputs on the cache: {}", ex)
+                self.on_gencase_succeeded(total_particles, output, cmd_string)
+
+            # Refresh widget enable/disable status as GenCase finishes
+            self.gencase_completed.emit(Case.the().info.is_gencase_done)
+
+        process.readyReadStandardOutput.connect(on_stdout_ready)
+        process.errorOccurred.connect(on_error)
+        process.finished.connect(on_gencase_finished)
+        progress_dialog.cancelled.connect(on_cancel)
 
-        # Refresh widget enable/disable status as GenCase finishes
-        self.gencase_completed.emit(Case.the().info.is_gencase_done)
+        ensure_process_is_executable_or_fail(gencase_full_path)
+        self.gencase_process = process
+        progress_dialog.show()
+        process.start(gencase_full_path, arguments)
+        debug("Executing -> {}", cmd_string)
+
+    def on_gencase_succeeded(self, total_particles: int, output: str, cmd_string: str) -> None:
+        """ Updates the case after GenCase finished correctly and shows its result. """
+        if total_particles is None:
+            error("GenCase finished without reporting the total particles")
+            Case.the().info.is_gencase_done = False
+            Case.the().info.needs_to_run_gencase = True
+            return
+        Case.the().info.particle_number = total_particles
+        GencaseCompletedDialog(particle_count=total_particles, detail_text=output, cmd_string=cmd_string, parent=get_fc_main_window()).show()
+        Case.the().info.is_gencase_done = True
+        self.on_save_case()
+        Case.the().info.needs_to_run_gencase = False
+
+    def get_gencase_version(self, gencase_path: str) -> str:
+        """ Returns a string identifying the GenCase executable, used to invalidate the GenCase cache when it changes. """
+        try:
+            return json.dumps(get_executable_info_flag(gencase_path), sort_keys=True)
+        except (ValueError, RuntimeError):
+            # Executables without -info support are identified by their file
+            executable_stat = stat(gencase_path)
+            return "{}:{}:{}".format(gencase_path, executable_stat.st_size, executable_stat.st_mtime_ns)
 
     def delete_sub_folder(self,output_folder,endwith):
         """ Deletes sub folders that end with a desired string. """
@@ -305,6 +388,16 @@ class DockPreProcessingWidget(QtWidgets.QWidget):
         """ Handles the save button and its dropdown items. """
         if __("Save as...") in action.text():
             self.on_save_case(save_as=True)
+        if __("Generate parameter sweep...") in action.text():
+            self.on_parameter_sweep()
+
+    def on_parameter_sweep(self):
+        """ Opens the parameter sweep dialog. The case has to be saved, as the variants share its files. """
+        if Case.the().was_not_saved():
+            self.on_save_case()
+        if Case.the().was_not_saved():
+            return
+        ParameterSweepDialog(parent=get_fc_main_window())
 
     def on_load_button(self):
         """ Defines load case button behaviour. This is made so errors can be detected and handled. """
@@ -346,7 +439,8 @@ class DockPreProcessingWidget(QtWidgets.QWidget):
         self.simulation_completed.emit(Case.the().info.is_simulation_done)
         self.need_refresh.emit()
 
-        Case.the().executable_paths.check_and_filter()
+        # Executables are checked in the background, so the case opens right away
+        Case.the().executable_paths.check_and_filter_in_background(parent=self)
         Case.the().info.update_last_used_directory(load_path)
 
     def on_add_fillbox(self):
@@ -3,6 +3,7 @@
 """DesignSPHysics Dock Execution Widget """
 
 import os
+from datetime import timedelta
 from sys import platform
 
 # from PySide import QtGui, QtCore
@@ -11,12 +12,16 @@ from PySide6 import QtCore, QtWidgets
 from mod.translation_tools import __
 from mod.gui_tools import get_icon
 from mod.freecad_tools import get_fc_main_window
-from mod.stdout_tools import log
+from mod.stdout_tools import log, warning
 from mod.dialog_tools import error_dialog, warning_dialog
 from mod.executable_tools import refocus_cwd, ensure_process_is_executable_or_fail
 from mod.file_tools import save_case
+from mod.run_out_tools import RunOutFollower
+from mod.progress_bus import ProgressBus
+from mod.simulation_queue import SimulationQueue
 
 from mod.dataobjects.case import Case
+from mod.dataobjects.simulation_job import SimulationJob
 
 from mod.widgets.run_dialog import RunDialog
 from mod.widgets.run_additional_parameters_dialog import RunAdditionalParametersDialog
@@ -53,6 +58,12 @@ class DockSimulationWidget(QtWidgets.QWidget):
         self.execute_button.setIconSize(QtCore.QSize(12, 12))
         self.execute_button.clicked.connect(self.on_ex_simulate)
 
+        # Queue case button
+        self.queue_button = QtWidgets.QPushButton(__("Add to queue"))
+        self.queue_button.setToolTip(__("Adds the case to the simulation queue, which runs\n"
+                                        "several cases in the background."))
+        self.queue_button.clicked.connect(self.on_add_to_queue)
+
         # Additional parameters button
         self.additional_parameters_button = QtWidgets.QPushButton(__("Additional parameters"))
         self.additional_parameters_button.setToolTip(__("Sets simulation additional parameters for execution."))
@@ -60,6 +71,7 @@ class DockSimulationWidget(QtWidgets.QWidget):
 
         self.button_layout = QtWidgets.QHBoxLayout()
         self.button_layout.addWidget(self.execute_button)
+        self.button_layout.addWidget(self.queue_button)
         self.button_layout.addWidget(self.device_selector)
         self.button_layout.addWidget(self.additional_parameters_button)
 
@@ -96,6 +108,8 @@ class DockSimulationWidget(QtWidgets.QWidget):
         Case.the().info.is_simulation_done = False
 
         run_fs_watcher = QtCore.QFileSystemWatcher()
+        run_out_follower = RunOutFollower(Case.the().path + "/" + Case.the().name + "_out/Run.out")
+        progress_bus = ProgressBus(parent=run_dialog)
 
         self.simulation_started.emit()
 
@@ -111,21 +125,25 @@ class DockSimulationWidget(QtWidgets.QWidget):
         run_dialog.cancelled.connect(on_cancel)
 
         # Launch simulation and watch filesystem to monitor simulation
-        filelist = [f for f in os.listdir(Case.the().path + "/" + Case.the().name + "_out/") if f.startswith("Part")]
+        # Parts and Run.out from a previous run would be mistaken for the output of this one
+        filelist = [f for f in os.listdir(Case.the().path + "/" + Case.the().name + "_out/") if f.startswith("Part") or f == "Run.out"]
         for f in filelist:
             os.remove(Case.the().path + "/" + Case.the().name + "_out/" + f)
 
         def on_dsph_sim_finished(exit_code):
             """ Simulation finish handler. Defines what happens when the process finishes."""
 
-            # Reads output from the .out file and completes the progress bar
-            output = ""
-            with open(Case.the().path + "/" + Case.the().name + "_out/Run.out", "r", encoding="utf-8") as run_file:
-                output = "".join(run_file.readlines())
-
-            run_dialog.set_detail_text(str(output))
+            # Reads the remaining output from the .out file and completes the progress bar
+            progress_bus.stop()
+            run_dialog.append_detail_text(run_out_follower.flush())
+            run_dialog.metrics_update(run_out_follower.progress)
             run_dialog.run_complete()
 
+            try:
+                run_out_follower.save_metrics_csv()
+            except OSError as ex:
+                warning(__("Could not save the simulation metrics: {}"), ex)
+
             run_fs_watcher.removePath(Case.the().path + "/" + Case.the().name + "_out/")
 
             if exit_code == 0:
@@ -136,10 +154,12 @@ class DockSimulationWidget(QtWidgets.QWidget):
             else:
                 # In case of an error
                 Case.the().info.needs_to_run_gencase = True
-                if "exception" in str(output).lower():
+                if run_out_follower.progress.exception_found:
                     log("There was an error on the execution. Opening an error dialog for that.")
                     run_dialog.hide()
                     self.simulation_complete.emit(False)
+                    with open(run_out_follower.run_out_path, "r", encoding="utf-8") as run_file:
+                        output = run_file.read()
                     error_dialog(__("An error occurred during execution. Make sure that parameters exist and are properly defined. "
                                     "You can also check your execution device (update the driver of your GPU). Read the details for more information."), str(output))
             if not save_case(Case.the().path, Case.the()):
@@ -154,48 +174,34 @@ class DockSimulationWidget(QtWidgets.QWidget):
             os.environ["LD_LIBRARY_PATH"] = os.path.dirname(Case.the().executable_paths.dsphysics)
         process.start(Case.the().executable_paths.dsphysics, final_params_ex)
 
-        def on_fs_change():
-            """ Executed each time the filesystem changes. This updates the percentage of the simulation and its details."""
-            run_file_data = ""
-            with open(Case.the().path + "/" + Case.the().name + "_out/Run.out", "r", encoding="utf-8") as run_file:
-                run_file_data = run_file.readlines()
+        def on_fs_change(changed_path):
+            """ Executed each time the filesystem changes. The change is coalesced with others by the progress bus. """
+            progress_bus.publish(changed_path=changed_path)
 
-            # Fill details window
-            run_dialog.set_detail_text("".join(run_file_data))
+        def on_progress_update(_state):
+            """ Executed at most once per progress bus window. This updates the percentage of the simulation and its details."""
+            # Append only the new lines to the details window
+            run_dialog.append_detail_text(run_out_follower.poll())
+            progress = run_out_follower.progress
 
             # Set percentage scale based on timemax
-            for l in run_file_data:
-                if Case.the().execution_parameters.timemax == -1:
-                    if "TimeMax=" in l:
-                        Case.the().execution_parameters.timemax = float(l.split("=")[1])
-
-            current_value: float = 0.0
-            totalpartsout: int = 0
-            last_estimated_time = None
-
-            # Update execution metrics
-            last_part_lines = list(filter(lambda x: "Part_" in x and "stored" not in x and "      " in x, run_file_data))
-            if last_part_lines:
-                current_value = (float(last_part_lines[-1].split(None)[1]) * float(100)) / float(Case.the().execution_parameters.timemax)
-            else:
-                current_value = None
+            if Case.the().execution_parameters.timemax == -1 and progress.timemax is not None:
+                Case.the().execution_parameters.timemax = progress.timemax
 
-            # Update particles out
-            last_particles_out_lines = list(filter(lambda x: "total out: " in x, run_file_data))
-            if last_particles_out_lines:
-                totalpartsout = int(last_particles_out_lines[-1].split("(total out: ")[1].split(")")[0])
-
-            try:
-                last_estimated_time = str(" ".join(last_part_lines[-1].split(None)[-2:]))
-            except IndexError:
-                last_estimated_time = None
+            # Prefer the ETA estimated from the recent throughput over the one printed on the last Part line
+            estimated_time: str = progress.estimated_time
+            estimated_seconds: float = progress.get_estimated_seconds(Case.the().execution_parameters.timemax)
+            if estimated_seconds is not None:
+                estimated_time = __("{} remaining").format(timedelta(seconds=int(estimated_seconds)))
 
             # Update run dialog
-            run_dialog.run_update(current_value, totalpartsout, last_estimated_time)
+            run_dialog.run_update(progress.get_percentage(Case.the().execution_parameters.timemax), progress.particles_out, estimated_time)
+            run_dialog.metrics_update(progress)
 
         # Set filesystem watcher to the out directory.
         run_fs_watcher.addPath(Case.the().path + "/" + Case.the().name + "_out/")
         run_fs_watcher.directoryChanged.connect(on_fs_change)
+        progress_bus.updated.connect(on_progress_update)
 
         # Handle error on simulation start
         if process.state() == QtCore.QProcess.NotRunning:
@@ -206,6 +212,24 @@ class DockSimulationWidget(QtWidgets.QWidget):
         else:
             run_dialog.show()
 
+    def on_add_to_queue(self):
+        """ Saves the case and adds it to the simulation queue with the selected device and additional parameters. """
+        if Case.the().info.needs_to_run_gencase:
+            warning_dialog(__("You should run GenCase again. Otherwise, the obtained results may not be as expected"))
+
+        if not save_case(Case.the().path, Case.the()):
+            return
+
+        job = SimulationJob(case_path=Case.the().path,
+                            case_name=Case.the().name,
+                            device=self.device_selector.currentText().lower(),
+                            additional_parameters=Case.the().info.run_additional_parameters,
+                            executable=Case.the().executable_paths.dsphysics)
+        if not SimulationQueue.the().add_job(job):
+            warning_dialog(__("This case is already waiting or running on the simulation queue."))
+            return
+        log("Added {} to the simulation queue", Case.the().name)
+
     def on_additional_parameters(self):
         """ Handles additional parameters button for execution """
         RunAdditionalParametersDialog(parent=get_fc_main_window())
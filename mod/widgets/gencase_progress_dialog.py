@@ -0,0 +1,73 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" DesignSPHysics GenCase Progress Dialog. """
+
+# from PySide import QtCore, QtGui
+from PySide6 import QtCore, QtWidgets, QtGui
+
+from mod.translation_tools import __
+from mod.gui_tools import h_line_generator
+
+
+class GenCaseProgressDialog(QtWidgets.QDialog):
+    """ Shows the output of a running GenCase process as it is generated and allows to cancel it. """
+
+    PARTICLES_TEMPLATE = __("Total particles: {}")
+
+    MIN_WIDTH = 600
+
+    cancelled = QtCore.Signal()
+
+    def __init__(self, case_name: str, cmd_string: str = "", parent=None):
+        super().__init__(parent=parent)
+
+        self.setModal(False)
+        self.setWindowTitle(__("Running GenCase"))
+        self.main_layout = QtWidgets.QVBoxLayout()
+
+        self.case_label = QtWidgets.QLabel(__("Case name: {}").format(case_name))
+        self.particles_label = QtWidgets.QLabel(self.PARTICLES_TEMPLATE.format(__("Calculating...")))
+
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setTextVisible(False)
+
+        self.output_text = QtWidgets.QPlainTextEdit()
+        self.output_text.setReadOnly(True)
+        if cmd_string:
+            self.output_text.setPlainText("{}: {}\n".format(__("The executed command line was"), cmd_string))
+
+        self.button_layout = QtWidgets.QHBoxLayout()
+        self.cancel_button = QtWidgets.QPushButton(__("Cancel GenCase"))
+        self.button_layout.addStretch(1)
+        self.button_layout.addWidget(self.cancel_button)
+
+        self.main_layout.addWidget(self.case_label)
+        self.main_layout.addWidget(self.particles_label)
+        self.main_layout.addWidget(self.progress_bar)
+        self.main_layout.addWidget(h_line_generator())
+        self.main_layout.addWidget(self.output_text)
+        self.main_layout.addLayout(self.button_layout)
+
+        self.cancel_button.clicked.connect(self.cancelled.emit)
+
+        self.setLayout(self.main_layout)
+        self.setMinimumWidth(self.MIN_WIDTH)
+
+    def append_output(self, text: str) -> None:
+        """ Appends text to the end of the output and scrolls it to the bottom. """
+        if not text:
+            return
+        self.output_text.moveCursor(QtGui.QTextCursor.End)
+        self.output_text.insertPlainText(text)
+        self.output_text.moveCursor(QtGui.QTextCursor.End)
+
+    def update_summary(self, summary: dict) -> None:
+        """ Shows the summary fields parsed from the output so far. """
+        if "total_particles" not in summary:
+            return
+        details: list = ["{}={}".format(field.replace("_particles", ""), summary[field]) for field in ("bound_particles", "fluid_particles") if field in summary]
+        particles: str = str(summary["total_particles"])
+        if details:
+            particles = "{} ({})".format(particles, ", ".join(details))
+        self.particles_label.setText(self.PARTICLES_TEMPLATE.format(particles))
@@ -12,14 +12,17 @@ from mod.enums import InformationDetailsMode
 
 
 class InformationDialog(QtWidgets.QDialog):
-    """ A resizable information report dialog  """
+    """ A resizable information report dialog.
+    The detailed text can be a callable returning it, only called if the details are shown. """
 
     MINIMUM_WIDTH = 500
     SHOW_DETAILS_TEXT = __("Show details")
     HIDE_DETAILS_TEXT = __("Hide details")
 
-    def __init__(self, title: str, message: str, detailed_text: str = None, details_lang=InformationDetailsMode.PLAIN):
+    def __init__(self, title: str, message: str, detailed_text=None, details_lang=InformationDetailsMode.PLAIN):
         super().__init__()
+        self.detailed_text = detailed_text
+        self.details_lang = details_lang
         self.main_layout = QtWidgets.QVBoxLayout()
 
         self.setWindowTitle(str(title))
@@ -37,13 +40,9 @@ class InformationDialog(QtWidgets.QDialog):
         self.button_layout.addWidget(self.ok_button)
 
         self.details_textarea = QtWidgets.QTextEdit()
-
-        if details_lang == InformationDetailsMode.PLAIN:
-            self.details_textarea.insertPlainText(str(detailed_text).replace("\\n", "\n"))
-        elif details_lang == InformationDetailsMode.HTML:
-            self.details_textarea.insertHtml(str(detailed_text).replace("\\n", "\n"))
-
         self.details_textarea.setReadOnly(True)
+        if not callable(detailed_text):
+            self.fill_details()
 
         self.details_widget_layout = QtWidgets.QVBoxLayout()
         self.details_widget_layout.setContentsMargins(0, 0, 0, 0)
@@ -65,8 +64,19 @@ class InformationDialog(QtWidgets.QDialog):
         self.setLayout(self.main_layout)
         self.exec_()
 
+    def fill_details(self) -> None:
+        """ Shows the detailed text on the details text area. """
+        detailed_text = self.detailed_text() if callable(self.detailed_text) else self.detailed_text
+        self.detailed_text = detailed_text
+        if self.details_lang == InformationDetailsMode.PLAIN:
+            self.details_textarea.insertPlainText(str(detailed_text).replace("\\n", "\n"))
+        elif self.details_lang == InformationDetailsMode.HTML:
+            self.details_textarea.insertHtml(str(detailed_text).replace("\\n", "\n"))
+
     def on_details_button(self) -> None:
         """ Reacts to the details button being pressed. """
+        if callable(self.detailed_text):
+            self.fill_details()
         self.details_widget.setVisible(not self.details_widget.isVisible())
         self.show_details_button.setText(self.HIDE_DETAILS_TEXT if self.details_widget.isVisible() else self.SHOW_DETAILS_TEXT)
         self.adjustSize()
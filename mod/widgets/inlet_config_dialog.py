@@ -191,7 +191,7 @@ class InletConfigDialog(QtWidgets.QDialog):
 
     def zone_edit(self, io_id):
         """ Calls a window for edit zones """
-        debug("Trying to open a zone edit for zone UUID {}".format(io_id))
+        debug("Trying to open a zone edit for zone UUID {}", io_id)
         InletZoneEdit(io_id, parent=get_fc_main_window())
         self.refresh_zones()
 
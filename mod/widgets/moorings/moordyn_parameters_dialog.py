@@ -369,11 +369,11 @@ class MoorDynParametersDialog(QtWidgets.QDialog):
 
     def _on_add_new_line(self):
         used_line_ids = list(map(lambda line: line.line_id, self.stored_configuration.lines))
-        debug("Line ids currently in use: {}".format(used_line_ids))
+        debug("Line ids currently in use: {}", used_line_ids)
         for i in range(0, 999):  # Note: I hope no one tries to create more lines...
             if i not in used_line_ids:
                 break
-        debug("Found this appropriate int for a new line id: {}".format(i))
+        debug("Found this appropriate int for a new line id: {}", i)
 
         new_line: MoorDynLine = MoorDynLine(i)
         self.stored_configuration.lines.append(new_line)
@@ -384,10 +384,10 @@ class MoorDynParametersDialog(QtWidgets.QDialog):
         self.lines_table.setCellWidget(self.lines_table.rowCount() - 1, 0, widget)
 
     def _on_delete_line(self, line_id):
-        debug("Deleting line {}".format(line_id))
-        debug("Lines before: {}".format(self.stored_configuration.lines))
+        debug("Deleting line {}", line_id)
+        debug("Lines before: {}", self.stored_configuration.lines)
         self.stored_configuration.lines = list(filter(lambda line: line.line_id != line_id, self.stored_configuration.lines))
-        debug("Lines after: {}".format(self.stored_configuration.lines))
+        debug("Lines after: {}", self.stored_configuration.lines)
 
         index_to_delete: int = 0
         for i in range(0, self.lines_table.rowCount()):
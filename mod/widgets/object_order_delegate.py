@@ -0,0 +1,79 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+"""DesignSPHysics Object Order delegate"""
+
+# from PySide import QtCore, QtGui
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from mod.gui_tools import get_icon
+
+from mod.widgets.object_order_model import ObjectOrderModel
+
+
+class ObjectOrderDelegate(QtWidgets.QStyledItemDelegate):
+    """ Paints a row of the object order list with its mk, name and up/down buttons,
+    and reorders the objects when the buttons are clicked. """
+
+    ROW_HEIGHT = 28
+    BUTTON_SIZE = 24
+    MARGIN = 10
+    SPACING = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.up_icon = get_icon("up_arrow.png")
+        self.down_icon = get_icon("down_arrow.png")
+
+    def get_button_rects(self, rect: QtCore.QRect) -> tuple:
+        """ Returns the rectangles for the up and down buttons of a row. """
+        top = rect.top() + (rect.height() - self.BUTTON_SIZE) // 2
+        down_rect = QtCore.QRect(rect.right() - self.MARGIN - self.BUTTON_SIZE, top, self.BUTTON_SIZE, self.BUTTON_SIZE)
+        up_rect = QtCore.QRect(down_rect.left() - self.SPACING - self.BUTTON_SIZE, top, self.BUTTON_SIZE, self.BUTTON_SIZE)
+        return up_rect, down_rect
+
+    def paint(self, painter, option, index):
+        """ Paints the mk, the object name and the up/down buttons for a row. """
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        style.drawPrimitive(QtWidgets.QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+
+        up_rect, down_rect = self.get_button_rects(option.rect)
+        text_rect = QtCore.QRect(option.rect.left() + self.MARGIN, option.rect.top(), up_rect.left() - option.rect.left() - self.MARGIN - self.SPACING, option.rect.height())
+
+        painter.save()
+        bold_font = QtGui.QFont(option.font)
+        bold_font.setBold(True)
+        mk_text = index.data(ObjectOrderModel.MK_ROLE)
+        painter.setFont(bold_font)
+        painter.drawText(text_rect, QtCore.Qt.AlignVCenter | QtCore.Qt.AlignLeft, mk_text)
+        mk_width = QtGui.QFontMetrics(bold_font).horizontalAdvance(mk_text) + self.MARGIN
+        painter.setFont(option.font)
+        name_rect = text_rect.adjusted(mk_width, 0, 0, 0)
+        painter.drawText(name_rect, QtCore.Qt.AlignVCenter | QtCore.Qt.AlignLeft, option.fontMetrics.elidedText(index.data(QtCore.Qt.DisplayRole), QtCore.Qt.ElideRight, name_rect.width()))
+        painter.restore()
+
+        last_row = index.model().rowCount() - 1
+        for button_rect, icon, enabled in ((up_rect, self.up_icon, index.row() > 0), (down_rect, self.down_icon, index.row() < last_row)):
+            button_option = QtWidgets.QStyleOptionButton()
+            button_option.rect = button_rect
+            button_option.icon = icon
+            button_option.iconSize = QtCore.QSize(self.BUTTON_SIZE - 8, self.BUTTON_SIZE - 8)
+            button_option.state = QtWidgets.QStyle.State_Enabled | QtWidgets.QStyle.State_Raised if enabled else QtWidgets.QStyle.State_None
+            style.drawControl(QtWidgets.QStyle.CE_PushButton, button_option, painter, option.widget)
+
+    def sizeHint(self, option, index):  # pylint: disable=invalid-name
+        """ Returns the size of a row. """
+        return QtCore.QSize(super().sizeHint(option, index).width(), self.ROW_HEIGHT)
+
+    def editorEvent(self, event, model, option, index):  # pylint: disable=invalid-name
+        """ Reorders the object if one of the buttons of the row is clicked. """
+        if event.type() != QtCore.QEvent.MouseButtonRelease or event.button() != QtCore.Qt.LeftButton:
+            return False
+        up_rect, down_rect = self.get_button_rects(option.rect)
+        position = event.position().toPoint()
+        if up_rect.contains(position):
+            model.move_row_up(index.row())
+            return True
+        if down_rect.contains(position):
+            model.move_row_down(index.row())
+            return True
+        return False
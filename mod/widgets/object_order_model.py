@@ -0,0 +1,116 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+"""DesignSPHysics Object Order model"""
+
+# from PySide import QtCore
+from PySide6 import QtCore
+
+from mod.translation_tools import __
+from mod.freecad_tools import get_fc_object
+
+from mod.constants import CASE_LIMITS_OBJ_NAME
+
+from mod.dataobjects.case import Case
+
+
+class ObjectOrderModel(QtCore.QAbstractTableModel):
+    """ A table model exposing the order of the objects in the simulation.
+    Rows are computed on demand, so only the rows that are painted query FreeCAD for their labels. """
+
+    MK_ROLE = QtCore.Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.rows: list = list()  # [SimulationObject]
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:  # pylint: disable=invalid-name
+        """ Returns the number of objects shown. """
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:  # pylint: disable=invalid-name
+        """ Returns the number of columns shown. """
+        return 0 if parent.isValid() else 1
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """ Returns the data to show for a row. """
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        sim_object = self.rows[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            fc_object = get_fc_object(sim_object.name)
+            return str(fc_object.Label) if fc_object else sim_object.name
+        if role == self.MK_ROLE:
+            return "{}{}".format(sim_object.type[0].upper(), str(sim_object.obj_mk))
+        if role == QtCore.Qt.ToolTipRole:
+            fc_object = get_fc_object(sim_object.name)
+            return "MK: {} ({})\n" \
+                   "Name: {}\n" \
+                   "{}".format(sim_object.obj_mk, sim_object.type.lower().title(), fc_object.Label if fc_object else sim_object.name, __("Press up or down to reorder."))
+        return None
+
+    def get_case_rows(self) -> list:
+        """ Returns the objects of the case that are shown in the list, in order. """
+        return [sim_object for sim_object in Case.the().objects if sim_object.name != CASE_LIMITS_OBJ_NAME]
+
+    def sync_with_case(self) -> None:
+        """ Updates the rows to match the objects in the case, notifying only the rows that were inserted or removed.
+        Changes that can not be expressed as insertions or removals reset the model. """
+        new_rows: list = self.get_case_rows()
+
+        if new_rows == self.rows:
+            pass
+        elif len(new_rows) > len(self.rows) and new_rows[:len(self.rows)] == self.rows:
+            self.beginInsertRows(QtCore.QModelIndex(), len(self.rows), len(new_rows) - 1)
+            self.rows = new_rows
+            self.endInsertRows()
+        else:
+            removed_runs: list = self.get_removed_runs(new_rows)
+            if removed_runs is None:
+                self.beginResetModel()
+                self.rows = new_rows
+                self.endResetModel()
+                return
+            # Remove from the end so the row numbers of the pending runs stay valid
+            for first, last in reversed(removed_runs):
+                self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+                del self.rows[first:last + 1]
+                self.endRemoveRows()
+
+        # Labels, mks and the first/last row state may have changed. Views only repaint the visible rows.
+        if self.rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.rows) - 1, 0))
+
+    def get_removed_runs(self, new_rows: list):
+        """ Returns the contiguous (first, last) row runs that have to be removed to obtain new_rows.
+        Returns None if new_rows is not the current rows with some of them removed. """
+        runs: list = list()
+        new_position = 0
+        for row, sim_object in enumerate(self.rows):
+            if new_position < len(new_rows) and new_rows[new_position] is sim_object:
+                new_position += 1
+                continue
+            if runs and runs[-1][1] == row - 1:
+                runs[-1] = (runs[-1][0], row)
+            else:
+                runs.append((row, row))
+        if new_position != len(new_rows):
+            return None
+        return runs
+
+    def move_row_up(self, row: int) -> None:
+        """ Moves the object in the given row one position up, notifying only the two affected rows. """
+        if not 1 <= row < len(self.rows):
+            return
+        self.beginMoveRows(QtCore.QModelIndex(), row, row, QtCore.QModelIndex(), row - 1)
+        Case.the().shift_object_up_in_order(row)
+        self.rows[row - 1], self.rows[row] = self.rows[row], self.rows[row - 1]
+        self.endMoveRows()
+
+    def move_row_down(self, row: int) -> None:
+        """ Moves the object in the given row one position down, notifying only the two affected rows. """
+        if not 0 <= row < len(self.rows) - 1:
+            return
+        self.beginMoveRows(QtCore.QModelIndex(), row, row, QtCore.QModelIndex(), row + 2)
+        Case.the().shift_object_down_in_order(row)
+        self.rows[row], self.rows[row + 1] = self.rows[row + 1], self.rows[row]
+        self.endMoveRows()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+"""DesignSPHysics Parameter Sweep Dialog"""
+
+# from PySide import QtCore, QtGui
+from PySide6 import QtCore, QtWidgets
+
+from mod.translation_tools import __
+from mod.dialog_tools import error_dialog, info_dialog
+from mod.file_tools import save_case
+from mod.freecad_tools import save_current_freecad_document
+from mod.sweep_tools import ParameterSweep
+
+from mod.dataobjects.case import Case
+
+
+class ParameterSweepDialog(QtWidgets.QDialog):
+    """ Generates variants of the current case for a grid or a Latin hypercube of field values. """
+
+    GRID_MODE = 0
+    LATIN_HYPERCUBE_MODE = 1
+
+    FIELD_COLUMN = 0
+    VALUES_COLUMN = 1
+    MINIMUM_COLUMN = 2
+    MAXIMUM_COLUMN = 3
+
+    MIN_WIDTH = 700
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+
+        self.setWindowTitle(__("Parameter sweep"))
+        self.setMinimumWidth(self.MIN_WIDTH)
+        self.main_layout = QtWidgets.QVBoxLayout()
+
+        self.help_label = QtWidgets.QLabel(__("Each row sets a case field, for example <i>execution_parameters.visco</i> or "
+                                              "<i>mkbasedproperties[11].movements[0].generator.wave_height</i>.<br/>"
+                                              "Grid sweeps use every combination of the comma separated values. "
+                                              "Latin hypercube sweeps sample each field between its minimum and maximum."))
+        self.help_label.setWordWrap(True)
+
+        self.mode_layout = QtWidgets.QHBoxLayout()
+        self.mode_selector = QtWidgets.QComboBox()
+        self.mode_selector.insertItems(0, [__("Grid"), __("Latin hypercube")])
+        self.samples_input = QtWidgets.QSpinBox()
+        self.samples_input.setRange(1, 100000)
+        self.samples_input.setValue(10)
+        self.seed_input = QtWidgets.QLineEdit()
+        self.seed_input.setPlaceholderText(__("Random"))
+        self.mode_layout.addWidget(QtWidgets.QLabel(__("Sweep type:")))
+        self.mode_layout.addWidget(self.mode_selector)
+        self.mode_layout.addWidget(QtWidgets.QLabel(__("Samples:")))
+        self.mode_layout.addWidget(self.samples_input)
+        self.mode_layout.addWidget(QtWidgets.QLabel(__("Seed:")))
+        self.mode_layout.addWidget(self.seed_input)
+        self.mode_layout.addStretch(1)
+
+        self.parameters_table = QtWidgets.QTableWidget(1, 4)
+        self.parameters_table.setHorizontalHeaderLabels([__("Field"), __("Values"), __("Minimum"), __("Maximum")])
+        self.parameters_table.verticalHeader().setVisible(False)
+        self.parameters_table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+
+        self.rows_layout = QtWidgets.QHBoxLayout()
+        self.add_row_button = QtWidgets.QPushButton(__("Add field"))
+        self.remove_row_button = QtWidgets.QPushButton(__("Remove field"))
+        self.rows_layout.addWidget(self.add_row_button)
+        self.rows_layout.addWidget(self.remove_row_button)
+        self.rows_layout.addStretch(1)
+
+        self.output_layout = QtWidgets.QHBoxLayout()
+        self.output_input = QtWidgets.QLineEdit("{}_sweep".format(Case.the().path))
+        self.output_browse_button = QtWidgets.QPushButton("...")
+        self.output_layout.addWidget(QtWidgets.QLabel(__("Output folder:")))
+        self.output_layout.addWidget(self.output_input)
+        self.output_layout.addWidget(self.output_browse_button)
+
+        self.button_layout = QtWidgets.QHBoxLayout()
+        self.generate_button = QtWidgets.QPushButton(__("Generate"))
+        self.cancel_button = QtWidgets.QPushButton(__("Cancel"))
+        self.button_layout.addStretch(1)
+        self.button_layout.addWidget(self.generate_button)
+        self.button_layout.addWidget(self.cancel_button)
+
+        self.main_layout.addWidget(self.help_label)
+        self.main_layout.addLayout(self.mode_layout)
+        self.main_layout.addWidget(self.parameters_table)
+        self.main_layout.addLayout(self.rows_layout)
+        self.main_layout.addLayout(self.output_layout)
+        self.main_layout.addLayout(self.button_layout)
+        self.setLayout(self.main_layout)
+
+        self.mode_selector.currentIndexChanged.connect(self.on_mode_change)
+        self.add_row_button.clicked.connect(lambda: self.parameters_table.insertRow(self.parameters_table.rowCount()))
+        self.remove_row_button.clicked.connect(lambda: self.parameters_table.removeRow(self.parameters_table.currentRow()))
+        self.output_browse_button.clicked.connect(self.on_browse)
+        self.generate_button.clicked.connect(self.on_generate)
+        self.cancel_button.clicked.connect(self.reject)
+
+        self.on_mode_change()
+        self.exec_()
+
+    def on_mode_change(self) -> None:
+        """ Shows the columns and inputs used by the selected sweep type. """
+        latin_hypercube: bool = self.mode_selector.currentIndex() == self.LATIN_HYPERCUBE_MODE
+        self.parameters_table.setColumnHidden(self.VALUES_COLUMN, latin_hypercube)
+        self.parameters_table.setColumnHidden(self.MINIMUM_COLUMN, not latin_hypercube)
+        self.parameters_table.setColumnHidden(self.MAXIMUM_COLUMN, not latin_hypercube)
+        self.samples_input.setEnabled(latin_hypercube)
+        self.seed_input.setEnabled(latin_hypercube)
+
+    def on_browse(self) -> None:
+        """ Selects the output folder. """
+        folder = QtWidgets.QFileDialog.getExistingDirectory(self, __("Select the output folder"), self.output_input.text())
+        if folder:
+            self.output_input.setText(folder)
+
+    def get_cell_text(self, row: int, column: int) -> str:
+        """ Returns the stripped text of a table cell. """
+        item = self.parameters_table.item(row, column)
+        return item.text().strip() if item else ""
+
+    def build_sweep(self) -> tuple:
+        """ Returns the sweep and its variants for the fields in the table. Raises ValueError with a message if they are not valid. """
+        sweep = ParameterSweep(Case.the())
+        latin_hypercube: bool = self.mode_selector.currentIndex() == self.LATIN_HYPERCUBE_MODE
+        for row in range(self.parameters_table.rowCount()):
+            field_path: str = self.get_cell_text(row, self.FIELD_COLUMN)
+            if not field_path:
+                continue
+            try:
+                if latin_hypercube:
+                    sweep.add_range_parameter(field_path, float(self.get_cell_text(row, self.MINIMUM_COLUMN)), float(self.get_cell_text(row, self.MAXIMUM_COLUMN)))
+                else:
+                    sweep.add_grid_parameter(field_path, [value.strip() for value in self.get_cell_text(row, self.VALUES_COLUMN).split(",") if value.strip()])
+            except (AttributeError, KeyError, IndexError, TypeError, ValueError) as ex:
+                raise ValueError(__("The field {} or its values are not valid: {}").format(field_path, ex))
+
+        if latin_hypercube:
+            if not sweep.range_parameters:
+                raise ValueError(__("There are no fields to sweep."))
+            seed_text: str = self.seed_input.text().strip()
+            return sweep, sweep.get_latin_hypercube_variants(self.samples_input.value(), int(seed_text) if seed_text.isdigit() else None)
+        if not sweep.grid_parameters:
+            raise ValueError(__("There are no fields to sweep."))
+        return sweep, sweep.get_grid_variants()
+
+    def on_generate(self) -> None:
+        """ Saves the current case and writes a case folder for each variant. """
+        output_folder: str = self.output_input.text().strip()
+        if not output_folder:
+            error_dialog(__("Select an output folder for the variants."))
+            return
+        try:
+            sweep, variants = self.build_sweep()
+        except ValueError as ex:
+            error_dialog(str(ex))
+            return
+
+        # The variants share the files of the saved case, so they have to be up to date
+        save_case(Case.the().path, Case.the())
+        save_current_freecad_document(Case.the().path)
+
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            variant_paths: list = sweep.write(output_folder, variants)
+        except (OSError, ValueError, TypeError) as ex:
+            error_dialog(__("There was an error writing the sweep variants."), str(ex))
+            return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+
+        info_dialog(__("{} cases were written to {}.").format(len(variant_paths), output_folder),
+                    __("The values used for each case are listed in {}.").format(ParameterSweep.MANIFEST_FILE_NAME))
+        self.accept()
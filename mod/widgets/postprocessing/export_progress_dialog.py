@@ -6,6 +6,7 @@
 from PySide6 import QtCore, QtWidgets
 
 from mod.translation_tools import __
+from mod.progress_bus import ProgressBus
 
 
 class ExportProgressDialog(QtWidgets.QDialog):
@@ -46,6 +47,10 @@ class ExportProgressDialog(QtWidgets.QDialog):
         self.set_range(self.minimum, self.maximum)
         self.set_value(self.minimum)
 
+        # Progress reported by the export process is shown at most once per bus window
+        self.progress_bus = ProgressBus(parent=self)
+        self.progress_bus.updated.connect(self.on_progress)
+
     def set_range(self, minimum: int, maximum: int) -> None:
         """ Sets the range of the progress bar within the dialog. """
         self.export_progbar_bar.setRange(minimum, maximum)
@@ -62,3 +67,16 @@ class ExportProgressDialog(QtWidgets.QDialog):
         """ Updates the dialog with new data. """
         self.set_value(current)
         self.setWindowTitle("{export_text} {current}/{total}".format(export_text=__("Exporting:"), current=current, total=self.maximum))
+
+    def publish_progress(self, current) -> None:
+        """ Reports the current part. The dialog is updated once the progress bus window ends. """
+        self.progress_bus.publish(current=current)
+
+    def on_progress(self, state: dict) -> None:
+        """ Updates the dialog with the latest state coalesced by the progress bus. """
+        self.update_data(state["current"])
+
+    def done(self, result) -> None:
+        """ Discards pending progress when the dialog is closed. """
+        self.progress_bus.stop()
+        super().done(result)
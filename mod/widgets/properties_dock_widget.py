@@ -210,25 +210,31 @@ class PropertiesDockWidget(QtWidgets.QDockWidget):
             selection = list()
             selection.append(FreeCAD.ActiveDocument.getObject(name))
 
+        # Each object takes the first MK not used by the case nor by the objects before it in the selection
+        new_objects: list = list()
+        new_names: set = set()
+        reserved_mks: dict = {ObjectType.FLUID: set(), ObjectType.BOUND: set()}
         for each in selection:
             if each.Name == "Case_Limits" or "_internal_" in each.Name or each.InList:
                 continue
-            if not Case.the().is_object_in_simulation(each.Name):
-                if "fillbox" in each.Name.lower():
-                    mktoput = Case.the().get_first_mk_not_used(ObjectType.FLUID)
-                    Case.the().add_object(SimulationObject(each.Name, mktoput, ObjectType.FLUID, ObjectFillMode.SOLID))
-                else:
-                    mktoput = Case.the().get_first_mk_not_used(ObjectType.BOUND)
-                    Case.the().add_object(SimulationObject(each.Name, mktoput, ObjectType.BOUND, ObjectFillMode.FULL))
+            if Case.the().is_object_in_simulation(each.Name) or each.Name in new_names:
+                continue
+            new_names.add(each.Name)
+            if "fillbox" in each.Name.lower():
+                mktoput = Case.the().get_first_mk_not_used(ObjectType.FLUID, reserved_mks[ObjectType.FLUID])
+                reserved_mks[ObjectType.FLUID].add(mktoput)
+                new_objects.append(SimulationObject(each.Name, mktoput, ObjectType.FLUID, ObjectFillMode.SOLID))
+            else:
+                mktoput = Case.the().get_first_mk_not_used(ObjectType.BOUND, reserved_mks[ObjectType.BOUND])
+                reserved_mks[ObjectType.BOUND].add(mktoput)
+                new_objects.append(SimulationObject(each.Name, mktoput, ObjectType.BOUND, ObjectFillMode.FULL))
+        Case.the().add_objects(new_objects)
 
         self.need_refresh.emit()
 
     def on_remove_object_from_sim(self):
         """ Defines what happens when pressing the remove objects from simulation button. """
-        for each in FreeCADGui.Selection.getSelection():
-            if each.Name == "Case_Limits":
-                continue
-            Case.the().remove_object(each.Name)
+        Case.the().remove_objects([each.Name for each in FreeCADGui.Selection.getSelection() if each.Name != "Case_Limits"])
 
         self.need_refresh.emit()
 
@@ -242,7 +248,7 @@ class PropertiesDockWidget(QtWidgets.QDockWidget):
         old_value: int = self.last_mk_value
 
         # First we do what the user want
-        Case.the().get_simulation_object(FreeCADGui.Selection.getSelection()[0].Name).obj_mk = new_value
+        Case.the().set_object_mk(Case.the().get_simulation_object(FreeCADGui.Selection.getSelection()[0].Name), new_value)
         self.last_mk_value = new_value
 
         # Then we check that it is sensible
@@ -250,7 +256,7 @@ class PropertiesDockWidget(QtWidgets.QDockWidget):
         if orphan_mkbasedproperties:
             response = ok_cancel_dialog(__("Changing MK value"), __("By doing this you will loose all MK configuration for the previous MK: {}. Are you sure you want to do this?").format(old_value))
             if response == QtWidgets.QMessageBox.Ok:
-                debug("Changing from mk {} to {} caused orphan mkbasedproperties. Deleting...".format(old_value, new_value))
+                debug("Changing from mk {} to {} caused orphan mkbasedproperties. Deleting...", old_value, new_value)
                 Case.the().delete_orphan_mkbasedproperties()
             else:
                 self.mkgroup_prop.setValue(old_value)
@@ -296,7 +302,7 @@ class PropertiesDockWidget(QtWidgets.QDockWidget):
             self.set_mkgroup_text("{} <a href='{}'>?</a>".format(__("MKFluid"), HelpURL.BASIC_CONCEPTS))
 
         # Update simulation object type
-        simulation_object.type = ObjectType.FLUID if index == 0 else ObjectType.BOUND
+        Case.the().set_object_type(simulation_object, ObjectType.FLUID if index == 0 else ObjectType.BOUND)
         self.last_mk_value = int(self.mkgroup_prop.value())
 
         self.need_refresh.emit()
@@ -474,18 +480,18 @@ class PropertiesDockWidget(QtWidgets.QDockWidget):
         self.autofill_prop.setChecked(bool(sim_object.autofill))
         self.frdrawmode_prop.setChecked(bool(sim_object.frdrawmode))
 
-        debug("Object {} supports changing type? {}. Its type is {} with mk {}".format(sim_object.name, sim_object.supports_changing_type(), sim_object.type, sim_object.obj_mk))
+        debug("Object {} supports changing type? {}. Its type is {} with mk {}", sim_object.name, sim_object.supports_changing_type(), sim_object.type, sim_object.obj_mk)
 
         # Object Type selector adaptation
         if sim_object.supports_changing_type():
-            debug("Changing objtype_prop to {} in PropertiesDockWidget.adapt_to_simulation_object".format("Fluid" if sim_object.type == ObjectType.FLUID else "Bound"))
+            debug("Changing objtype_prop to {} in PropertiesDockWidget.adapt_to_simulation_object", "Fluid" if sim_object.type == ObjectType.FLUID else "Bound")
             self.objtype_prop.setEnabled(True)
             self.objtype_prop.setCurrentIndex(0 if sim_object.type == ObjectType.FLUID else 1)
             self.set_mkgroup_range(sim_object.type)
             self.set_mkgroup_text("{} <a href='{}'>?</a>".format(__("MKFluid" if sim_object.type == ObjectType.FLUID else "MKBound"), HelpURL.BASIC_CONCEPTS))
         else:
             # Everything else
-            debug("Changing objtype_prop to {} in PropertiesDockWidget.adapt_to_simulation_object".format("Fluid" if sim_object.type == ObjectType.FLUID else "Bound"))
+            debug("Changing objtype_prop to {} in PropertiesDockWidget.adapt_to_simulation_object", "Fluid" if sim_object.type == ObjectType.FLUID else "Bound")
             self.set_mkgroup_range(ObjectType.BOUND)
             self.objtype_prop.setCurrentIndex(1)
             self.objtype_prop.setEnabled(False)
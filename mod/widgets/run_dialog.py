@@ -10,6 +10,8 @@ from mod.constants import LINE_END
 from mod.dialog_tools import warning_dialog
 from mod.gui_tools import h_line_generator
 
+from mod.dataobjects.run_progress import RunProgress
+
 
 class RunDialog(QtWidgets.QDialog):
     """ Defines run window dialog """
@@ -17,6 +19,12 @@ class RunDialog(QtWidgets.QDialog):
     WINDOW_TITLE_TEMPLATE = __("DualSPHysics Simulation: {}%")
     PARTICLES_OUT_TEMPLATE = __("Total particles out: {}")
     ETA_TEMPLATE = __("Estimated time to complete simulation: {}")
+    THROUGHPUT_TEMPLATE = __("Throughput: {} steps/s")
+    PART_CADENCE_TEMPLATE = __("Part stored every: {} s")
+    # (RunMetricsSample CSV field, column header) of the metrics table
+    METRICS_COLUMNS = (("part", __("Part")), ("sim_time", __("Sim. time (s)")), ("wall_time", __("Wall time (s)")),
+                       ("total_steps", __("Total steps")), ("steps_per_second", __("Steps/s")),
+                       ("particles_out", __("Particles out")), ("part_interval", __("Part interval (s)")))
 
     MIN_WIDTH = 600
 
@@ -42,6 +50,8 @@ class RunDialog(QtWidgets.QDialog):
         self.run_group_label_partsout = QtWidgets.QLabel(self.PARTICLES_OUT_TEMPLATE.format(0))
         self.run_group_label_eta = QtWidgets.QLabel(self)
         self.run_group_label_eta.setText(self.ETA_TEMPLATE.format("Calculating..."))
+        self.run_group_label_throughput = QtWidgets.QLabel(self.THROUGHPUT_TEMPLATE.format("-"))
+        self.run_group_label_cadence = QtWidgets.QLabel(self.PART_CADENCE_TEMPLATE.format("-"))
         self.run_group_label_completed = QtWidgets.QLabel("<b>{}</b>".format(__("Simulation is complete.")))
         self.run_group_label_completed.setVisible(False)
 
@@ -50,6 +60,8 @@ class RunDialog(QtWidgets.QDialog):
         self.run_group_layout.addWidget(self.run_group_label_part)
         self.run_group_layout.addWidget(self.run_group_label_partsout)
         self.run_group_layout.addWidget(self.run_group_label_eta)
+        self.run_group_layout.addWidget(self.run_group_label_throughput)
+        self.run_group_layout.addWidget(self.run_group_label_cadence)
         self.run_group_layout.addWidget(self.run_group_label_completed)
         self.run_group_layout.addStretch(1)
 
@@ -81,8 +93,16 @@ class RunDialog(QtWidgets.QDialog):
 
         self.run_details_text = QtWidgets.QTextEdit()
         self.run_details_text.setReadOnly(True)
+        self.run_details_metrics = QtWidgets.QTableWidget(0, len(self.METRICS_COLUMNS))
+        self.run_details_metrics.setHorizontalHeaderLabels([header for _, header in self.METRICS_COLUMNS])
+        self.run_details_metrics.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.run_details_metrics.verticalHeader().setVisible(False)
+        self.run_details_metrics.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+        self.run_details_tabs = QtWidgets.QTabWidget()
+        self.run_details_tabs.addTab(self.run_details_text, __("Output"))
+        self.run_details_tabs.addTab(self.run_details_metrics, __("Metrics"))
         self.run_details_layout.addWidget(h_line_generator())
-        self.run_details_layout.addWidget(self.run_details_text)
+        self.run_details_layout.addWidget(self.run_details_tabs)
         self.run_details.hide()
 
         self.run_button_cancel.clicked.connect(self.cancelled.emit)
@@ -117,6 +137,25 @@ class RunDialog(QtWidgets.QDialog):
         if estimated_time:
             self.run_group_label_eta.setText(self.ETA_TEMPLATE.format(estimated_time))
 
+    def metrics_update(self, progress: RunProgress) -> None:
+        """ Updates the throughput information and appends the new samples of the timeline to the metrics table. """
+        steps_per_second: float = progress.get_steps_per_second()
+        if steps_per_second is not None:
+            self.run_group_label_throughput.setText(self.THROUGHPUT_TEMPLATE.format("{0:.1f}".format(steps_per_second)))
+        part_cadence: float = progress.get_part_cadence()
+        if part_cadence is not None:
+            self.run_group_label_cadence.setText(self.PART_CADENCE_TEMPLATE.format("{0:.1f}".format(part_cadence)))
+
+        # The last row is refreshed too, as its particles out are reported after its Part line
+        first_row: int = max(0, self.run_details_metrics.rowCount() - 1)
+        self.run_details_metrics.setRowCount(len(progress.timeline))
+        for row in range(first_row, len(progress.timeline)):
+            values: dict = progress.timeline[row].to_csv_dict()
+            for column, (field, _) in enumerate(self.METRICS_COLUMNS):
+                self.run_details_metrics.setItem(row, column, QtWidgets.QTableWidgetItem(str(values[field])))
+        if len(progress.timeline) > first_row + 1:
+            self.run_details_metrics.scrollToBottom()
+
     def run_complete(self) -> None:
         """ Modifies the dialog accordingly with a complete simulation. """
         self.setWindowTitle(__("DualSPHysics Simulation: Complete"))
@@ -150,3 +189,11 @@ class RunDialog(QtWidgets.QDialog):
         """ Sets the details text contents and scrolls it to the bottom. """
         self.run_details_text.setPlainText(details.replace("\\n", "\n"))
         self.run_details_text.moveCursor(QtGui.QTextCursor.End)
+
+    def append_detail_text(self, details: str) -> None:
+        """ Appends text to the end of the details contents and scrolls it to the bottom. """
+        if not details:
+            return
+        self.run_details_text.moveCursor(QtGui.QTextCursor.End)
+        self.run_details_text.insertPlainText(details.replace("\\n", "\n"))
+        self.run_details_text.moveCursor(QtGui.QTextCursor.End)
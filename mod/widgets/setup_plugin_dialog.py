@@ -6,7 +6,7 @@
 from PySide6 import QtWidgets
 
 from mod.translation_tools import __
-from mod.executable_tools import executable_contains_string
+from mod.executable_tools import executable_contains_string, ExecutableProbe
 from mod.dialog_tools import error_dialog
 from mod.file_tools import get_default_config_file
 
@@ -189,8 +189,27 @@ class SetupPluginDialog(QtWidgets.QDialog):
         self.executables_layout.addLayout(self.flowtool_layout)
         self.executables_layout.addLayout(self.bathymetrytool_layout)
         self.executables_layout.addLayout(self.paraview_layout)
+        self.pending_label = QtWidgets.QLabel()
+        self.pending_label.setWordWrap(True)
+        self.executables_layout.addWidget(self.pending_label)
         self.executables_layout.addStretch(1)
 
+        # Executables still being checked in the background are shown as pending
+        self.executable_inputs = {
+            "GenCase": self.gencasepath_input,
+            "DualSPHysics": self.dsphpath_input,
+            "PartVTK": self.partvtkpath_input,
+            "ComputeForces": self.computeforces_input,
+            "FloatingInfo": self.floatinginfo_input,
+            "MeasureTool": self.measuretool_input,
+            "IsoSurface": self.isosurface_input,
+            "BoundaryVTK": self.boundaryvtk_input,
+            "FlowTool": self.flowtool_input,
+            "BathymetryTool": self.bathymetrytool_input
+        }
+        ExecutableProbe.the().probed.connect(self.update_pending_executables)
+        self.update_pending_executables()
+
         # General settings
         self.settings_layout = QtWidgets.QFormLayout()
 
@@ -237,6 +256,18 @@ class SetupPluginDialog(QtWidgets.QDialog):
         self.resize(600, 400)
         self.exec_()
 
+    def update_pending_executables(self, _executable: str = None) -> None:
+        """ Marks the executables that are still being checked. """
+        pending: list = list()
+        for name, executable_input in self.executable_inputs.items():
+            is_pending: bool = ExecutableProbe.the().is_pending(executable_input.text())
+            executable_input.setToolTip(__("Checking this executable...") if is_pending else "")
+            executable_input.setStyleSheet("font-style: italic;" if is_pending else "")
+            if is_pending:
+                pending.append(name)
+        self.pending_label.setText(__("Still checking: {}").format(", ".join(pending)) if pending else "")
+        self.pending_label.setVisible(bool(pending))
+
     def on_ok(self):
         """ Dumps the data from the dialog onto the main case data structure. """
         Case.the().executable_paths.gencase = self.gencasepath_input.text()
@@ -296,6 +327,8 @@ class SetupPluginDialog(QtWidgets.QDialog):
         if not file_name:
             return
 
+        # Selecting an executable again retries it if its previous probe failed
+        ExecutableProbe.the().probe([file_name], wait=True)
         if executable_contains_string(file_name, app_name):
             input_prop.setText(file_name)
         else:
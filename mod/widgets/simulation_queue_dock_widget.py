@@ -0,0 +1,140 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+"""DesignSPHysics Simulation Queue Widget."""
+
+import os
+from datetime import timedelta
+
+# from PySide import QtCore, QtGui
+from PySide6 import QtCore, QtWidgets
+
+from mod.translation_tools import __
+from mod.constants import QUEUE_WIDGET_INTERNAL_NAME
+from mod.enums import JobStatus
+from mod.simulation_queue import SimulationQueue
+
+from mod.dataobjects.simulation_job import SimulationJob
+
+
+class SimulationQueueDockWidget(QtWidgets.QDockWidget):
+    """ DesignSPHysics simulation queue monitor. Shows every queued job and its progress. """
+
+    COLUMNS = [__("Case"), __("Device"), __("Status"), __("Progress"), __("Time left")]
+    STATUS_TEXTS = {JobStatus.QUEUED: __("Queued"),
+                    JobStatus.RUNNING: __("Running"),
+                    JobStatus.FINISHED: __("Finished"),
+                    JobStatus.FAILED: __("Failed"),
+                    JobStatus.CANCELLED: __("Cancelled")}
+
+    MIN_HEIGHT = 160
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+
+        self.setObjectName(QUEUE_WIDGET_INTERNAL_NAME)
+        self.setWindowTitle(__("DSPH Simulation Queue"))
+
+        self.queue = SimulationQueue.the()
+
+        self.scaff_widget = QtWidgets.QWidget()
+        self.main_layout = QtWidgets.QVBoxLayout()
+
+        self.jobs_table = QtWidgets.QTableWidget(0, len(self.COLUMNS))
+        self.jobs_table.setMinimumHeight(self.MIN_HEIGHT)
+        self.jobs_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+        self.jobs_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.jobs_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+
+        self.limits_layout = QtWidgets.QHBoxLayout()
+        self.max_cpu_jobs_input = QtWidgets.QSpinBox()
+        self.max_cpu_jobs_input.setRange(1, os.cpu_count() or 1)
+        self.max_cpu_jobs_input.setValue(self.queue.max_cpu_jobs)
+        self.max_gpu_jobs_input = QtWidgets.QSpinBox()
+        self.max_gpu_jobs_input.setRange(1, 16)
+        self.max_gpu_jobs_input.setValue(self.queue.max_gpu_jobs)
+        self.cpu_threads_input = QtWidgets.QSpinBox()
+        self.cpu_threads_input.setRange(0, os.cpu_count() or 1)
+        self.cpu_threads_input.setSpecialValueText(__("All"))
+        self.cpu_threads_input.setValue(self.queue.cpu_threads_per_job)
+        self.cpu_threads_input.setToolTip(__("Threads for each CPU job. Each job is pinned to its own range of cores."))
+        self.limits_layout.addWidget(QtWidgets.QLabel(__("CPU jobs:")))
+        self.limits_layout.addWidget(self.max_cpu_jobs_input)
+        self.limits_layout.addWidget(QtWidgets.QLabel(__("Threads per CPU job:")))
+        self.limits_layout.addWidget(self.cpu_threads_input)
+        self.limits_layout.addWidget(QtWidgets.QLabel(__("GPU jobs:")))
+        self.limits_layout.addWidget(self.max_gpu_jobs_input)
+        self.limits_layout.addStretch(1)
+
+        self.button_layout = QtWidgets.QHBoxLayout()
+        self.cancel_button = QtWidgets.QPushButton(__("Cancel"))
+        self.remove_button = QtWidgets.QPushButton(__("Remove"))
+        self.clear_button = QtWidgets.QPushButton(__("Clear ended"))
+        self.button_layout.addStretch(1)
+        self.button_layout.addWidget(self.cancel_button)
+        self.button_layout.addWidget(self.remove_button)
+        self.button_layout.addWidget(self.clear_button)
+
+        self.main_layout.addWidget(self.jobs_table)
+        self.main_layout.addLayout(self.limits_layout)
+        self.main_layout.addLayout(self.button_layout)
+        self.scaff_widget.setLayout(self.main_layout)
+        self.setWidget(self.scaff_widget)
+
+        self.max_cpu_jobs_input.valueChanged.connect(self.on_limits_changed)
+        self.max_gpu_jobs_input.valueChanged.connect(self.on_limits_changed)
+        self.cpu_threads_input.valueChanged.connect(self.on_limits_changed)
+        self.cancel_button.clicked.connect(self.on_cancel)
+        self.remove_button.clicked.connect(self.on_remove)
+        self.clear_button.clicked.connect(self.queue.remove_inactive_jobs)
+        self.queue.queue_changed.connect(self.refresh)
+        self.queue.job_updated.connect(self.on_job_updated)
+
+        self.refresh()
+        # Jobs restored from disk are started once the monitor exists to show them
+        self.queue.schedule()
+
+    def refresh(self) -> None:
+        """ Rebuilds the table with every job in the queue. """
+        self.jobs_table.setRowCount(len(self.queue.jobs))
+        for row, job in enumerate(self.queue.jobs):
+            self.update_row(row, job)
+
+    def on_job_updated(self, job_id: str) -> None:
+        """ Updates the row of a single job. """
+        for row, job in enumerate(self.queue.jobs):
+            if job.job_id == job_id:
+                self.update_row(row, job)
+                return
+
+    def update_row(self, row: int, job: SimulationJob) -> None:
+        """ Shows the information of a job on a row. """
+        progress: str = "" if job.percentage is None else "{0:.1f}%".format(job.percentage)
+        time_left: str = "" if job.estimated_seconds is None else str(timedelta(seconds=int(job.estimated_seconds)))
+        values: list = [job.case_name, job.device.upper(), self.STATUS_TEXTS.get(job.status, job.status), progress, time_left]
+        for column, value in enumerate(values):
+            item = QtWidgets.QTableWidgetItem(value)
+            if column == 0:
+                item.setData(QtCore.Qt.UserRole, job.job_id)
+                item.setToolTip(job.case_path)
+            self.jobs_table.setItem(row, column, item)
+
+    def get_selected_job_ids(self) -> list:
+        """ Returns the ids of the jobs on the selected rows. """
+        rows: set = {index.row() for index in self.jobs_table.selectedIndexes()}
+        return [self.jobs_table.item(row, 0).data(QtCore.Qt.UserRole) for row in sorted(rows)]
+
+    def on_limits_changed(self) -> None:
+        """ Applies the concurrency limits. """
+        self.queue.set_limits(self.max_cpu_jobs_input.value(), self.max_gpu_jobs_input.value(), self.cpu_threads_input.value())
+
+    def on_cancel(self) -> None:
+        """ Cancels the selected jobs. """
+        for job_id in self.get_selected_job_ids():
+            self.queue.cancel_job(job_id)
+
+    def on_remove(self) -> None:
+        """ Removes the selected jobs that are not running. """
+        for job_id in self.get_selected_job_ids():
+            self.queue.remove_job(job_id)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+""" Case to dictionary adapter.
+
+Transforms a Case and its data objects into the dictionary structure used to format
+the GenCase XML and other templates.
+"""
+
+from mod.dataobjects.change_tracked import ChangeTracked
+
+
+class CaseAdapter():
+    """ Converts data objects to dictionaries using a per-class field list.
+    Booleans can be transformed to GenCase strings in the same pass, and the result of
+    unchanged ChangeTracked objects is reused between conversions. """
+
+    SCALAR_TYPES = (str, int, float, type(None))
+
+    # {data object class: (public and private attribute names seen, public field names)}
+    class_fields: dict = dict()
+
+    # {id(data object): (data object, converted dictionary)}
+    memo: dict = dict()
+
+    @classmethod
+    def get_fields(cls, obj) -> tuple:
+        """ Returns the public field names for a data object, computing them once per class and attribute set. """
+        obj_dict: dict = obj.__dict__
+        cached = cls.class_fields.get(type(obj), None)
+        if cached is not None and obj_dict.keys() == cached[0]:
+            return cached[1]
+        fields = tuple(key for key, value in obj_dict.items() if not key.startswith("_") and not callable(value))
+        cls.class_fields[type(obj)] = (frozenset(obj_dict.keys()), fields)
+        return fields
+
+    @classmethod
+    def is_clean(cls, obj: ChangeTracked) -> bool:
+        """ Returns whether a tracked object and everything it contains is unchanged since its last conversion. """
+        if obj.is_changed():
+            return False
+        for field in cls.get_fields(obj):
+            value = getattr(obj, field)
+            if type(value) in cls.SCALAR_TYPES or isinstance(value, bool):
+                continue
+            if not isinstance(value, ChangeTracked) or not cls.is_clean(value):
+                return False
+        return True
+
+    @classmethod
+    def adapt(cls, value, bools_to_strs: bool, memo=None):
+        """ Converts a value to its dictionary representation. """
+        value_type = type(value)
+        if value_type is bool:
+            if bools_to_strs:
+                return "true" if value else "false"
+            return value
+        if value_type in cls.SCALAR_TYPES:
+            return value
+        if value_type is dict:
+            return {key: cls.adapt(item, bools_to_strs, memo) for key, item in value.items()}
+        if value_type is list or value_type is tuple:
+            return [cls.adapt(item, bools_to_strs, memo) for item in value]
+        if hasattr(value, "_ast"):
+            return cls.adapt(value._ast(), bools_to_strs, memo)  # pylint: disable=protected-access
+        if hasattr(value, "__iter__"):
+            return [cls.adapt(item, bools_to_strs, memo) for item in value]
+        if hasattr(value, "__dict__"):
+            return cls.adapt_object(value, bools_to_strs, memo)
+        return value
+
+    @classmethod
+    def adapt_object(cls, obj, bools_to_strs: bool, memo=None) -> dict:
+        """ Converts a data object to a dictionary, reusing the previous result for unchanged tracked objects. """
+        tracked = memo is not None and isinstance(obj, ChangeTracked)
+        if tracked:
+            previous = cls.memo.get(id(obj), None)
+            if previous is not None and previous[0] is obj and cls.is_clean(obj):
+                memo[id(obj)] = previous
+                return previous[1]
+
+        data = {field: cls.adapt(getattr(obj, field), bools_to_strs, memo) for field in cls.get_fields(obj)}
+
+        if tracked:
+            memo[id(obj)] = (obj, data)
+            obj.mark_clean()
+        return data
+
+    @classmethod
+    def adapt_case_for_xml(cls, case: "Case") -> dict:
+        """ Returns the case as a dictionary with booleans transformed to GenCase strings.
+        Only the objects present in this conversion are kept for the next one. """
+        memo: dict = dict()
+        data: dict = cls.adapt_object(case, True, memo)
+        cls.memo = memo
+        return data
+
+    @classmethod
+    def adapt_case(cls, case: "Case") -> dict:
+        """ Returns the case as a dictionary keeping the original value types. """
+        return cls.adapt_object(case, False)
@@ -6,12 +6,16 @@ The utilities on this module creates
 """
 
 import os
+import re
 from datetime import datetime
+from string import Formatter
 
 from mod.stdout_tools import debug
 
 from mod.constants import APP_NAME, LINE_END
-from mod.template_tools import obj_to_dict, get_template_text
+from mod.template_tools import get_template_text, TemplateRegistry
+
+from mod.xml.case_adapter import CaseAdapter
 
 from mod.xml.renderers.definition_renderer import DefinitionRenderer
 from mod.xml.renderers.objects_renderer import ObjectsRenderer
@@ -40,54 +44,121 @@ class XMLExporter():
     PROPERTY_MATERIALS_XML = "/templates/gencase/materials/property.xml"
     GENCASE_XML_SUFFIX = "_Def.xml"
     MATERIAL_FILE_NAME = "materials.xml"
-
-    def __init__(self):
+    BLANK_LINES_REGEX = re.compile("\n{2,}")
+
+    # Data keys each section of the XML depends on, in rendering order.
+    # Sections mapped to None read geometry from the FreeCAD document and are always rendered.
+    SECTION_DEPENDENCIES = (
+        ("definition_template", None),
+        ("objects_template", None),
+        ("simulationdomain_template", ("domain",)),
+        ("periodicity_template", ("mode3d", "periodicity")),
+        ("initials_template", ("mkbasedproperties",)),
+        ("floatings_template", ("mkbasedproperties",)),
+        ("rzones_template", ("relaxation_zone",)),
+        ("accinput_template", ("acceleration_input",)),
+        ("damping_template", None),
+        ("mlpistons_template", ("mkbasedproperties",)),
+        ("motion_template", ("mkbasedproperties",)),
+        ("wavepaddles_template", ("mkbasedproperties",)),
+        ("inout_template", ("inlet_outlet", "useboxlimit_freecentre_enabled")),
+        ("chrono_template", ("chrono",)),
+        ("moorings_template", ("moorings", "execution_parameters")),
+        ("properties_template", ("mkbasedproperties", "execution_parameters")),
+    )
+
+    # {section key: (input signature, rendered section)} kept between exports.
+    section_cache: dict = dict()
+
+    def __init__(self, incremental: bool = True):
         self.mod_folder = "{}/..".format(os.path.dirname(os.path.realpath(__file__)))
-
-    def transform_bools_to_strs(self, value):
-        """ Transforms a boolean value to a string representing its state, understandable by GenCase. """
-        if isinstance(value, bool):
-            return "true" if value else "false"
-        if isinstance(value, list):
-            return [self.transform_bools_to_strs(v) for v in value]
-        if isinstance(value, dict):
-            return {k: self.transform_bools_to_strs(v) for k, v in value.items()}
-        return value
+        self.incremental: bool = incremental
+
+    def render_section(self, key: str, data: dict, case: "Case") -> str:
+        """ Renders a single section of the XML. """
+        return {
+            "definition_template": lambda: DefinitionRenderer.render(data),
+            "objects_template": lambda: ObjectsRenderer.render(data),
+            "simulationdomain_template": lambda: SimulationDomainRenderer.render(data),
+            "periodicity_template": lambda: PeriodicityRenderer.render(data),
+            "initials_template": lambda: InitialsRenderer.render(data),
+            "floatings_template": lambda: FloatingsRenderer.render(data),
+            "rzones_template": lambda: RZonesRenderer.render(data, type(case.relaxation_zone).__name__) if case.relaxation_zone else "",
+            "accinput_template": lambda: AccinputRenderer.render(data),
+            "damping_template": lambda: DampingRenderer.render(data) if case.damping_zones.keys() else "",
+            "mlpistons_template": lambda: MLPistonsRenderer.render(data),
+            "motion_template": lambda: MotionRenderer.render(data),
+            "wavepaddles_template": lambda: WavePaddlesRenderer.render(data),
+            "inout_template": lambda: InoutRenderer.render(data),
+            "chrono_template": lambda: ChronoRenderer.render(data),
+            "moorings_template": lambda: MooringsRenderer.render(data),
+            "properties_template": lambda: PropertiesRenderer.render(data),
+        }[key]()
+
+    def get_section_signatures(self, data: dict, case: "Case") -> dict:
+        """ Returns a signature of the inputs of each cacheable section.
+        Signatures are taken before rendering, as some renderers modify the data they receive. """
+        signatures: dict = dict()
+        for key, dependencies in self.SECTION_DEPENDENCIES:
+            if dependencies is None:
+                continue
+            signatures[key] = repr((
+                TemplateRegistry.the().generation,
+                type(case.relaxation_zone).__name__ if key == "rzones_template" else None,
+                [data.get(dependency, None) for dependency in dependencies]
+            ))
+        return signatures
 
     def get_adapted_case_data(self, case: "Case") -> dict:
-        """ Adapts the case data to a dictionary used to format the resulting XML """
-        data: dict = obj_to_dict(case)
-        data = self.transform_bools_to_strs(data)
-
-        data["definition_template"] = DefinitionRenderer.render(data)
-        data["objects_template"] = ObjectsRenderer.render(data)
-        data["simulationdomain_template"] = SimulationDomainRenderer.render(data)
-        data["periodicity_template"] = PeriodicityRenderer.render(data)
-        data["initials_template"] = InitialsRenderer.render(data)
-        data["floatings_template"] = FloatingsRenderer.render(data)
-        data["rzones_template"] = RZonesRenderer.render(data, type(case.relaxation_zone).__name__) if case.relaxation_zone else ""
-        data["accinput_template"] = AccinputRenderer.render(data)
-        data["damping_template"] = DampingRenderer.render(data) if case.damping_zones.keys() else ""
-        data["mlpistons_template"] = MLPistonsRenderer.render(data)
-        data["motion_template"] = MotionRenderer.render(data)
-        data["wavepaddles_template"] = WavePaddlesRenderer.render(data)
-        data["inout_template"] = InoutRenderer.render(data)
-        data["chrono_template"] = ChronoRenderer.render(data)
-        data["moorings_template"] = MooringsRenderer.render(data)
-        data["properties_template"] = PropertiesRenderer.render(data)
+        """ Adapts the case data to a dictionary used to format the resulting XML.
+        When incremental, sections whose inputs did not change since the last export are reused. """
+        data: dict = CaseAdapter.adapt_case_for_xml(case)
+        signatures: dict = self.get_section_signatures(data, case)
+
+        for key, _ in self.SECTION_DEPENDENCIES:
+            signature = signatures.get(key, None)
+            cached = self.section_cache.get(key, None)
+            if self.incremental and signature is not None and cached is not None and cached[0] == signature:
+                data[key] = cached[1]
+                continue
+            data[key] = self.render_section(key, data, case)
+            if signature is not None:
+                self.section_cache[key] = (signature, data[key])
+            debug("Rendered XML section {}", key)
+
         data["application"] = APP_NAME
         data["current_date"] = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
         return data
 
+    def generate_fragments(self, case):
+        """ Yields the GenCase-compatible XML resulting from the case as a sequence of text fragments.
+        The base template is expanded field by field, so the complete document is never built in memory. """
+        data: dict = self.get_adapted_case_data(case)
+        formatter: Formatter = Formatter()
+        for literal_text, field_name, format_spec, conversion in formatter.parse(get_template_text(self.BASE_XML)):
+            if literal_text:
+                yield literal_text
+            if field_name is not None:
+                value, _ = formatter.get_field(field_name, (), data)
+                yield formatter.format_field(formatter.convert_field(value, conversion), format_spec)
+
+    def strip_blank_lines(self, fragments):
+        """ Drops empty lines from a sequence of text fragments in a single linear pass,
+        taking into account runs of line breaks that span several fragments. """
+        previous_ended_with_line_end: bool = False
+        for fragment in fragments:
+            if not fragment:
+                continue
+            collapsed: str = self.BLANK_LINES_REGEX.sub(LINE_END, fragment)
+            if previous_ended_with_line_end and collapsed.startswith(LINE_END):
+                collapsed = collapsed[1:]
+            if collapsed:
+                yield collapsed
+                previous_ended_with_line_end = collapsed.endswith(LINE_END)
+
     def generate(self, case) -> str:
         """ Returns the GenCase-compatible XML resulting from the case """
-        final_xml: str = get_template_text(self.BASE_XML).format(**self.get_adapted_case_data(case))
-
-        # Strip empty lines from the final XML to clean it up.
-        while "\n\n" in final_xml:
-            final_xml = final_xml.replace("\n\n", "\n")
-
-        return final_xml
+        return "".join(self.strip_blank_lines(self.generate_fragments(case)))
 
     def generate_material(self, case) -> str:
         """ Returns a material XML definition for DualSPHysics from the data available on the given case. """
@@ -104,9 +175,13 @@ class XMLExporter():
 
         return get_template_text(self.BASE_MATERIALS_XML).format(**formatter)
 
-    def save_to_disk(self, path, case: "Case") -> None:
-        """ Creates a file on disk with the contents of the GenCase generated XML. """
+    def save_to_disk(self, path, case: "Case", stream: bool = False) -> None:
+        """ Creates a file on disk with the contents of the GenCase generated XML.
+        If stream is enabled the XML fragments are written to the file as they are rendered. """
         with open("{}/{}".format(path, self.MATERIAL_FILE_NAME), "w", encoding="utf-8") as file:
             file.write(self.generate_material(case))
         with open("{}/{}{}".format(path, case.name, self.GENCASE_XML_SUFFIX), "w", encoding="utf-8") as file:
-            file.write(self.generate(case))
+            if stream:
+                file.writelines(self.strip_blank_lines(self.generate_fragments(case)))
+            else:
+                file.write(self.generate(case))
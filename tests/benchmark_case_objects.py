@@ -0,0 +1,85 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" Benchmark of adding, selecting and deleting simulation objects on a case with 10,000 of them.
+
+Run from the repository root with the Python interpreter of FreeCAD: python -m tests.benchmark_case_objects """
+
+try:
+    import FreeCAD  # noqa: F401 pylint: disable=unused-import
+except ImportError:
+    raise SystemExit("FreeCAD is needed to import DesignSPHysics modules")
+
+from mod.enums import ObjectType, ObjectFillMode
+from mod.dataobjects.case import Case
+from mod.dataobjects.simulation_object import SimulationObject
+
+from tests.benchmark_tools import measure, report
+
+OBJECT_COUNT = 10000
+SELECTION_CLICKS = 1000
+DELETED_OBJECTS = 1000
+
+
+def create_objects() -> list:
+    """ Returns simulation objects spread over every bound and fluid mk. """
+    return [SimulationObject("Object{:05d}".format(index), index % 240 if index % 2 else index % 10,
+                             ObjectType.BOUND if index % 2 else ObjectType.FLUID, ObjectFillMode.SOLID)
+            for index in range(OBJECT_COUNT)]
+
+
+def create_case() -> Case:
+    """ Returns the current case holding OBJECT_COUNT objects. """
+    case: Case = Case.the()
+    case.reset()
+    case.add_objects(create_objects())
+    return case
+
+
+def add_one_by_one(objects: list) -> None:
+    for simobject in objects:
+        Case.the().add_object(simobject)
+
+
+def add_at_once(objects: list) -> None:
+    Case.the().add_objects(objects)
+
+
+def select(case: Case) -> None:
+    """ Does the case work of a selection click on the FreeCAD tree: show the selected object and look for deleted ones. """
+    for click in range(SELECTION_CLICKS):
+        name: str = "Object{:05d}".format((click * 7919) % OBJECT_COUNT)
+        if case.is_object_in_simulation(name):
+            case.get_simulation_object(name)
+        invalid_object_names: list = [object_name for object_name in case.get_all_simulation_object_names() if object_name is None]
+        case.remove_objects(invalid_object_names)
+
+
+def get_deleted_names() -> list:
+    return ["Object{:05d}".format(index) for index in range(0, OBJECT_COUNT, OBJECT_COUNT // DELETED_OBJECTS)]
+
+
+def delete_one_by_one(case: Case) -> None:
+    for name in get_deleted_names():
+        case.remove_object(name)
+
+
+def delete_at_once(case: Case) -> None:
+    case.remove_objects(get_deleted_names())
+
+
+def empty_case() -> list:
+    Case.the().reset()
+    return create_objects()
+
+
+def main():
+    report("Add {} objects one by one".format(OBJECT_COUNT), measure(add_one_by_one, setup=empty_case))
+    report("Add {} objects at once".format(OBJECT_COUNT), measure(add_at_once, setup=empty_case))
+    report("{} selection clicks with {} objects".format(SELECTION_CLICKS, OBJECT_COUNT), measure(select, setup=create_case))
+    report("Delete {} of {} objects one by one".format(DELETED_OBJECTS, OBJECT_COUNT), measure(delete_one_by_one, setup=create_case))
+    report("Delete {} of {} objects at once".format(DELETED_OBJECTS, OBJECT_COUNT), measure(delete_at_once, setup=create_case))
+    Case.the().reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" Helpers shared by the benchmarks.
+
+Benchmarks are not collected with the tests. Run each one from the repository root with the Python interpreter
+of FreeCAD, like: python -m tests.benchmark_case_objects """
+
+import time
+
+
+def measure(function, setup=None, repeat: int = 3) -> float:
+    """ Returns the best wall-clock seconds of several runs of a function.
+    If a setup function is given, it runs untimed before each run and its result is passed to the function. """
+    best: float = None
+    for _ in range(repeat):
+        arguments: tuple = () if setup is None else (setup(),)
+        start: float = time.perf_counter()
+        function(*arguments)
+        elapsed: float = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(name: str, seconds: float) -> None:
+    """ Prints the result of a benchmark. """
+    print("{:<60} {:>12.3f} ms".format(name, seconds * 1000))
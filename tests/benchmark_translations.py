@@ -0,0 +1,93 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" Benchmark of building the biggest dialogs with the translation lookup that parsed the locale file on every call,
+and with the in-memory TranslationCatalog.
+
+Run from the repository root with the Python interpreter of FreeCAD: python -m tests.benchmark_translations """
+
+import json
+import shutil
+import tempfile
+from os import path
+from unittest import mock
+
+try:
+    import FreeCADGui
+except ImportError:
+    raise SystemExit("FreeCAD is needed to import DesignSPHysics modules")
+
+# from PySide import QtCore, QtGui
+from PySide6 import QtWidgets
+
+from mod.translation_tools import TranslationCatalog
+from mod.dataobjects.case import Case
+from mod.dataobjects.executable_paths import ExecutablePaths
+from mod.dataobjects.inletoutlet.inlet_outlet_zone import InletOutletZone
+from mod.widgets.execution_parameters_dialog import ExecutionParametersDialog
+from mod.widgets.inlet_zone_edit import InletZoneEdit
+
+from tests.benchmark_tools import measure, report
+
+DIALOG_BUILDS = 5
+
+
+class LegacyTranslationLookup():
+    """ The lookup used before TranslationCatalog: every call parses the locale file and a miss writes it again.
+    It works on a copy of the translation files, so the misses don't modify the ones of the repository. """
+
+    def __init__(self):
+        self.lang_directory: str = tempfile.mkdtemp()
+        shutil.rmtree(self.lang_directory)
+        shutil.copytree(TranslationCatalog.the().lang_directory, self.lang_directory)
+
+    def close(self) -> None:
+        shutil.rmtree(self.lang_directory, ignore_errors=True)
+
+    def translate(self, text: str) -> str:
+        freecad_locale = FreeCADGui.getLocale().lower().replace(", ", "-").replace(" ", "-")
+        filename = "{}/{}.json".format(self.lang_directory, freecad_locale)
+        if not path.isfile(filename):
+            filename = "{}/{}.json".format(self.lang_directory, "english")
+        with open(filename, "r", encoding="utf-8") as f:
+            translation = json.load(f)
+        to_ret = translation.get(text, None)
+        if not to_ret:
+            translation[text] = text
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(translation, f, indent=4)
+            return text
+        return to_ret
+
+
+def build_dialogs(zone_id) -> None:
+    """ Builds the execution parameters and inlet zone dialogs, without showing them. """
+    for _ in range(DIALOG_BUILDS):
+        ExecutionParametersDialog()
+        InletZoneEdit(zone_id)
+
+
+def main():
+    application = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    Case.the().reset()
+    zone: InletOutletZone = InletOutletZone()
+    Case.the().inlet_outlet.zones.append(zone)
+    legacy_lookup: LegacyTranslationLookup = LegacyTranslationLookup()
+    try:
+        # The dialogs are built without showing them, and without DualSPHysics executables configured
+        with mock.patch.object(ExecutionParametersDialog, "exec_"), mock.patch.object(InletZoneEdit, "exec_"), \
+                mock.patch.object(ExecutablePaths, "supports_ddt_fourtakas", return_value=True):
+            with mock.patch.object(TranslationCatalog, "translate", lambda catalog, text: legacy_lookup.translate(text)):
+                report("Build the biggest dialogs {} times, parsing the locale file".format(DIALOG_BUILDS),
+                       measure(lambda: build_dialogs(zone.id)))
+            report("Build the biggest dialogs {} times, with the catalog".format(DIALOG_BUILDS),
+                   measure(lambda: build_dialogs(zone.id)))
+    finally:
+        legacy_lookup.close()
+        # Strings missing on the benchmark are not written to the translation files of the repository
+        TranslationCatalog.the().pending.clear()
+        Case.the().reset()
+    del application
+
+
+if __name__ == "__main__":
+    main()
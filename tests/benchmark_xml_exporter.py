@@ -0,0 +1,68 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" Benchmark of XMLExporter.generate on synthetic cases of 10, 1,000 and 10,000 objects, with the templates read
+from disk on every use and served from the TemplateRegistry.
+
+Run from the repository root with the Python interpreter of FreeCAD: python -m tests.benchmark_xml_exporter """
+
+from unittest import mock
+
+try:
+    import FreeCAD
+except ImportError:
+    raise SystemExit("FreeCAD is needed to import DesignSPHysics modules")
+
+from mod.enums import ObjectType, ObjectFillMode
+from mod.template_tools import TemplateRegistry
+from mod.dataobjects.case import Case
+from mod.dataobjects.simulation_object import SimulationObject
+from mod.dataobjects.motion.movement import Movement
+from mod.dataobjects.motion.rect_motion import RectMotion
+from mod.xml.xml_exporter import XMLExporter
+
+from tests.benchmark_tools import measure, report
+
+OBJECT_COUNTS = (10, 1000, 10000)
+DOCUMENT_NAME = "DSPH_XMLExporterBenchmark"
+
+
+def create_case(document, object_count: int) -> Case:
+    """ Fills a FreeCAD document and the current case with boxes, half of them bound objects with a movement. """
+    document.addObject("Part::Box", "Case_Limits")
+    case: Case = Case.the()
+    case.reset()
+    case.name = "XMLExporterBenchmark"
+    simobjects: list = list()
+    for index in range(object_count):
+        name: str = "Box{:05d}".format(index)
+        document.addObject("Part::Box", name)
+        object_type: ObjectType = ObjectType.BOUND if index % 2 else ObjectType.FLUID
+        simobjects.append(SimulationObject(name, index % 240 if index % 2 else index % 10, object_type, ObjectFillMode.SOLID))
+    case.add_objects(simobjects)
+    for mk in range(min(object_count // 2, 240)):
+        movement: Movement = Movement(name="Movement{}".format(mk))
+        movement.add_motion(RectMotion(duration=1, velocity=[0.1, 0, 0]))
+        case.get_mk_based_properties(ObjectType.BOUND, mk).movements.append(movement)
+    return case
+
+
+def generate(case: Case) -> None:
+    XMLExporter(incremental=False).generate(case)
+
+
+def main():
+    for object_count in OBJECT_COUNTS:
+        document = FreeCAD.newDocument(DOCUMENT_NAME)
+        case: Case = create_case(document, object_count)
+        repeat: int = 1 if object_count >= 10000 else 3
+        try:
+            with mock.patch.object(TemplateRegistry, "get", lambda registry, template_path: registry.load(template_path)):
+                report("Generate the XML of {} objects, reading the templates".format(object_count), measure(lambda: generate(case), repeat=repeat))
+            report("Generate the XML of {} objects, with the registry".format(object_count), measure(lambda: generate(case), repeat=repeat))
+        finally:
+            FreeCAD.closeDocument(document.Name)
+            case.reset()
+
+
+if __name__ == "__main__":
+    main()
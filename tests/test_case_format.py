@@ -0,0 +1,86 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" Tests for the case data file format.
+
+Run from the repository root with the Python interpreter of FreeCAD: python -m unittest discover tests """
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+try:
+    import FreeCAD  # noqa: F401 pylint: disable=unused-import
+except ImportError:
+    raise unittest.SkipTest("FreeCAD is needed to import DesignSPHysics modules")
+
+from mod.constants import CASE_FORMAT_VERSION, CASE_ARRAY_MIN_LENGTH
+from mod.enums import ObjectType, ObjectFillMode
+from mod.case_format import read_case_file, read_case_header, write_case_file
+from mod.dataobjects.case import Case
+from mod.dataobjects.simulation_object import SimulationObject
+
+
+class CaseFormatTest(unittest.TestCase):
+    """ Checks that cases survive a save and load, and that files saved as plain pickles are upgraded. """
+
+    LENGTH = CASE_ARRAY_MIN_LENGTH * 2
+
+    def setUp(self):
+        self.case_path = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.case_path, "casedata.dsphdata")
+        self.case = Case.the()
+        self.case.reset()
+        self.case.name = "CaseFormatTest"
+        self.case.add_object(SimulationObject("Box", 3, ObjectType.BOUND, ObjectFillMode.SOLID))
+
+    def tearDown(self):
+        shutil.rmtree(self.case_path, ignore_errors=True)
+        Case.the().reset()
+
+    def test_round_trip(self):
+        info = self.case.info
+        info.measuretool_points = [[index * 0.5, 0.25, -1.0] for index in range(self.LENGTH)]
+        info.measuretool_grid = info.measuretool_points
+        info.counts = list(range(self.LENGTH))
+        info.mixed = [index if index % 2 else float(index) for index in range(self.LENGTH)]
+        info.flags = [bool(index % 3) for index in range(self.LENGTH)]
+        info.huge = [2 ** 70 + index for index in range(self.LENGTH)]
+        info.ragged = [[0.0] * (index % 3 + 1) for index in range(self.LENGTH)]
+
+        write_case_file(self.file_path, self.case)
+        header = read_case_header(self.file_path)
+        loaded = read_case_file(self.file_path)
+
+        self.assertEqual(header["format"], CASE_FORMAT_VERSION)
+        self.assertEqual(len(header["arrays"]), 2)
+        self.assertEqual(loaded.name, "CaseFormatTest")
+        self.assertEqual([simobject.name for simobject in loaded.objects], ["Box"])
+        for attribute in ("measuretool_points", "counts", "mixed", "flags", "huge", "ragged"):
+            original, restored = getattr(info, attribute), getattr(loaded.info, attribute)
+            self.assertEqual(restored, original, attribute)
+            self.assertEqual([type(value) for value in restored], [type(value) for value in original], attribute)
+        self.assertIs(loaded.info.measuretool_grid, loaded.info.measuretool_points)
+
+    def test_legacy_pickle_is_migrated(self):
+        # Saved by a version without these attributes
+        del self.case.flowtool_boxes
+        del self.case.info.measuretool_grid
+        with open(self.file_path, "wb") as legacy_file:
+            pickle.dump(self.case, legacy_file, 1)
+
+        self.assertEqual(read_case_header(self.file_path), {"format": 0})
+        loaded = read_case_file(self.file_path)
+        Case.update_from_disk(loaded)
+
+        self.assertEqual(loaded.name, "CaseFormatTest")
+        self.assertEqual(loaded.flowtool_boxes, [])
+        self.assertEqual(loaded.info.measuretool_grid, [])
+        self.assertIs(Case.the(), loaded)
+        self.assertEqual(Case.the().get_simulation_object("Box").obj_mk, 3)
+        self.assertEqual(Case.the().get_objects_with_realmk(Case.get_object_realmk(loaded.objects[0])), loaded.objects)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" Tests for the GenCase output cache keys.
+
+Run from the repository root with the Python interpreter of FreeCAD: python -m unittest discover tests """
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import FreeCAD  # noqa: F401 pylint: disable=unused-import
+except ImportError:
+    raise unittest.SkipTest("FreeCAD is needed to import DesignSPHysics modules")
+
+from mod.gencase_tools import GenCaseCache
+
+DEFINITION_XML = """<!-- Case name: Case -->
+<?xml version="1.0" encoding="UTF-8" ?>
+<case app="DesignSPHysics v0.7.0" date="{date}">
+    <casedef>
+        <geometry>
+            <commands>
+                <mainlist>
+                    <drawfilestl file="Tank.stl" objname="Tank" autofill="false" />
+                </mainlist>
+            </commands>
+        </geometry>
+        <motion>
+            <objreal ref="11">
+                <begin mov="1" start="0" />
+                <mvfile id="1" duration="10">
+                    <file name="motion.csv" fields="4" fieldtime="0" fieldx="1" fieldy="2" fieldz="3" />
+                </mvfile>
+            </objreal>
+        </motion>
+    </casedef>
+    <execution>
+        <special>
+            <accinputs>
+                <accinput>
+                    <datafile value="acceleration.csv" comment="File with acceleration data" />
+                </accinput>
+            </accinputs>
+            <relaxationzones>
+                <rzwaves_external_1d>
+                    <filesvel value="velocity" comment="Main name of files with velocity to use" />
+                </rzwaves_external_1d>
+            </relaxationzones>
+        </special>
+    </execution>
+</case>
+"""
+
+
+class GenCaseCacheKeyTest(unittest.TestCase):
+    """ Checks that the cache key covers every input file of a GenCase definition. """
+
+    INPUT_FILES = ("Tank.stl", "motion.csv", "acceleration.csv", "velocity_x00_y00.csv", "velocity_x01_y00.csv")
+
+    def setUp(self):
+        self.case_path = tempfile.mkdtemp()
+        self.xml_path = os.path.join(self.case_path, "Case_Def.xml")
+        self.write_definition("01-01-2020 10:00:00")
+        for file_name in self.INPUT_FILES:
+            with open(os.path.join(self.case_path, file_name), "w", encoding="utf-8") as input_file:
+                input_file.write("0;0;0;0\n")
+        self.cache = GenCaseCache(self.case_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.case_path, ignore_errors=True)
+
+    def write_definition(self, date: str) -> None:
+        with open(self.xml_path, "w", encoding="utf-8") as xml_file:
+            xml_file.write(DEFINITION_XML.format(date=date))
+
+    def compute_key(self) -> str:
+        return self.cache.compute_key(self.xml_path, ["Case_Def", "Case_out/Case", "-save:all"], "v5.4")
+
+    def test_referenced_files(self):
+        referenced = self.cache.get_referenced_files(self.xml_path)
+        for file_name in self.INPUT_FILES:
+            self.assertIn(os.path.normpath(os.path.join(self.case_path, file_name)), referenced)
+
+    def test_key_is_stable(self):
+        self.assertIsNotNone(self.compute_key())
+        self.assertEqual(self.compute_key(), self.compute_key())
+
+    def test_saving_again_keeps_the_key(self):
+        previous_key = self.compute_key()
+        self.write_definition("01-01-2020 10:00:05")
+        self.assertEqual(previous_key, self.compute_key())
+
+    def test_editing_the_definition_changes_the_key(self):
+        previous_key = self.compute_key()
+        with open(self.xml_path, "r", encoding="utf-8") as xml_file:
+            definition = xml_file.read()
+        with open(self.xml_path, "w", encoding="utf-8") as xml_file:
+            xml_file.write(definition.replace('autofill="false"', 'autofill="true"'))
+        self.assertNotEqual(previous_key, self.compute_key())
+
+    def test_editing_a_motion_file_changes_the_key(self):
+        previous_key = self.compute_key()
+        with open(os.path.join(self.case_path, "motion.csv"), "a", encoding="utf-8") as motion_file:
+            motion_file.write("1;0.5;0;0\n")
+        self.assertNotEqual(previous_key, self.compute_key())
+
+    def test_editing_any_input_file_changes_the_key(self):
+        for file_name in self.INPUT_FILES:
+            previous_key = self.compute_key()
+            with open(os.path.join(self.case_path, file_name), "a", encoding="utf-8") as input_file:
+                input_file.write("1;1;1;1\n")
+            self.assertNotEqual(previous_key, self.compute_key(), file_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
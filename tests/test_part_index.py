@@ -0,0 +1,82 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" Tests for the Part index of out folders.
+
+Run from the repository root with the Python interpreter of FreeCAD: python -m unittest discover tests """
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import FreeCAD  # noqa: F401 pylint: disable=unused-import
+except ImportError:
+    raise unittest.SkipTest("FreeCAD is needed to import DesignSPHysics modules")
+
+from mod.part_index import PartIndex
+
+
+class PartIndexTest(unittest.TestCase):
+    """ Checks that the index follows the Parts of a folder, even if the folder keeps its modification time. """
+
+    def setUp(self):
+        self.out_folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.out_folder, ignore_errors=True)
+
+    def write_part(self, part: int) -> None:
+        with open(os.path.join(self.out_folder, "Part_{:04d}.bi4".format(part)), "wb") as part_file:
+            part_file.write(b"\0" * 16)
+
+    def set_folder_mtime(self, mtime_ns: int) -> None:
+        os.utime(self.out_folder, ns=(mtime_ns, mtime_ns))
+
+    def test_new_parts_are_indexed(self):
+        for part in range(3):
+            self.write_part(part)
+        index = PartIndex(self.out_folder)
+        index.refresh()
+        self.assertEqual(index.get_parts(), [0, 1, 2])
+        self.write_part(3)
+        index.refresh()
+        self.assertEqual(index.get_last_part(), 3)
+
+    def test_part_added_without_changing_the_folder_mtime(self):
+        for part in range(3):
+            self.write_part(part)
+        old_mtime_ns = os.stat(self.out_folder).st_mtime_ns - 10 * 10 ** 9
+        self.set_folder_mtime(old_mtime_ns)
+        index = PartIndex(self.out_folder)
+        index.refresh()
+        self.assertEqual(index.get_last_part(), 2)
+
+        self.write_part(3)
+        self.set_folder_mtime(old_mtime_ns)
+        index.refresh()
+        self.assertEqual(index.get_last_part(), 3)
+
+    def test_listing_within_the_mtime_granularity_is_repeated(self):
+        self.write_part(0)
+        index = PartIndex(self.out_folder)
+        index.refresh()
+        # Creating the index file changed the folder, so it is listed once more
+        index.refresh()
+        mtime_ns = os.stat(self.out_folder).st_mtime_ns
+        # A Part written in the same tick, after a gap in the numbering, is found on the next refresh
+        self.write_part(2)
+        self.set_folder_mtime(mtime_ns)
+        index.refresh()
+        self.assertEqual(index.get_parts(), [0, 2])
+
+    def test_index_is_restored_from_disk(self):
+        for part in range(5):
+            self.write_part(part)
+        PartIndex(self.out_folder).refresh()
+        index = PartIndex(self.out_folder)
+        self.assertEqual(index.get_parts(), [0, 1, 2, 3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" Tests for the merge of the files written by post-processing shards.
+
+Run from the repository root with the Python interpreter of FreeCAD: python -m unittest discover tests """
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import FreeCAD  # noqa: F401 pylint: disable=unused-import
+except ImportError:
+    raise unittest.SkipTest("FreeCAD is needed to import DesignSPHysics modules")
+
+from mod.post_processing_pipeline import PostProcessingJob
+
+
+class PostProcessingMergeTest(unittest.TestCase):
+    """ Checks that the files of every shard get their original names back, with more than ten shards. """
+
+    SHARD_COUNT = 12
+    PARTS_PER_SHARD = 3
+
+    def setUp(self):
+        self.out_folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.out_folder, ignore_errors=True)
+
+    def create_job(self, save_flag: str, base_name: str) -> PostProcessingJob:
+        return PostProcessingJob("PartVTK", "PartVTK", ["-dirin", self.out_folder],
+                                 [(save_flag + " {}", os.path.join(self.out_folder, base_name))], r"Part_(\d+)",
+                                 0, self.SHARD_COUNT * self.PARTS_PER_SHARD - 1, self.SHARD_COUNT)
+
+    @staticmethod
+    def get_shard_prefix(shard, save_flag: str) -> str:
+        """ Returns the output prefix a shard was given on its command line. """
+        return next(parameter[len(save_flag) + 1:] for parameter in shard.parameters if parameter.startswith(save_flag + " "))
+
+    def test_merge_part_files_of_twelve_shards(self):
+        job: PostProcessingJob = self.create_job("-savevtk", "PartFluid")
+        self.assertEqual(len(job.shards), self.SHARD_COUNT)
+        for shard in job.shards:
+            prefix: str = self.get_shard_prefix(shard, "-savevtk")
+            for part in range(shard.first_part, shard.last_part + 1):
+                with open("{}_{:04d}.vtk".format(prefix, part), "w", encoding="utf-8") as part_file:
+                    part_file.write(str(part))
+
+        job.merge_outputs()
+
+        expected: list = ["PartFluid_{:04d}.vtk".format(part) for part in range(job.first_part, job.last_part + 1)]
+        self.assertEqual(sorted(os.listdir(self.out_folder)), expected)
+        for file_name in expected:
+            with open(os.path.join(self.out_folder, file_name), "r", encoding="utf-8") as part_file:
+                self.assertEqual("PartFluid_{:04d}.vtk".format(int(part_file.read())), file_name)
+
+    def test_merge_text_files_of_twelve_shards(self):
+        job: PostProcessingJob = self.create_job("-savecsv", "Forces")
+        for shard in job.shards:
+            with open(self.get_shard_prefix(shard, "-savecsv") + ".csv", "w", encoding="utf-8") as csv_file:
+                csv_file.write("Part;Time;Force\n")
+                for part in range(shard.first_part, shard.last_part + 1):
+                    csv_file.write("{};{};1.0\n".format(part, part / 10))
+
+        job.merge_outputs()
+
+        self.assertEqual(os.listdir(self.out_folder), ["Forces.csv"])
+        with open(os.path.join(self.out_folder, "Forces.csv"), "r", encoding="utf-8") as csv_file:
+            lines: list = csv_file.read().splitlines()
+        self.assertEqual(lines[0], "Part;Time;Force")
+        self.assertEqual([int(line.split(";")[0]) for line in lines[1:]], list(range(job.first_part, job.last_part + 1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" Tests for the follower of Run.out files.
+
+Run from the repository root with the Python interpreter of FreeCAD: python -m unittest discover tests """
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import FreeCAD  # noqa: F401 pylint: disable=unused-import
+except ImportError:
+    raise unittest.SkipTest("FreeCAD is needed to import DesignSPHysics modules")
+
+from mod.run_out_tools import RunOutFollower
+
+RECORDED_RUN_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "Run.out")
+
+
+class RunOutFollowerTest(unittest.TestCase):
+    """ Replays a recorded Run.out as if DualSPHysics was writing it, in chunks that split lines and UTF-8 sequences. """
+
+    def setUp(self):
+        self.out_folder = tempfile.mkdtemp()
+        self.run_out_path = os.path.join(self.out_folder, "Run.out")
+        with open(RECORDED_RUN_OUT, "rb") as recorded_file:
+            self.recorded = recorded_file.read()
+        self.follower = RunOutFollower(self.run_out_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.out_folder, ignore_errors=True)
+
+    def append(self, chunk: bytes) -> None:
+        with open(self.run_out_path, "ab") as run_file:
+            run_file.write(chunk)
+
+    def replay(self, split_points: list) -> str:
+        """ Appends the recorded file in chunks ending at the given offsets, polling after each one. """
+        text: str = ""
+        start: int = 0
+        for end in split_points + [len(self.recorded)]:
+            self.append(self.recorded[start:end])
+            text += self.follower.poll()
+            start = end
+        return text
+
+    def assert_final_progress(self) -> None:
+        progress = self.follower.progress
+        self.assertEqual(progress.timemax, 1.5)
+        self.assertEqual(progress.last_part, 4)
+        self.assertEqual(progress.current_time, 0.400051)
+        self.assertEqual(progress.particles_out, 15)
+        self.assertEqual(progress.estimated_time, "12-05-2021 10:48:57")
+        self.assertFalse(progress.exception_found)
+        self.assertEqual([sample.part for sample in progress.timeline], [0, 1, 2, 3, 4])
+        self.assertEqual([sample.total_steps for sample in progress.timeline], [1, 134, 301, 479, 660])
+        self.assertEqual([sample.particles_out for sample in progress.timeline], [0, 0, 12, 15, 15])
+
+    def test_chunks_split_mid_line_and_mid_character(self):
+        multibyte_character: int = self.recorded.index("ó".encode("utf-8"))
+        part_line: int = self.recorded.index(b"Part_0002")
+        particles_out_line: int = self.recorded.index(b"(total out: 12)")
+
+        self.append(self.recorded[:multibyte_character + 1])
+        self.follower.poll()
+        self.assertIsNone(self.follower.progress.timemax)
+
+        self.append(self.recorded[multibyte_character + 1:part_line + 20])
+        self.follower.poll()
+        self.assertEqual(self.follower.progress.timemax, 1.5)
+        self.assertEqual(self.follower.progress.last_part, 1)
+        self.assertEqual(self.follower.progress.current_time, 0.100001)
+
+        self.append(self.recorded[part_line + 20:particles_out_line + 5])
+        self.follower.poll()
+        self.assertEqual(self.follower.progress.last_part, 2)
+        self.assertEqual(self.follower.progress.particles_out, 0)
+
+        self.append(self.recorded[particles_out_line + 5:])
+        self.follower.poll()
+        self.assert_final_progress()
+
+    def test_every_split_keeps_the_text(self):
+        text: str = self.replay(list(range(7, len(self.recorded), 7)))
+        self.assertEqual(text, self.recorded.decode("utf-8"))
+        self.assertNotIn("�", text)
+        self.assert_final_progress()
+
+    def test_flush_reads_the_unterminated_line(self):
+        self.append(self.recorded[:-1])
+        self.follower.poll()
+        self.assertEqual(self.follower.progress.last_part, 3)
+        self.assertEqual(self.follower.flush(), self.recorded[:-1].rsplit(b"\n", 1)[1].decode("utf-8"))
+        self.assertEqual(self.follower.progress.last_part, 4)
+        self.assert_final_progress()
+
+
+if __name__ == "__main__":
+    unittest.main()
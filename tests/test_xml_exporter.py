@@ -0,0 +1,72 @@
+#!/usr/bin/env python3.7
+# -*- coding: utf-8 -*-
+""" Tests for the incremental rendering of the GenCase XML.
+
+Run from the repository root with the Python interpreter of FreeCAD: python -m unittest discover tests """
+
+import unittest
+from unittest import mock
+
+try:
+    import FreeCAD
+except ImportError:
+    raise unittest.SkipTest("FreeCAD is needed to import DesignSPHysics modules")
+
+from mod.enums import ObjectType, ObjectFillMode
+from mod.dataobjects.case import Case
+from mod.dataobjects.simulation_object import SimulationObject
+from mod.dataobjects.motion.movement import Movement
+from mod.dataobjects.motion.rect_motion import RectMotion
+from mod.xml.xml_exporter import XMLExporter
+
+
+class XMLExporterTest(unittest.TestCase):
+    """ Checks that an incremental render after a change of the case matches a full render of it. """
+
+    def setUp(self):
+        XMLExporter.section_cache.clear()
+        self.document = FreeCAD.newDocument("DSPH_XMLExporterTest")
+        self.document.addObject("Part::Box", "Box")
+        self.case = Case.the()
+        self.case.reset()
+        self.case.name = "XMLExporterTest"
+        # Both renders of a comparison must carry the same date
+        date_patcher = mock.patch("mod.xml.xml_exporter.datetime")
+        date_patcher.start().now.return_value.strftime.return_value = "01-01-2020 00:00:00"
+        self.addCleanup(date_patcher.stop)
+
+    def tearDown(self):
+        XMLExporter.section_cache.clear()
+        self.case.reset()
+        FreeCAD.closeDocument(self.document.Name)
+
+    def assert_incremental_matches_full(self) -> str:
+        incremental: str = XMLExporter(incremental=True).generate(self.case)
+        self.assertEqual(incremental, XMLExporter(incremental=False).generate(self.case))
+        return incremental
+
+    def test_execution_parameters_change(self):
+        first: str = self.assert_incremental_matches_full()
+        self.case.execution_parameters.visco = 0.25
+        self.case.execution_parameters.timemax = 3.5
+        self.assertNotEqual(self.assert_incremental_matches_full(), first)
+
+    def test_object_change(self):
+        first: str = self.assert_incremental_matches_full()
+        self.case.add_object(SimulationObject("Box", 1, ObjectType.BOUND, ObjectFillMode.SOLID))
+        self.assertNotEqual(self.assert_incremental_matches_full(), first)
+
+    def test_motion_change(self):
+        self.case.add_object(SimulationObject("Box", 1, ObjectType.BOUND, ObjectFillMode.SOLID))
+        first: str = self.assert_incremental_matches_full()
+        movement: Movement = Movement(name="Slide")
+        movement.add_motion(RectMotion(duration=2, velocity=[1, 0, 0]))
+        self.case.get_mk_based_properties(ObjectType.BOUND, 1).movements.append(movement)
+        with_motion: str = self.assert_incremental_matches_full()
+        self.assertNotEqual(with_motion, first)
+        movement.motion_list[0].velocity = [0, 2, 0]
+        self.assertNotEqual(self.assert_incremental_matches_full(), with_motion)
+
+
+if __name__ == "__main__":
+    unittest.main()